@@ -0,0 +1,432 @@
+"""Local Modbus TCP simulator of the Daikin Altherma 4 register map.
+
+Serves every address of INPUT_REGISTERS, HOLDING_REGISTERS,
+SELECT_REGISTERS, DISCRETE_INPUT_SENSORS, COIL_SENSORS and BINARY_SENSORS
+from const.py on a pymodbus server, so benchmarks can exercise the real
+coordinator end to end without hardware. Live values come from a small
+thermal model (weather-compensated space heating with compressor
+hysteresis, DHW tank reheats and defrost cycles); registers the model
+treats as unsupported answer 32766 like the real unit.
+
+Response latency, jitter and fault injection (Modbus exception responses
+and swallowed requests) are configurable. Run standalone:
+
+    python benchmarks/altherma_simulator.py --port 5020 --latency 20 --jitter 5
+
+or start it from a benchmark with ``await AlthermaSimulator(...).start()``.
+"""
+import argparse
+import asyncio
+import logging
+import math
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pymodbus.datastore import (  # noqa: E402
+    ModbusSequentialDataBlock,
+    ModbusServerContext,
+    ModbusSlaveContext,
+)
+from pymodbus.server import ModbusTcpServer  # noqa: E402
+
+from custom_components.ha_daikin_altherma4_modbus.const import (  # noqa: E402
+    INPUT_REGISTERS,
+    HOLDING_REGISTERS,
+    SELECT_REGISTERS,
+    DISCRETE_INPUT_SENSORS,
+    COIL_SENSORS,
+    BINARY_SENSORS,
+)
+from custom_components.ha_daikin_altherma4_modbus.read_plan import UNSUPPORTED_VALUE  # noqa: E402
+
+_LOGGER = logging.getLogger(__name__)
+
+# Register, die das simulierte Gerät nicht unterstützt (Zusatzzone, Mischerkit, ...)
+DEFAULT_UNSUPPORTED_INPUTS = frozenset({23, 58, 59, 60, 61, 69, 71, 72, 73, 74, 75})
+DEFAULT_UNSUPPORTED_HOLDINGS = frozenset({63, 64, 66, 78, 79})
+
+# Startwerte der Holding-Register und Coils (Adressen aus const.py)
+DEFAULT_HOLDINGS = {
+    1: 35, 2: 1, 3: 1, 6: 21, 7: 24, 9: 0, 10: 45, 13: 0, 14: 5500, 15: 0, 16: 5000,
+    54: 0, 55: 0, 56: 0, 58: 0, 67: 1, 68: 1, 69: 0, 74: 1, 75: 0, 76: 21, 77: 24,
+}
+DEFAULT_COILS = {1: 1, 2: 1, 3: 0}
+
+READ_FUNCTION_CODES = (1, 2, 3, 4)
+WRITE_FUNCTION_CODES = (5, 6, 15, 16)
+
+WATER_HEAT_CAPACITY = 4186  # J/(kg·K), 1 L Wasser ≈ 1 kg
+
+
+def _int16(value):
+    """Encode a signed value as unsigned 16-bit register."""
+    return int(round(value)) & 0xFFFF
+
+
+class ThermalModel:
+    """Minimal heat pump model producing plausible register values."""
+
+    def __init__(self, outdoor_mean=3.0, outdoor_swing=4.0, dhw_setpoint=48.0, seed=None):
+        self.random = random.Random(seed)
+        self.outdoor_mean = outdoor_mean
+        self.outdoor_swing = outdoor_swing
+        self.dhw_setpoint = dhw_setpoint
+        self.time = 0.0
+        self.outdoor = outdoor_mean
+        self.leaving = 30.0
+        self.returning = 28.0
+        self.tank = dhw_setpoint - 4
+        self.flow = 0.0
+        self.heat = 0.0
+        self.electric = 0.0
+        self.compressor = False
+        self.dhw_active = False
+        self.defrost_remaining = 0.0
+        self.runtime_since_defrost = 0.0
+
+    @staticmethod
+    def _approach(value, target, dt, tau):
+        return value + (target - value) * min(1.0, dt / tau)
+
+    def step(self, dt, holdings, coils):
+        """Advance the model by ``dt`` seconds using the current settings."""
+        self.time += dt
+        self.outdoor = (
+            self.outdoor_mean
+            + self.outdoor_swing * math.sin(2 * math.pi * self.time / 86400)
+            + self.random.uniform(-0.05, 0.05)
+        )
+
+        offset = holdings.get(54, 0)
+        offset = offset - 0x10000 if offset >= 0x8000 else offset
+        heating_on = bool(coils.get(2)) and holdings.get(3, 1) == 1 and holdings.get(2, 1) != 2
+        target = max(25.0, min(55.0, 35.0 - 0.6 * self.outdoor + offset))
+
+        # Warmwasser hat Vorrang, Nachladen bei 8 K Hysterese
+        if coils.get(1) and not self.dhw_active and self.tank < self.dhw_setpoint - 8:
+            self.dhw_active = True
+        if self.dhw_active and (self.tank >= self.dhw_setpoint or not coils.get(1)):
+            self.dhw_active = False
+        demand = self.dhw_active or (heating_on and self.outdoor < 16)
+
+        if not self.compressor and demand and (self.dhw_active or self.leaving < target - 2):
+            self.compressor = True
+        elif self.compressor and (not demand or (not self.dhw_active and self.leaving > target + 3)):
+            self.compressor = False
+
+        # Abtauen nach 45 min Verdichterlaufzeit unter 6 °C Außentemperatur
+        if self.defrost_remaining > 0:
+            self.defrost_remaining = max(0.0, self.defrost_remaining - dt)
+        elif self.compressor and self.outdoor < 6:
+            self.runtime_since_defrost += dt
+            if self.runtime_since_defrost > 45 * 60:
+                self.runtime_since_defrost = 0.0
+                self.defrost_remaining = 5 * 60
+
+        supply_target = self.dhw_setpoint + 5 if self.dhw_active else target
+        self.flow = 20.0 if self.compressor or self.defrost_remaining else 0.0
+        if self.defrost_remaining:
+            self.heat = -2500.0
+            self.electric = 1500.0
+            self.leaving = self._approach(self.leaving, 15.0, dt, 120)
+        elif self.compressor:
+            self.heat = max(2500.0, min(9000.0, 200.0 * (supply_target - self.outdoor)))
+            cop = max(1.5, min(6.0, 7.5 - 0.1 * (self.leaving - self.outdoor) - (1.0 if self.dhw_active else 0.0)))
+            self.electric = self.heat / cop
+            self.leaving = self._approach(self.leaving, supply_target, dt, 600)
+        else:
+            self.heat = 0.0
+            self.electric = 15.0
+            self.leaving = self._approach(self.leaving, 22.0, dt, 1800)
+
+        if self.flow:
+            self.returning = self.leaving - self.heat / (self.flow / 60 * WATER_HEAT_CAPACITY)
+        else:
+            self.returning = self._approach(self.returning, self.leaving - 0.5, dt, 300)
+
+        if self.dhw_active and self.compressor and not self.defrost_remaining:
+            self.tank += 10.0 / 3600 * dt
+        else:
+            self.tank -= 0.4 / 3600 * dt
+
+    def input_registers(self):
+        """Input register values by 1-based address."""
+        running_dhw = self.dhw_active and self.compressor
+        return {
+            21: 0,
+            22: 0,
+            29: 0 if self.flow else 1,  # Laufmeldungen: 0 = läuft
+            30: 0 if self.compressor else 1,
+            31: 1,
+            32: 1,
+            34: 0 if self.defrost_remaining else 1,
+            35: 1,
+            37: 1 if self.dhw_active else 0,
+            38: 1,
+            40: _int16(self.leaving * 100),
+            41: _int16((self.leaving + 0.2) * 100),
+            42: _int16(self.returning * 100),
+            43: _int16(self.tank * 100),
+            44: _int16(self.outdoor * 100),
+            49: _int16(self.flow * 100),
+            51: _int16(self.electric / 10),
+            52: 1 if running_dhw else 0,
+            53: 1 if self.compressor and not self.dhw_active else 0,
+            54: 2500,
+            55: 5500,
+            56: 500,
+            57: 2200,
+            63: 2,
+            64: 0,
+            65: 0,
+            66: 0,
+            67: 100 if self.dhw_active else 0,
+            68: int(self.flow),
+            70: 60 if self.flow else 0,
+            76: _int16((self.tank + 2) * 100),
+            77: _int16((self.tank - 3) * 100),
+            79: 180,
+            83: 1 if running_dhw else (2 if self.compressor else 0),
+        }
+
+    def discrete_inputs(self):
+        """Discrete input values by 1-based address."""
+        return {
+            1: int(bool(self.flow)),
+            11: int(self.compressor),
+            17: int(bool(self.defrost_remaining)),
+            19: int(self.dhw_active),
+            20: int(self.compressor and not self.dhw_active),
+            25: int(bool(self.flow)),
+        }
+
+
+class SimulatorContext(ModbusSlaveContext):
+    """Slave context adding latency, faults and the integration's write addressing."""
+
+    def __init__(self, simulator, **kwargs):
+        super().__init__(zero_mode=True, **kwargs)
+        self.simulator = simulator
+
+    @staticmethod
+    def _address(fc_as_hex, address):
+        # Die Integration schreibt auf die Registernummer aus const.py, liest aber
+        # mit Adresse - 1; Schreibzugriffe landen hier auf derselben Zelle wie Lesezugriffe
+        return address - 1 if fc_as_hex in WRITE_FUNCTION_CODES else address
+
+    def validate(self, fc_as_hex, address, count=1):
+        if self.simulator.random.random() < self.simulator.error_rate:
+            self.simulator.stats["errors"] += 1
+            return False
+        return super().validate(fc_as_hex, self._address(fc_as_hex, address), count)
+
+    def getValues(self, fc_as_hex, address, count=1):
+        return super().getValues(fc_as_hex, self._address(fc_as_hex, address), count)
+
+    def setValues(self, fc_as_hex, address, values):
+        super().setValues(fc_as_hex, self._address(fc_as_hex, address), values)
+
+    async def async_getValues(self, fc_as_hex, address, count=1):
+        if fc_as_hex in READ_FUNCTION_CODES:
+            await self.simulator.respond_delay()
+        return self.getValues(fc_as_hex, address, count)
+
+    async def async_setValues(self, fc_as_hex, address, values):
+        await self.simulator.respond_delay()
+        self.setValues(fc_as_hex, address, values)
+        self.simulator.stats["writes"] += 1
+
+
+class AlthermaSimulator:
+    """pymodbus TCP server backed by the thermal model."""
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=5020,
+        latency=0.0,
+        jitter=0.0,
+        error_rate=0.0,
+        timeout_rate=0.0,
+        timeout=5.0,
+        serial=False,
+        time_scale=1.0,
+        tick=1.0,
+        unsupported_inputs=DEFAULT_UNSUPPORTED_INPUTS,
+        unsupported_holdings=DEFAULT_UNSUPPORTED_HOLDINGS,
+        model=None,
+        seed=None,
+    ):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.timeout = timeout
+        self.time_scale = time_scale
+        self.tick = tick
+        self.unsupported_inputs = frozenset(unsupported_inputs)
+        self.random = random.Random(seed)
+        self.model = model or ThermalModel(seed=seed)
+        self.stats = {"requests": 0, "writes": 0, "errors": 0, "timeouts": 0}
+        # Echte Adapter bearbeiten Anfragen nacheinander
+        self._serial_lock = asyncio.Lock() if serial else None
+        self._server = None
+        self._serve_task = None
+        self._model_task = None
+
+        size = max(item["address"] for item in INPUT_REGISTERS + BINARY_SENSORS) + 2
+        self._input_block = ModbusSequentialDataBlock(0, [0] * size)
+        holding_size = max(item["address"] for item in HOLDING_REGISTERS + SELECT_REGISTERS) + 2
+        holdings = [0] * holding_size
+        for address, value in DEFAULT_HOLDINGS.items():
+            holdings[address - 1] = value
+        for address in unsupported_holdings:
+            holdings[address - 1] = UNSUPPORTED_VALUE
+        self._holding_block = ModbusSequentialDataBlock(0, holdings)
+        discrete_size = max(item["address"] for item in DISCRETE_INPUT_SENSORS) + 1
+        self._discrete_block = ModbusSequentialDataBlock(0, [False] * discrete_size)
+        coils = [False] * (max(item["address"] for item in COIL_SENSORS) + 1)
+        for address, value in DEFAULT_COILS.items():
+            coils[address - 1] = bool(value)
+        self._coil_block = ModbusSequentialDataBlock(0, coils)
+        self.context = SimulatorContext(
+            self,
+            di=self._discrete_block,
+            co=self._coil_block,
+            hr=self._holding_block,
+            ir=self._input_block,
+        )
+        self._publish()
+
+    def _publish(self):
+        """Copy the model state into the register image."""
+        inputs = self.model.input_registers()
+        for item in INPUT_REGISTERS + BINARY_SENSORS:
+            address = item["address"]
+            value = UNSUPPORTED_VALUE if address in self.unsupported_inputs else inputs.get(address, 0)
+            self._input_block.setValues(address - 1, [value])
+        discretes = self.model.discrete_inputs()
+        for item in DISCRETE_INPUT_SENSORS:
+            self._discrete_block.setValues(item["address"] - 1, [bool(discretes.get(item["address"], 0))])
+
+    def holdings(self):
+        """Current holding register values by 1-based address."""
+        values = self._holding_block.getValues(0, len(self._holding_block.values))
+        return {address + 1: value for address, value in enumerate(values)}
+
+    def coils(self):
+        """Current coil values by 1-based address."""
+        values = self._coil_block.getValues(0, len(self._coil_block.values))
+        return {address + 1: int(bool(value)) for address, value in enumerate(values)}
+
+    def step(self, dt):
+        """Advance the model by ``dt`` simulated seconds and publish it."""
+        self.model.step(dt, self.holdings(), self.coils())
+        self._publish()
+
+    async def respond_delay(self):
+        """Apply latency, jitter and timeout faults to one request."""
+        self.stats["requests"] += 1
+        delay = max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter))
+        if self.random.random() < self.timeout_rate:
+            self.stats["timeouts"] += 1
+            # Antwort kommt erst nach dem Client-Timeout
+            delay = self.timeout
+        if self._serial_lock is None:
+            if delay:
+                await asyncio.sleep(delay)
+            return
+        async with self._serial_lock:
+            if delay:
+                await asyncio.sleep(delay)
+
+    async def _run_model(self):
+        while True:
+            await asyncio.sleep(self.tick)
+            self.step(self.tick * self.time_scale)
+
+    async def start(self):
+        """Start listening and running the model."""
+        self._server = ModbusTcpServer(
+            context=ModbusServerContext(slaves=self.context, single=True),
+            address=(self.host, self.port),
+        )
+        self._serve_task = asyncio.create_task(self._server.serve_forever())
+        while not self._server.transport:
+            if self._serve_task.done():
+                self._serve_task.result()
+            await asyncio.sleep(0.01)
+        if self._model_task is None:
+            self._model_task = asyncio.create_task(self._run_model())
+        _LOGGER.info(f"Altherma simulator listening on {self.host}:{self.port}")
+
+    async def stop(self, stop_model=True):
+        """Close the server and all client connections."""
+        if self._server is not None:
+            handlers = []
+            for connection in list(self._server.active_connections.values()):
+                # close() ruft callback_disconnected nicht auf, der Handler liefe sonst weiter
+                if connection.handler_task is not None:
+                    connection.handler_task.cancel()
+                    handlers.append(connection.handler_task)
+                connection.close()
+            await self._server.shutdown()
+            await self._serve_task
+            self._server = None
+            await asyncio.gather(*handlers, return_exceptions=True)
+            # Verbindungs-Handler die Abbrüche verarbeiten lassen
+            await asyncio.sleep(0.05)
+        if stop_model and self._model_task is not None:
+            self._model_task.cancel()
+            await asyncio.gather(self._model_task, return_exceptions=True)
+            self._model_task = None
+
+    async def reboot(self, downtime):
+        """Drop all connections and refuse new ones for ``downtime`` seconds."""
+        await self.stop(stop_model=False)
+        await asyncio.sleep(downtime)
+        await self.start()
+
+
+async def main(args):
+    simulator = AlthermaSimulator(
+        host=args.host,
+        port=args.port,
+        latency=args.latency / 1000,
+        jitter=args.jitter / 1000,
+        error_rate=args.error_rate,
+        timeout_rate=args.timeout_rate,
+        serial=args.serial,
+        time_scale=args.time_scale,
+        model=ThermalModel(outdoor_mean=args.outdoor),
+    )
+    await simulator.start()
+    try:
+        while True:
+            await asyncio.sleep(60)
+            _LOGGER.info(f"{simulator.stats}")
+    finally:
+        await simulator.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5020)
+    parser.add_argument("--latency", type=float, default=0.0, help="response latency in ms")
+    parser.add_argument("--jitter", type=float, default=0.0, help="latency jitter (±) in ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with a Modbus exception")
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="share of requests answered after the client timeout")
+    parser.add_argument("--serial", action="store_true", help="answer one request at a time like the real adapter")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="simulated seconds per real second")
+    parser.add_argument("--outdoor", type=float, default=3.0, help="mean outdoor temperature in °C")
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,59 @@
+"""Benchmark: wall-clock poll time, sequential vs. pipelined block reads.
+
+Starts the bundled Altherma simulator with a fixed latency per request
+(the Altherma adapter answers in the order of tens of milliseconds), then
+times full coordinator polls in both modes.
+
+    python benchmarks/pipelined_poll_benchmark.py [latency_ms] [polls]
+"""
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from altherma_simulator import AlthermaSimulator  # noqa: E402
+from custom_components.ha_daikin_altherma4_modbus.coordinator import DaikinAlthermaCoordinator  # noqa: E402
+
+HOST = "127.0.0.1"
+PORT = 15021
+
+
+async def time_polls(hass, polls, **kwargs):
+    """Average wall-clock time of one full poll."""
+    coordinator = DaikinAlthermaCoordinator(hass, HOST, PORT, 10, False, **kwargs)
+    await coordinator._async_update_data()  # verbinden und aufwärmen
+    started = time.perf_counter()
+    for _ in range(polls):
+        coordinator._refresh_all_tiers = True
+        await coordinator._async_update_data()
+    elapsed = (time.perf_counter() - started) / polls
+    await coordinator.async_shutdown()
+    return elapsed
+
+
+async def main(latency_ms, polls):
+    simulator = AlthermaSimulator(host=HOST, port=PORT, latency=latency_ms / 1000)
+    await simulator.start()
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        sequential = await time_polls(hass, polls)
+        print(f"latency {latency_ms} ms/request, {polls} polls")
+        print(f"sequential:               {sequential * 1000:8.1f} ms/poll")
+        for max_in_flight in (1, 2, 4):
+            pipelined = await time_polls(hass, polls, pipelined_reads=True, max_in_flight=max_in_flight)
+            print(f"pipelined (in-flight {max_in_flight}):  {pipelined * 1000:8.1f} ms/poll")
+        await hass.async_stop(force=True)
+
+    await simulator.stop()
+
+
+if __name__ == "__main__":
+    latency_arg = float(sys.argv[1]) if len(sys.argv) > 1 else 20.0
+    polls_arg = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    asyncio.run(main(latency_arg, polls_arg))
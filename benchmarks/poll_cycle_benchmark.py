@@ -0,0 +1,306 @@
+"""End-to-end benchmark of the coordinator poll cycle against the simulator.
+
+Times the stages of a poll separately, each against the bundled Altherma
+simulator on localhost:
+
+- connect: TCP connect through the connection manager
+- read:    every block of the full read plan, one request each
+- decode:  decoding the register image of all blocks into the snapshot
+- edges:   last-triggered edge tracking
+- fan-out: listener callbacks evaluating the state of all entities, once
+           for every entity and once for only the entities whose keys changed
+- poll:    a full ``_async_update_data`` of all tiers
+
+The scaled scenario runs N simulated heat pumps with one coordinator each
+and polls them concurrently, reporting the poll round time and the
+event-loop lag, to show where the integration stops keeping up. Simulator
+and coordinators share one process and event loop, so absolute numbers
+include the simulator's own work.
+
+Results are printed and optionally written as JSON; pass an earlier JSON
+file with --compare to see the change per metric:
+
+    python benchmarks/poll_cycle_benchmark.py --json results.json
+    python benchmarks/poll_cycle_benchmark.py --compare results.json --scale 1 10 25
+"""
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import types
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pymodbus  # noqa: E402
+from homeassistant.const import __version__ as HA_VERSION  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from altherma_simulator import AlthermaSimulator  # noqa: E402
+from custom_components.ha_daikin_altherma4_modbus import (  # noqa: E402
+    binary_sensor,
+    climate,
+    number,
+    select,
+    sensor,
+    switch,
+)
+from custom_components.ha_daikin_altherma4_modbus.const import DOMAIN  # noqa: E402
+from custom_components.ha_daikin_altherma4_modbus.coordinator import DaikinAlthermaCoordinator  # noqa: E402
+from custom_components.ha_daikin_altherma4_modbus.read_plan import decode_block  # noqa: E402
+from custom_components.ha_daikin_altherma4_modbus.snapshot import RegisterSnapshot  # noqa: E402
+
+HOST = "127.0.0.1"
+BASE_PORT = 15100
+PLATFORMS = (sensor, binary_sensor, number, select, switch, climate)
+
+
+def summarize(samples):
+    """Median, p95 and max of timing samples in milliseconds."""
+    samples = sorted(samples)
+    return {
+        "median_ms": statistics.median(samples) * 1000,
+        "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000,
+        "max_ms": samples[-1] * 1000,
+        "samples": len(samples),
+    }
+
+
+async def time_async(func, rounds):
+    """Time an async callable ``rounds`` times."""
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        await func()
+        samples.append(time.perf_counter() - started)
+    return summarize(samples)
+
+
+def time_sync(func, rounds):
+    """Time a sync callable ``rounds`` times."""
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return summarize(samples)
+
+
+async def setup_entities(hass, coordinator, entry_id):
+    """Create all platform entities for a coordinator."""
+    entry = types.SimpleNamespace(entry_id=entry_id, data={}, options={})
+    hass.data.setdefault(DOMAIN, {})[entry_id] = coordinator
+    hass.data.setdefault(f"{DOMAIN}_device_info", {})[entry_id] = {}
+    entities = []
+    for module in PLATFORMS:
+        await module.async_setup_entry(hass, entry, lambda new, update_before_add=False: entities.extend(new))
+    for entity in entities:
+        entity.hass = hass
+    return entities
+
+
+def add_state_listeners(coordinator, entities):
+    """Register one listener per entity that computes its state like a state write would."""
+    for entity in entities:
+
+        def evaluate(entity=entity):
+            entity.state
+            entity.state_attributes
+            entity.extra_state_attributes
+
+        coordinator.async_add_listener(evaluate, entity.coordinator_context)
+
+
+async def bench_stages(hass, rounds, latency):
+    """Time the individual stages of one poll cycle."""
+    simulator = AlthermaSimulator(host=HOST, port=BASE_PORT, latency=latency, seed=1)
+    await simulator.start()
+    coordinator = DaikinAlthermaCoordinator(hass, HOST, BASE_PORT, 10, False)
+    results = {}
+    try:
+        async def connect():
+            coordinator.connection.close()
+            await coordinator.connection.async_get_client()
+
+        results["connect"] = await time_async(connect, rounds)
+
+        plan = coordinator.read_plans[frozenset(coordinator.tier_intervals)]
+        responses = []
+        for block in plan.blocks:
+
+            async def read(block=block):
+                responses.append((block, await coordinator._read_block(block)))
+
+            results[f"read_{block.function}_{block.start}_{block.count}"] = await time_async(read, rounds)
+        image = [
+            (block, response.bits if block.is_bit else response.registers)
+            for block, response in responses[-len(plan.blocks):]
+        ]
+
+        snapshot = RegisterSnapshot()
+
+        def decode():
+            for block, values in image:
+                decode_block(block, values, snapshot)
+
+        results["decode"] = time_sync(decode, rounds * 10)
+
+        # Zwei Snapshots mit umschaltenden Laufmeldungen, damit Flanken entstehen
+        await coordinator.async_refresh()
+        on_image = RegisterSnapshot()
+        on_image.copy_from(coordinator.data)
+        simulator.step(46 * 60)
+        await coordinator.async_request_refresh()
+        await coordinator.async_refresh()
+        off_image = RegisterSnapshot()
+        off_image.copy_from(coordinator.data)
+        images = [on_image, off_image]
+
+        def edges():
+            coordinator._track_last_triggered(images[1])
+            images.reverse()
+
+        results["edges"] = time_sync(edges, rounds * 10)
+
+        entities = await setup_entities(hass, coordinator, "bench")
+        add_state_listeners(coordinator, entities)
+        changed = off_image.diff(on_image)
+        results["entities"] = len(entities)
+
+        def fan_out_all():
+            coordinator._changed_keys = None
+            coordinator.async_update_listeners()
+
+        def fan_out_changed():
+            coordinator._changed_keys = set(changed)
+            coordinator.async_update_listeners()
+
+        results["fan_out_all"] = time_sync(fan_out_all, rounds)
+        results["fan_out_changed"] = time_sync(fan_out_changed, rounds)
+        results["fan_out_changed"]["changed_keys"] = len(changed)
+
+        async def poll():
+            coordinator._refresh_all_tiers = True
+            await coordinator._async_update_data()
+
+        results["poll"] = await time_async(poll, rounds)
+    finally:
+        await coordinator.async_shutdown()
+        await simulator.stop()
+    return results
+
+
+async def measure_loop_lag(stop, samples, interval=0.01):
+    """Sample how late the event loop wakes up a sleeping task."""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(time.perf_counter() - started - interval)
+
+
+async def bench_scaled(hass, count, rounds, latency):
+    """Poll ``count`` simulated heat pumps concurrently."""
+    simulators = [
+        AlthermaSimulator(host=HOST, port=BASE_PORT + 1 + index, latency=latency, seed=index)
+        for index in range(count)
+    ]
+    for simulator in simulators:
+        await simulator.start()
+    coordinators = [DaikinAlthermaCoordinator(hass, HOST, simulator.port, 10, False) for simulator in simulators]
+    try:
+        for index, coordinator in enumerate(coordinators):
+            await coordinator.async_refresh()
+            add_state_listeners(coordinator, await setup_entities(hass, coordinator, f"bench_{index}"))
+
+        stop = asyncio.Event()
+        lag = []
+        lag_task = asyncio.create_task(measure_loop_lag(stop, lag))
+
+        async def poll_all():
+            for coordinator in coordinators:
+                coordinator._refresh_all_tiers = True
+            await asyncio.gather(*(coordinator.async_refresh() for coordinator in coordinators))
+
+        result = await time_async(poll_all, rounds)
+        stop.set()
+        await lag_task
+        result["loop_lag"] = summarize(lag or [0.0])
+        result["failed_polls"] = sum(not coordinator.last_update_success for coordinator in coordinators)
+    finally:
+        for coordinator in coordinators:
+            await coordinator.async_shutdown()
+        for simulator in simulators:
+            await simulator.stop()
+    return result
+
+
+async def cancel_remaining_tasks():
+    """Cancel and await the tasks still pending, so none is destroyed with the event loop."""
+    current = asyncio.current_task()
+    tasks = [task for task in asyncio.all_tasks() if task is not current]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def print_results(results, baseline=None):
+    """Print a table of median timings, with the change against a baseline."""
+
+    def rows(prefix, section, base):
+        for name, value in section.items():
+            if not isinstance(value, dict) or "median_ms" not in value:
+                continue
+            line = f"{prefix}{name:<36} {value['median_ms']:9.3f} ms  p95 {value['p95_ms']:9.3f} ms"
+            old = (base or {}).get(name)
+            if isinstance(old, dict) and old.get("median_ms"):
+                line += f"  {(value['median_ms'] / old['median_ms'] - 1) * 100:+6.1f} %"
+            print(line)
+
+    rows("", results["stages"], (baseline or {}).get("stages"))
+    for count, scaled in results["scaled"].items():
+        base = (baseline or {}).get("scaled", {}).get(count)
+        print(f"-- {count} heat pump(s), failed polls: {scaled['failed_polls']}")
+        rows("   ", {"poll_round": scaled, "loop_lag": scaled["loop_lag"]}, base and {"poll_round": base, "loop_lag": base["loop_lag"]})
+
+
+async def main(args):
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        try:
+            latency = args.latency / 1000
+            results = {
+                "meta": {
+                    "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                    "python": platform.python_version(),
+                    "homeassistant": HA_VERSION,
+                    "pymodbus": pymodbus.__version__,
+                    "latency_ms": args.latency,
+                    "rounds": args.rounds,
+                },
+                "stages": await bench_stages(hass, args.rounds, latency),
+                "scaled": {},
+            }
+            for count in args.scale:
+                results["scaled"][str(count)] = await bench_scaled(hass, count, args.rounds, latency)
+        finally:
+            await hass.async_stop(force=True)
+            await cancel_remaining_tasks()
+
+    baseline = json.loads(Path(args.compare).read_text()) if args.compare else None
+    print_results(results, baseline)
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated adapter latency in ms")
+    parser.add_argument("--scale", type=int, nargs="*", default=[1, 5, 10], help="numbers of simulated heat pumps")
+    parser.add_argument("--json", help="write results to this JSON file")
+    parser.add_argument("--compare", help="earlier JSON results to compare against")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,176 @@
+"""Micro-benchmark: per-poll decode CPU time, legacy table walk vs. compiled read plan.
+
+The read plan also computes the final native values that the entities
+used to derive from the raw value on every state read, so the legacy
+side is measured with and without that per-entity conversion.
+
+Run from the repository root with Home Assistant and pymodbus installed:
+
+    python benchmarks/read_plan_benchmark.py
+
+Only the CPU work done on the event loop after the Modbus responses arrived
+is measured, so no adapter is needed.
+"""
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.ha_daikin_altherma4_modbus.const import (  # noqa: E402
+    INPUT_REGISTERS,
+    HOLDING_REGISTERS,
+    SELECT_REGISTERS,
+    DISCRETE_INPUT_SENSORS,
+    COIL_SENSORS,
+    BINARY_SENSORS,
+)
+from custom_components.ha_daikin_altherma4_modbus.read_plan import READ_PLAN, decode_block  # noqa: E402
+from custom_components.ha_daikin_altherma4_modbus.snapshot import RegisterSnapshot  # noqa: E402
+
+ROUNDS = 20000
+
+# Einige negative Temperaturen (Zweierkomplement) im Abbild
+INPUT_IMAGE = [2000 + i if i % 7 else 65536 - 150 - i for i in range(125)]
+HOLDING_IMAGE = [20 + i for i in range(125)]
+BIT_IMAGE = [bool(i % 3) for i in range(32)]
+
+
+def legacy_decode():
+    """Decode loop as it was inlined in _async_update_data before the read plan."""
+    addresses = [item["address"] - 1 for item in INPUT_REGISTERS]
+    start = 0
+    end = max(addresses)
+    registers = INPUT_IMAGE[start : end + 1]
+    data = {}
+    for item in INPUT_REGISTERS:
+        address = item["address"] - 1
+        reg_count = item.get("count", 1)
+        item.get("dtype", "uint16")
+        item.get("scale", 1)
+        input_type = item.get("input_type", "input")
+        unique_id = item.get("unique_id", f"{address}")
+        if reg_count == 1:
+            raw_value = registers[address - start]
+            if raw_value == 32766:
+                continue
+        else:
+            raw_value = registers[address - start : address - start + reg_count]
+            if raw_value and raw_value[0] == 32766:
+                continue
+        data[unique_id] = {"value": raw_value, "input_type": input_type, "address": address}
+
+    for items, default_type in ((DISCRETE_INPUT_SENSORS, "discrete_input"), (COIL_SENSORS, "coil")):
+        bit_addresses = [item["address"] - 1 for item in items]
+        bit_start = min(bit_addresses)
+        max(bit_addresses)
+        for item in items:
+            address = item["address"] - 1
+            input_type = item.get("input_type", default_type)
+            unique_id = item.get("unique_id", f"{default_type}_{address}")
+            if address - bit_start < len(BIT_IMAGE):
+                data[unique_id] = {
+                    "value": 1 if BIT_IMAGE[address - bit_start] else 0,
+                    "input_type": input_type,
+                    "address": address + 1,
+                }
+
+    all_holding_registers = []
+    all_holding_registers.extend(HOLDING_REGISTERS)
+    all_holding_registers.extend(SELECT_REGISTERS)
+    holding = HOLDING_IMAGE[:79]
+    for item in all_holding_registers:
+        address = item["address"] - 1
+        input_type = item.get("input_type", "holding")
+        unique_id = item.get("unique_id", f"holding_{address}")
+        if address < len(holding):
+            raw_value = holding[address]
+            if raw_value == 32766:
+                continue
+            data[unique_id] = {"value": raw_value, "input_type": input_type, "address": address + 1}
+
+    for item in BINARY_SENSORS:
+        address = item["address"] - 1
+        input_type = item.get("input_type", "input")
+        unique_id = item.get("unique_id", f"binary_{address}")
+        if unique_id not in data:
+            raw_value = registers[address - start]
+            if raw_value == 32766:
+                continue
+            data[unique_id] = {"value": raw_value, "input_type": input_type, "address": address + 1}
+    return data
+
+
+def legacy_native_values(data):
+    """Per-entity conversion as DaikinInputSensor/DaikinNumber.native_value did it."""
+    values = {}
+    for item in INPUT_REGISTERS:
+        entry = data.get(item.get("unique_id"))
+        if entry is None:
+            continue
+        val = entry["value"]
+        if val > 32767:
+            val = val - 65536
+        if item.get("enum_map"):
+            val = item["enum_map"].get(val, val)
+        scaled_value = val * item.get("scale", 1)
+        if item.get("unit") == "°C":
+            scaled_value = round(scaled_value, 2)
+        values[item["unique_id"]] = scaled_value
+    for item in HOLDING_REGISTERS:
+        entry = data.get(item.get("unique_id"))
+        if entry is None:
+            continue
+        val = entry["value"]
+        enum_map = item.get("enum_map")
+        if enum_map and val in enum_map:
+            values[item["unique_id"]] = val
+            continue
+        if val > 32767:
+            val = val - 65536
+        values[item["unique_id"]] = val * item.get("scale", 1)
+    return values
+
+
+def legacy_decode_and_convert():
+    """Legacy decode plus one state read of every sensor and number entity."""
+    return legacy_native_values(legacy_decode())
+
+
+SNAPSHOT = RegisterSnapshot()
+
+
+def plan_decode():
+    """Decode loop driven by the compiled read plan into a reused snapshot."""
+    data = SNAPSHOT
+    for block in READ_PLAN.input_blocks:
+        decode_block(block, INPUT_IMAGE[: block.count], data)
+    for block in READ_PLAN.discrete_blocks + READ_PLAN.coil_blocks:
+        decode_block(block, BIT_IMAGE[: block.count], data)
+    for block in READ_PLAN.holding_blocks:
+        decode_block(block, HOLDING_IMAGE[: block.count], data)
+    return data
+
+
+def main():
+    assert legacy_decode().keys() == plan_decode().keys()
+    plan_data = plan_decode()
+    unsigned_ids = {
+        item["unique_id"] for item in INPUT_REGISTERS + HOLDING_REGISTERS if item.get("dtype", "uint16") != "int16"
+    }
+    for unique_id, value in legacy_native_values(plan_data).items():
+        # Die Entitäten haben früher auch uint16-Register vorzeichenbehaftet gelesen
+        if unique_id in unsigned_ids and plan_data[unique_id]["value"] > 32767:
+            continue
+        assert plan_data[unique_id]["native_value"] == value, (unique_id, value, plan_data[unique_id])
+    legacy = min(timeit.repeat(legacy_decode, number=ROUNDS, repeat=5)) / ROUNDS
+    converted = min(timeit.repeat(legacy_decode_and_convert, number=ROUNDS, repeat=5)) / ROUNDS
+    plan = min(timeit.repeat(plan_decode, number=ROUNDS, repeat=5)) / ROUNDS
+    print(f"legacy decode:             {legacy * 1e6:8.2f} µs/poll")
+    print(f"legacy decode + entities:  {converted * 1e6:8.2f} µs/poll")
+    print(f"read plan (native values): {plan * 1e6:8.2f} µs/poll")
+    print(f"speed-up:                  {converted / plan:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Record a Modbus trace and replay it offline through the coordinator.
+
+    python benchmarks/replay_benchmark.py record trace.mbtrace [polls] [latency_ms]
+    python benchmarks/replay_benchmark.py replay trace.mbtrace [speed]
+
+``record`` polls the bundled simulator with the traffic recorder on. The
+thermal model runs two minutes per poll, so a few hundred polls contain
+compressor, DHW and defrost cycles.
+
+``replay`` feeds a trace into the coordinator, either one recorded with
+``record`` or one from a real installation (option "Record Modbus
+traffic"). ``speed`` 1 replays in real time, 0 (default) as fast as
+possible. It reports the CPU time per poll (decode, edge tracking, diff
+and listener notification without network I/O), the triggered edges and a
+checksum of the final register image. The trace is replayed twice to
+check that the result is deterministic.
+"""
+import asyncio
+import hashlib
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from altherma_simulator import AlthermaSimulator  # noqa: E402
+from custom_components.ha_daikin_altherma4_modbus.coordinator import DaikinAlthermaCoordinator  # noqa: E402
+from custom_components.ha_daikin_altherma4_modbus.traffic_log import async_replay  # noqa: E402
+
+HOST = "127.0.0.1"
+PORT = 15022
+
+
+async def record(hass, path, polls, latency_ms):
+    """Poll the simulator with the traffic recorder on."""
+    simulator = AlthermaSimulator(host=HOST, port=PORT, latency=latency_ms / 1000, seed=1)
+    await simulator.start()
+    coordinator = DaikinAlthermaCoordinator(hass, HOST, PORT, 10, False, traffic_log=str(path))
+    for _ in range(polls):
+        simulator.step(120)
+        await coordinator.async_refresh()
+    await coordinator.async_shutdown()
+    await simulator.stop()
+    print(f"recorded {polls} polls, {path.stat().st_size} bytes -> {path}")
+
+
+async def replay_once(hass, path, speed):
+    """Replay a trace and return (polls, CPU seconds, edges, checksum, requests, answered from image)."""
+    coordinator = DaikinAlthermaCoordinator(hass, "replay", 0, 10, False, replay_log=str(path), replay_speed=speed)
+    cpu_started = time.process_time()
+    polls = await async_replay(coordinator, speed)
+    cpu = time.process_time() - cpu_started
+    client = coordinator.connection.client
+    image = json.dumps(coordinator.data.raw_values(), sort_keys=True).encode()
+    result = (
+        polls,
+        cpu,
+        sorted(coordinator.last_triggered),
+        hashlib.sha1(image).hexdigest()[:12],
+        client.requests,
+        client.from_image,
+    )
+    await coordinator.async_shutdown()
+    return result
+
+
+async def replay(hass, path, speed):
+    """Replay a trace twice and report timings and determinism."""
+    first = await replay_once(hass, path, speed)
+    second = await replay_once(hass, path, speed)
+    polls, cpu, edges, checksum, requests, from_image = first
+    print(f"replayed {polls} polls, {requests} requests ({from_image} answered from the register image)")
+    print(f"CPU per poll:      {cpu / max(polls, 1) * 1e6:8.1f} µs")
+    print(f"triggered edges:   {edges}")
+    print(f"register checksum: {checksum}")
+    print(f"deterministic:     {first[2:] == second[2:]}")
+
+
+async def main(args):
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        path = Path(args[1])
+        if args[0] == "record":
+            polls = int(args[2]) if len(args) > 2 else 200
+            latency_ms = float(args[3]) if len(args) > 3 else 5.0
+            await record(hass, path, polls, latency_ms)
+        else:
+            speed = float(args[2]) if len(args) > 2 else 0.0
+            await replay(hass, path, speed)
+        await hass.async_stop(force=True)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or sys.argv[1] not in ("record", "replay"):
+        print(__doc__)
+        sys.exit(1)
+    asyncio.run(main(sys.argv[1:]))
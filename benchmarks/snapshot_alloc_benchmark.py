@@ -0,0 +1,163 @@
+"""Allocation benchmark: dict-of-dicts data vs. double-buffered register snapshot.
+
+Runs the CPU side of a poll (decode, diff against the previous image and
+handing the previous image over) for both data layouts and measures with
+tracemalloc:
+
+- peak:     bytes allocated on top of the steady state during one poll
+- resident: bytes held by the current and previous image together
+
+Run from the repository root with Home Assistant and pymodbus installed:
+
+    python benchmarks/snapshot_alloc_benchmark.py
+"""
+import sys
+import timeit
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.ha_daikin_altherma4_modbus.read_plan import (  # noqa: E402
+    READ_PLAN,
+    UNSUPPORTED_VALUE,
+    decode_block,
+    native_value,
+)
+from custom_components.ha_daikin_altherma4_modbus.snapshot import RegisterSnapshot  # noqa: E402
+
+POLLS = 1000
+
+# Zwei abwechselnde Abbilder, damit jeder Poll Änderungen enthält
+IMAGES = [
+    (
+        [2000 + i + step if i % 7 else 65536 - 150 - i for i in range(125)],
+        [bool((i + step) % 3) for i in range(32)],
+        [20 + i + step for i in range(125)],
+    )
+    for step in (0, 1)
+]
+
+
+def block_values(block, image):
+    """Pick the register image matching the function code of a block."""
+    inputs, bits, holdings = image
+    if block.is_bit:
+        return bits[: block.count]
+    return (inputs if block.function == "input" else holdings)[: block.count]
+
+
+def legacy_decode_block(block, values, data):
+    """Block decode into a dict of entry dicts, as before the snapshot."""
+    columns = block.columns
+    if block.is_bit:
+        for slot in block.slots:
+            raw_value = 1 if values[slot.offset] else 0
+            data[slot.unique_id] = {
+                "value": raw_value,
+                "native_value": raw_value,
+                "input_type": slot.input_type,
+                "address": slot.address,
+            }
+        return
+    raw = columns.take(values)
+    native = columns.native_values(values, raw)
+    for slot, raw_value, value in zip((s for s in block.slots if s.count == 1), raw, native):
+        if raw_value == UNSUPPORTED_VALUE:
+            data.pop(slot.unique_id, None)
+            continue
+        data[slot.unique_id] = {"value": raw_value, "native_value": value, "input_type": slot.input_type, "address": slot.address}
+    for slot in block.slots:
+        if slot.count > 1:
+            raw_value = values[slot.offset : slot.stop]
+            data[slot.unique_id] = {
+                "value": raw_value,
+                "native_value": native_value(slot.unique_id, raw_value),
+                "input_type": slot.input_type,
+                "address": slot.address,
+            }
+
+
+class LegacyPoller:
+    """Copy the dict, decode into it, diff and copy it again into previous_data."""
+
+    def __init__(self):
+        self.data = {}
+        self.previous_data = {}
+        self.polls = 0
+
+    def poll(self):
+        image = IMAGES[self.polls % 2]
+        self.polls += 1
+        data = dict(self.data)
+        for block in READ_PLAN.blocks:
+            legacy_decode_block(block, block_values(block, image), data)
+        self.data = data
+        changed = {key for key in self.previous_data.keys() | data.keys() if self.previous_data.get(key) != data.get(key)}
+        self.previous_data = data.copy()
+        return changed
+
+
+class SnapshotPoller:
+    """Decode into the back buffer, diff against the front buffer and swap."""
+
+    def __init__(self):
+        self.data = RegisterSnapshot()
+        self.previous_data = RegisterSnapshot()
+        self.polls = 0
+
+    def poll(self):
+        image = IMAGES[self.polls % 2]
+        self.polls += 1
+        data = self.previous_data
+        data.copy_from(self.data)
+        for block in READ_PLAN.blocks:
+            decode_block(block, block_values(block, image), data)
+        changed = data.diff(self.data)
+        self.previous_data, self.data = self.data, data
+        return changed
+
+
+def measure(poller_type):
+    """Measure one data layout."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    poller = poller_type()
+    poller.poll()
+    poller.poll()
+    resident = tracemalloc.get_traced_memory()[0] - before
+
+    peaks = []
+    for _ in range(100):
+        current = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        poller.poll()
+        peaks.append(tracemalloc.get_traced_memory()[1] - current)
+    tracemalloc.stop()
+
+    seconds = min(timeit.repeat(poller.poll, number=POLLS, repeat=5)) / POLLS
+    return {
+        "peak": sorted(peaks)[len(peaks) // 2],
+        "resident": resident,
+        "seconds": seconds,
+    }
+
+
+def main():
+    legacy, snapshot = LegacyPoller(), SnapshotPoller()
+    for _ in range(4):
+        assert legacy.poll() == snapshot.poll()
+        assert {key: dict(entry) for key, entry in snapshot.data.items()} == legacy.data
+
+    results = {"dict of dicts": measure(LegacyPoller), "snapshot": measure(SnapshotPoller)}
+    for name, result in results.items():
+        print(
+            f"{name:<14} peak {result['peak']:8d} B/poll  resident {result['resident']:8d} B  "
+            f"{result['seconds'] * 1e6:7.1f} µs/poll"
+        )
+    legacy_peak, snapshot_peak = results["dict of dicts"]["peak"], results["snapshot"]["peak"]
+    print(f"peak allocation per poll reduced by {(1 - snapshot_peak / legacy_peak) * 100:.0f} %")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,15 @@
 import logging
-from .const import DOMAIN
-from .coordinator import DaikinAlthermaCoordinator
+from homeassistant.util import dt as dt_util
+from .const import (
+    DOMAIN,
+    DEFAULT_MAX_IN_FLIGHT,
+    DEFAULT_FAST_SCAN_INTERVAL,
+    DEFAULT_SLOW_SCAN_INTERVAL,
+    DEFAULT_EDGE_WATCH_INTERVAL,
+    DEFAULT_IDLE_SCAN_INTERVAL,
+    DEFAULT_MAX_VALUE_AGE,
+)
+from .coordinator import DaikinAlthermaCoordinator, async_remove_snapshot
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -10,6 +19,20 @@ async def async_setup_entry(hass, entry):
     port = entry.data.get("port", 502)
     scan_interval = entry.data.get("scan_interval", 10)
     demo_mode = entry.data.get("demo_mode", False)
+    pipelined_reads = entry.data.get("pipelined_reads", False)
+    max_in_flight = entry.data.get("max_in_flight", DEFAULT_MAX_IN_FLIGHT)
+    fast_scan_interval = entry.data.get("fast_scan_interval", DEFAULT_FAST_SCAN_INTERVAL)
+    slow_scan_interval = entry.data.get("slow_scan_interval", DEFAULT_SLOW_SCAN_INTERVAL)
+    edge_watch_interval = entry.data.get("edge_watch_interval", DEFAULT_EDGE_WATCH_INTERVAL)
+    idle_scan_interval = entry.data.get("idle_scan_interval", DEFAULT_IDLE_SCAN_INTERVAL)
+    max_value_age = entry.data.get("max_value_age", DEFAULT_MAX_VALUE_AGE)
+    traffic_log = None
+    if entry.data.get("record_traffic", False):
+        # Eine Datei pro Start, damit ein Neustart keinen Mitschnitt überschreibt
+        traffic_log = hass.config.path(
+            f"{DOMAIN}_traffic", f"{entry.entry_id}_{dt_util.now().strftime('%Y%m%d_%H%M%S')}.mbtrace"
+        )
+        _LOGGER.info(f"Modbus-Mitschnitt nach {traffic_log}")
     
     # Create device info with connection parameters
     device_info = {
@@ -30,11 +53,33 @@ async def async_setup_entry(hass, entry):
         port,
         scan_interval,
         demo_mode,
+        pipelined_reads,
+        max_in_flight,
+        fast_scan_interval,
+        slow_scan_interval,
+        edge_watch_interval=edge_watch_interval,
+        storage_key=f"{DOMAIN}.{entry.entry_id}",
+        idle_scan_interval=idle_scan_interval,
+        traffic_log=traffic_log,
+        max_value_age=max_value_age,
+        electric_power_sensor=entry.data.get("electric_power_sensor"),
     )
-    await coordinator.async_config_entry_first_refresh()
+    await coordinator.async_load_energy()
+    if await coordinator.async_load_snapshot():
+        # Warmstart: Entitäten sofort aus dem gespeicherten Snapshot, Live-Daten im Hintergrund
+        entry.async_create_background_task(hass, coordinator.async_refresh(), f"{DOMAIN} first refresh")
+    else:
+        try:
+            await coordinator.async_config_entry_first_refresh()
+        except Exception:
+            # Verbindung nicht offen lassen, wenn das Setup erneut versucht wird
+            await coordinator.async_shutdown()
+            raise
 
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
+    coordinator.async_start_edge_watch()
+    coordinator.async_start_external_power()
 
     await hass.config_entries.async_forward_entry_setups(entry, ["sensor", "binary_sensor", "number", "select", "climate", "switch"])
     return True
@@ -62,6 +107,11 @@ async def async_update_entry(hass, entry):
         new_data["scan_interval"] = entry.options["scan_interval"]
         _LOGGER.debug(f"Updated scan_interval to: {entry.options['scan_interval']}")
     
+    for key in ("fast_scan_interval", "slow_scan_interval", "edge_watch_interval", "idle_scan_interval", "max_value_age", "pipelined_reads", "max_in_flight", "record_traffic"):
+        if key in entry.options:
+            new_data[key] = entry.options[key]
+            _LOGGER.debug(f"Updated {key} to: {entry.options[key]}")
+    
     # Update electric_power_sensor if present
     if "electric_power_sensor" in entry.options:
         if entry.options["electric_power_sensor"].strip():
@@ -85,8 +135,14 @@ async def async_unload_entry(hass, entry):
     """Handle config entry unload."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, ["sensor", "binary_sensor", "number", "select", "climate", "switch"])
     if unload_ok:
+        # Der Koordinator wird über entry.async_on_unload heruntergefahren
         hass.data[DOMAIN].pop(entry.entry_id)
         # Clean up device info
         if f"{DOMAIN}_device_info" in hass.data:
             hass.data[f"{DOMAIN}_device_info"].pop(entry.entry_id, None)
     return unload_ok
+
+
+async def async_remove_entry(hass, entry):
+    """Remove the persisted snapshot and energy counters of a deleted config entry."""
+    await async_remove_snapshot(hass, f"{DOMAIN}.{entry.entry_id}")
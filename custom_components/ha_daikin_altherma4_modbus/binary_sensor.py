@@ -2,7 +2,7 @@ import logging
 from homeassistant.components.binary_sensor import BinarySensorEntity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.const import EntityCategory
-from .const import DOMAIN, BINARY_SENSORS, INPUT_DEVICE_INFO, DISCRETE_INPUT_SENSORS, DISCRETE_INPUT_DEVICE_INFO
+from .const import DOMAIN, BINARY_SENSORS, INPUT_DEVICE_INFO, DISCRETE_INPUT_SENSORS, DISCRETE_INPUT_DEVICE_INFO, CALCULATED_DEVICE_INFO
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -41,6 +41,9 @@ async def async_setup_entry(hass, entry, async_add_entities):
             )
         )
 
+    # Zeigt an, dass die Werte noch aus dem gespeicherten Snapshot stammen
+    entities.append(DaikinSnapshotCacheSensor(coordinator, entry))
+
     async_add_entities(entities)
 
 
@@ -50,15 +53,21 @@ class DaikinBinarySensor(CoordinatorEntity, BinarySensorEntity):
     _attr_has_entity_name = True
 
     def __init__(self, coordinator, entry, name, address, device_class, entity_category=None, unique_id=None, translation_key=None):
-        super().__init__(coordinator)
+        unique_id = unique_id or f"{DOMAIN}_{address}"
+        super().__init__(coordinator, context=frozenset((unique_id,)))
         self._entry = entry
         self._address = address
-        self._attr_unique_id = unique_id or f"{DOMAIN}_{address}"
+        self._attr_unique_id = unique_id
         self._attr_device_class = device_class
         self._attr_entity_category = entity_category
         self._attr_device_info = INPUT_DEVICE_INFO
         self._attr_translation_key = translation_key
 
+    @property
+    def available(self):
+        """Unavailable once a register failed to read for longer than the max value age."""
+        return super().available and self.coordinator.keys_available(self.coordinator_context)
+
     @property
     def is_on(self):
         """Gibt True zurück, wenn der Wert 1 ist."""
@@ -75,15 +84,21 @@ class DaikinDiscreteInputSensor(CoordinatorEntity, BinarySensorEntity):
     _attr_has_entity_name = True
 
     def __init__(self, coordinator, entry, name, address, device_class, entity_category=None, unique_id=None, translation_key=None):
-        super().__init__(coordinator)
+        unique_id = unique_id or f"{DOMAIN}_discrete_{address}"
+        super().__init__(coordinator, context=frozenset((unique_id,)))
         self._entry = entry
         self._address = address
-        self._attr_unique_id = unique_id or f"{DOMAIN}_discrete_{address}"
+        self._attr_unique_id = unique_id
         self._attr_device_class = device_class
         self._attr_entity_category = entity_category
         self._attr_device_info = DISCRETE_INPUT_DEVICE_INFO
         self._attr_translation_key = translation_key
 
+    @property
+    def available(self):
+        """Unavailable once a register failed to read for longer than the max value age."""
+        return super().available and self.coordinator.keys_available(self.coordinator_context)
+
     @property
     def is_on(self):
         """Gibt True zurück, wenn der Wert 1 ist."""
@@ -91,4 +106,29 @@ class DaikinDiscreteInputSensor(CoordinatorEntity, BinarySensorEntity):
         if data is None:
             return False
         val = data.get("value")
-        return val == 1
\ No newline at end of file
+        return val == 1
+
+
+class DaikinSnapshotCacheSensor(CoordinatorEntity, BinarySensorEntity):
+    """On while the entities show the persisted snapshot instead of live values."""
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_translation_key = "snapshot_cached"
+
+    def __init__(self, coordinator, entry):
+        super().__init__(coordinator)
+        self._entry = entry
+        self._attr_unique_id = f"{DOMAIN}_snapshot_cached"
+        self._attr_device_info = CALCULATED_DEVICE_INFO
+
+    @property
+    def is_on(self):
+        """Return True until the first live poll succeeded."""
+        return self.coordinator.cached_at is not None
+
+    @property
+    def extra_state_attributes(self):
+        """Time the cached snapshot was saved."""
+        cached_at = self.coordinator.cached_at
+        return {"cached_at": cached_at.isoformat()} if cached_at else None
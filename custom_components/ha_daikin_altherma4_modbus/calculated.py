@@ -0,0 +1,116 @@
+"""Calculated values evaluated once per poll.
+
+Every ``CALCULATED_SENSORS`` entry of type ``formula`` declares its
+``inputs`` (register keys or keys of other calculated values) and a
+``formula`` taking the native input values in that order. The entries are
+sorted into dependency order once at import. After a poll the coordinator
+passes the changed data keys: only values with a changed input are
+recomputed, and their own keys count as changed for the values depending on
+them, so a shared intermediate like ΔT is computed once per poll. The
+results are stored as extra keys in the snapshot, where the entities read
+them.
+"""
+import logging
+from collections.abc import Mapping
+
+from .const import CALCULATED_SENSORS
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CalculatedValue:
+    """One declared value: inputs, formula and rounding."""
+
+    __slots__ = ("key", "inputs", "input_set", "formula", "precision", "accepts_none")
+
+    def __init__(self, definition):
+        self.key = definition["unique_id"]
+        self.inputs = tuple(definition["inputs"])
+        self.input_set = frozenset(self.inputs)
+        self.formula = definition["formula"]
+        self.precision = definition.get("precision")
+        # Sonst ergibt ein fehlender Eingang direkt None
+        self.accepts_none = definition.get("accepts_none", False)
+
+    def evaluate(self, data):
+        """Compute the value from the native values in data, None if an input is missing."""
+        args = []
+        for key in self.inputs:
+            value = data.get(key)
+            if isinstance(value, Mapping):
+                value = value["native_value"]
+            if value is None and not self.accepts_none:
+                return None
+            args.append(value)
+        try:
+            result = self.formula(*args)
+        except (ArithmeticError, TypeError, ValueError) as err:
+            _LOGGER.debug(f"{self.key} nicht berechenbar: {err}")
+            return None
+        if result is not None and self.precision is not None:
+            result = round(result, self.precision)
+        return result
+
+
+class CalculationGraph:
+    """Calculated values in dependency order."""
+
+    def __init__(self, definitions):
+        values = {
+            definition["unique_id"]: CalculatedValue(definition)
+            for definition in definitions
+            if definition.get("type") == "formula"
+        }
+        self.values = tuple(_dependency_order(values))
+        # Register-Keys, von denen ein Wert direkt oder über Zwischenwerte abhängt
+        self.register_keys = {}
+        for value in self.values:
+            keys = set()
+            for key in value.inputs:
+                keys |= self.register_keys.get(key, {key})
+            self.register_keys[value.key] = frozenset(keys)
+
+    def update(self, data, changed=None):
+        """Recompute the values with a changed input into data and return the keys that changed.
+
+        ``changed`` None recomputes everything, e.g. for a freshly loaded snapshot.
+        """
+        updated = set()
+        for value in self.values:
+            if (
+                changed is not None
+                and value.key in data
+                and value.input_set.isdisjoint(changed)
+                and value.input_set.isdisjoint(updated)
+            ):
+                continue
+            result = value.evaluate(data)
+            if value.key not in data or data[value.key] != result:
+                data[value.key] = result
+                updated.add(value.key)
+        return updated
+
+
+def _dependency_order(values):
+    """Yield the values so that every value comes after the calculated values it uses."""
+    done = set()
+    visiting = set()
+
+    def visit(value):
+        if value.key in done:
+            return
+        if value.key in visiting:
+            raise ValueError(f"Zyklische Abhängigkeit bei berechnetem Wert {value.key}")
+        visiting.add(value.key)
+        for key in value.inputs:
+            if key in values:
+                yield from visit(values[key])
+        visiting.discard(value.key)
+        done.add(value.key)
+        yield value
+
+    for value in values.values():
+        yield from visit(value)
+
+
+CALCULATIONS = CalculationGraph(CALCULATED_SENSORS)
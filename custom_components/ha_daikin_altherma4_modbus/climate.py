@@ -39,7 +39,16 @@ class DaikinThermostatClimate(CoordinatorEntity, ClimateEntity):
     _attr_has_entity_name = True
     
     def __init__(self, coordinator, entry):
-        super().__init__(coordinator)
+        super().__init__(
+            coordinator,
+            context=frozenset((
+                f"{DOMAIN}_input_{REGISTER_CURRENT_TEMP}",
+                f"{DOMAIN}_holding_{REGISTER_OFFSET}",
+                f"{DOMAIN}_holding_{REGISTER_OPERATION_MODE}",
+                f"{DOMAIN}_holding_{REGISTER_QUIET_MODE}",
+                f"{DOMAIN}_input_{REGISTER_COMPRESSOR}",
+            )),
+        )
         self._entry = entry
         self._attr_unique_id = f"{DOMAIN}_thermostat_climate"
         self._attr_temperature_unit = UnitOfTemperature.CELSIUS
@@ -50,6 +59,11 @@ class DaikinThermostatClimate(CoordinatorEntity, ClimateEntity):
         self._attr_device_info = CALCULATED_DEVICE_INFO
         self._attr_translation_key = "daikin_thermostat_climate"
 
+    @property
+    def available(self):
+        """Unavailable once a register failed to read for longer than the max value age."""
+        return super().available and self.coordinator.keys_available(self.coordinator_context)
+
     def _get_offset_register_config(self):
         """Get configuration for holding register 53 (offset)."""
         for register in HOLDING_REGISTERS:
@@ -163,8 +177,7 @@ class DaikinThermostatClimate(CoordinatorEntity, ClimateEntity):
         
         # Schreibe neuen Offset in Holding Register 53
         try:
-            await self.coordinator.client.write_register(REGISTER_OFFSET, offset_raw)
-            await self.coordinator.async_request_refresh()
+            await self.coordinator.async_write_register(REGISTER_OFFSET, offset_raw)
             _LOGGER.debug(f"Set thermostat offset to {offset}°C (raw: {offset_raw})")
         except Exception as e:
             _LOGGER.error(f"Failed to set thermostat offset: {e}")
@@ -175,8 +188,7 @@ class DaikinThermostatClimate(CoordinatorEntity, ClimateEntity):
         mode_raw = mode_map.get(hvac_mode, 0)
         
         try:
-            await self.coordinator.client.write_register(REGISTER_OPERATION_MODE, mode_raw)
-            await self.coordinator.async_request_refresh()
+            await self.coordinator.async_write_register(REGISTER_OPERATION_MODE, mode_raw)
             _LOGGER.debug(f"Set HVAC mode to {hvac_mode} (raw: {mode_raw})")
         except Exception as e:
             _LOGGER.error(f"Failed to set HVAC mode: {e}")
@@ -187,8 +199,7 @@ class DaikinThermostatClimate(CoordinatorEntity, ClimateEntity):
         mode_raw = fan_map.get(fan_mode, 0)
         
         try:
-            await self.coordinator.client.write_register(REGISTER_QUIET_MODE, mode_raw)
-            await self.coordinator.async_request_refresh()
+            await self.coordinator.async_write_register(REGISTER_QUIET_MODE, mode_raw)
             _LOGGER.debug(f"Set fan mode to {fan_mode} (raw: {mode_raw})")
         except Exception as e:
             _LOGGER.error(f"Failed to set fan mode: {e}")
@@ -250,7 +261,15 @@ class DaikinDHWManualThermostat(CoordinatorEntity, ClimateEntity):
     _attr_has_entity_name = True
 
     def __init__(self, coordinator, entry):
-        super().__init__(coordinator)
+        super().__init__(
+            coordinator,
+            context=frozenset((
+                f"{DOMAIN}_holding_14",
+                f"{DOMAIN}_holding_15",
+                f"{DOMAIN}_discrete_18",
+                f"{DOMAIN}_input_42",
+            )),
+        )
         self._entry = entry
         self._attr_unique_id = f"{DOMAIN}_dhw_manual_thermostat"
         self._attr_temperature_unit = UnitOfTemperature.CELSIUS
@@ -265,6 +284,11 @@ class DaikinDHWManualThermostat(CoordinatorEntity, ClimateEntity):
         self._attr_device_info = CALCULATED_DEVICE_INFO
         self._attr_translation_key = "daikin_dhw_manual_thermostat"
 
+    @property
+    def available(self):
+        """Unavailable once a register failed to read for longer than the max value age."""
+        return super().available and self.coordinator.keys_available(self.coordinator_context)
+
     @property
     def hvac_mode(self):
         """Return current HVAC mode."""
@@ -321,23 +345,21 @@ class DaikinDHWManualThermostat(CoordinatorEntity, ClimateEntity):
         if hvac_mode == HVACMode.HEAT:
             # Turn ON DHW Single heat-up (Manual) - address 14
             try:
-                result = await self.coordinator.client.write_register(14, 1)
+                result = await self.coordinator.async_write_register(14, 1)
                 if result.isError():
                     _LOGGER.error(f"Failed to turn on DHW manual heat-up: {result}")
                 else:
                     _LOGGER.debug("Successfully turned on DHW manual heat-up")
-                    await self.coordinator.async_request_refresh()
             except Exception as e:
                 _LOGGER.error(f"Error turning on DHW manual heat-up: {e}")
         elif hvac_mode == HVACMode.OFF:
             # Turn OFF DHW Single heat-up (Manual) - address 14
             try:
-                result = await self.coordinator.client.write_register(14, 0)
+                result = await self.coordinator.async_write_register(14, 0)
                 if result.isError():
                     _LOGGER.error(f"Failed to turn off DHW manual heat-up: {result}")
                 else:
                     _LOGGER.debug("Successfully turned off DHW manual heat-up")
-                    await self.coordinator.async_request_refresh()
             except Exception as e:
                 _LOGGER.error(f"Error turning off DHW manual heat-up: {e}")
 
@@ -355,11 +377,10 @@ class DaikinDHWManualThermostat(CoordinatorEntity, ClimateEntity):
         
         # Set DHW Single heat-up setpoint (Manual) - address 15
         try:
-            result = await self.coordinator.client.write_register(15, raw_value)
+            result = await self.coordinator.async_write_register(15, raw_value)
             if result.isError():
                 _LOGGER.error(f"Failed to set DHW manual heat-up temperature: {result}")
             else:
                 _LOGGER.debug(f"Successfully set DHW manual heat-up temperature to {temperature}°C (raw: {raw_value})")
-                await self.coordinator.async_request_refresh()
         except Exception as e:
             _LOGGER.error(f"Error setting DHW manual heat-up temperature: {e}")
@@ -2,12 +2,44 @@ import voluptuous as vol
 import logging
 from homeassistant import config_entries
 from homeassistant.const import CONF_HOST, CONF_PORT
-from .const import DOMAIN
+from .const import (
+    DOMAIN,
+    DEFAULT_MAX_IN_FLIGHT,
+    DEFAULT_FAST_SCAN_INTERVAL,
+    DEFAULT_SLOW_SCAN_INTERVAL,
+    DEFAULT_EDGE_WATCH_INTERVAL,
+    DEFAULT_IDLE_SCAN_INTERVAL,
+    DEFAULT_MAX_VALUE_AGE,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
 DEFAULT_PORT = 502
 
+# Poll-Intervalle und Anfragen gleichzeitig; ein Intervall 0 fragte den Adapter ohne Pause ab
+POSITIVE_INT = vol.All(int, vol.Range(min=1))
+# Werte, bei denen 0 eine Bedeutung hat (z.B. Überwachung der Discrete Inputs aus)
+NON_NEGATIVE_INT = vol.All(int, vol.Range(min=0))
+
+
+def _validate_intervals(user_input):
+    """Return form errors for poll settings that do not fit together."""
+    errors = {}
+    scan_interval = user_input.get("scan_interval", 10)
+    # Schnelle Stufe <= normale Stufe (scan_interval) <= langsame Stufe
+    if user_input.get("fast_scan_interval", DEFAULT_FAST_SCAN_INTERVAL) > scan_interval:
+        errors["fast_scan_interval"] = "invalid_fast_scan_interval"
+    if user_input.get("slow_scan_interval", DEFAULT_SLOW_SCAN_INTERVAL) < scan_interval:
+        errors["slow_scan_interval"] = "invalid_slow_scan_interval"
+    # Leerlauf-Obergrenze 0: festes Intervall; sonst darf sie nicht unter dem Scan-Intervall liegen
+    idle_scan_interval = user_input.get("idle_scan_interval", DEFAULT_IDLE_SCAN_INTERVAL)
+    if idle_scan_interval and idle_scan_interval < scan_interval:
+        errors["idle_scan_interval"] = "invalid_idle_scan_interval"
+    if user_input.get("max_in_flight", DEFAULT_MAX_IN_FLIGHT) < 1:
+        errors["max_in_flight"] = "invalid_max_in_flight"
+    return errors
+
+
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Minimaler Config Flow für Daikin Altherma 4 Modbus."""
 
@@ -22,16 +54,26 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             # Scan Interval Default setzen, falls nicht angegeben
             if "scan_interval" not in user_input:
                 user_input["scan_interval"] = 10
-            return self.async_create_entry(
-                title=f"Daikin Altherma 4 ({user_input[CONF_HOST]})",
-                data=user_input
-            )
+            errors = _validate_intervals(user_input)
+            if not errors:
+                return self.async_create_entry(
+                    title=f"Daikin Altherma 4 ({user_input[CONF_HOST]})",
+                    data=user_input
+                )
 
         data_schema = vol.Schema({
             vol.Required(CONF_HOST, default=""): str,
             vol.Optional(CONF_PORT, default=DEFAULT_PORT): int,
-            vol.Optional("scan_interval", default=10): int,
+            vol.Optional("scan_interval", default=10): POSITIVE_INT,
+            vol.Optional("fast_scan_interval", default=DEFAULT_FAST_SCAN_INTERVAL): POSITIVE_INT,
+            vol.Optional("slow_scan_interval", default=DEFAULT_SLOW_SCAN_INTERVAL): POSITIVE_INT,
+            vol.Optional("edge_watch_interval", default=DEFAULT_EDGE_WATCH_INTERVAL): NON_NEGATIVE_INT,
+            vol.Optional("idle_scan_interval", default=DEFAULT_IDLE_SCAN_INTERVAL): NON_NEGATIVE_INT,
+            vol.Optional("max_value_age", default=DEFAULT_MAX_VALUE_AGE): NON_NEGATIVE_INT,
             vol.Optional("electric_power_sensor"): str,
+            vol.Optional("pipelined_reads", default=False): bool,
+            vol.Optional("max_in_flight", default=DEFAULT_MAX_IN_FLIGHT): POSITIVE_INT,
+            vol.Optional("record_traffic", default=False): bool,
             vol.Optional("demo_mode", default=False): bool,
         })
 
@@ -70,12 +112,23 @@ class OptionsFlow(config_entries.OptionsFlow):
             port = user_input.get("port")
             if port is not None and (port < 1 or port > 65535):
                 errors["port"] = "invalid_port"
+
+            # Validate scan intervals and in-flight limit
+            errors.update(_validate_intervals(user_input))
+            max_in_flight = user_input.get("max_in_flight")
             
             # If no errors, proceed with update
             if not errors:
                 # Process all options
                 scan_interval = user_input.get("scan_interval")
+                fast_scan_interval = user_input.get("fast_scan_interval")
+                slow_scan_interval = user_input.get("slow_scan_interval")
+                edge_watch_interval = user_input.get("edge_watch_interval")
+                idle_scan_interval = user_input.get("idle_scan_interval")
+                max_value_age = user_input.get("max_value_age")
                 electric_power_sensor = user_input.get("electric_power_sensor")
+                pipelined_reads = user_input.get("pipelined_reads")
+                record_traffic = user_input.get("record_traffic")
                 
                 # Create options data
                 options_data = {}
@@ -98,6 +151,40 @@ class OptionsFlow(config_entries.OptionsFlow):
                     new_data["scan_interval"] = scan_interval
                     _LOGGER.debug(f"Updating scan_interval to: {scan_interval}")
                 
+                # Update tier intervals
+                if fast_scan_interval is not None:
+                    new_data["fast_scan_interval"] = fast_scan_interval
+                    _LOGGER.debug(f"Updating fast_scan_interval to: {fast_scan_interval}")
+                
+                if slow_scan_interval is not None:
+                    new_data["slow_scan_interval"] = slow_scan_interval
+                    _LOGGER.debug(f"Updating slow_scan_interval to: {slow_scan_interval}")
+                
+                if edge_watch_interval is not None:
+                    new_data["edge_watch_interval"] = edge_watch_interval
+                    _LOGGER.debug(f"Updating edge_watch_interval to: {edge_watch_interval}")
+                
+                if idle_scan_interval is not None:
+                    new_data["idle_scan_interval"] = idle_scan_interval
+                    _LOGGER.debug(f"Updating idle_scan_interval to: {idle_scan_interval}")
+                
+                if max_value_age is not None:
+                    new_data["max_value_age"] = max_value_age
+                    _LOGGER.debug(f"Updating max_value_age to: {max_value_age}")
+                
+                # Update pipelining
+                if pipelined_reads is not None:
+                    new_data["pipelined_reads"] = pipelined_reads
+                    _LOGGER.debug(f"Updating pipelined_reads to: {pipelined_reads}")
+                
+                if max_in_flight is not None:
+                    new_data["max_in_flight"] = max_in_flight
+                    _LOGGER.debug(f"Updating max_in_flight to: {max_in_flight}")
+                
+                if record_traffic is not None:
+                    new_data["record_traffic"] = record_traffic
+                    _LOGGER.debug(f"Updating record_traffic to: {record_traffic}")
+                
                 # Update electric_power_sensor
                 if electric_power_sensor and electric_power_sensor.strip():
                     new_data["electric_power_sensor"] = electric_power_sensor.strip()
@@ -118,15 +205,31 @@ class OptionsFlow(config_entries.OptionsFlow):
         current_host = self._config_entry.data.get("host", "")
         current_port = self._config_entry.data.get("port", DEFAULT_PORT)
         current_scan_interval = self._config_entry.data.get("scan_interval", 10)
+        current_fast_scan_interval = self._config_entry.data.get("fast_scan_interval", DEFAULT_FAST_SCAN_INTERVAL)
+        current_slow_scan_interval = self._config_entry.data.get("slow_scan_interval", DEFAULT_SLOW_SCAN_INTERVAL)
+        current_edge_watch_interval = self._config_entry.data.get("edge_watch_interval", DEFAULT_EDGE_WATCH_INTERVAL)
+        current_idle_scan_interval = self._config_entry.data.get("idle_scan_interval", DEFAULT_IDLE_SCAN_INTERVAL)
+        current_max_value_age = self._config_entry.data.get("max_value_age", DEFAULT_MAX_VALUE_AGE)
         current_electric_power_sensor = self._config_entry.data.get("electric_power_sensor", "")
+        current_pipelined_reads = self._config_entry.data.get("pipelined_reads", False)
+        current_max_in_flight = self._config_entry.data.get("max_in_flight", DEFAULT_MAX_IN_FLIGHT)
+        current_record_traffic = self._config_entry.data.get("record_traffic", False)
         
         _LOGGER.debug(f"OptionsFlow showing form. Current values: host='{current_host}', port={current_port}, scan_interval={current_scan_interval}, electric_power_sensor='{current_electric_power_sensor}'")
         
         data_schema = vol.Schema({
             vol.Required("host", default=current_host): str,
             vol.Optional("port", default=current_port): int,
-            vol.Optional("scan_interval", default=current_scan_interval): int,
+            vol.Optional("scan_interval", default=current_scan_interval): POSITIVE_INT,
+            vol.Optional("fast_scan_interval", default=current_fast_scan_interval): POSITIVE_INT,
+            vol.Optional("slow_scan_interval", default=current_slow_scan_interval): POSITIVE_INT,
+            vol.Optional("edge_watch_interval", default=current_edge_watch_interval): NON_NEGATIVE_INT,
+            vol.Optional("idle_scan_interval", default=current_idle_scan_interval): NON_NEGATIVE_INT,
+            vol.Optional("max_value_age", default=current_max_value_age): NON_NEGATIVE_INT,
             vol.Optional("electric_power_sensor", default=current_electric_power_sensor): str,
+            vol.Optional("pipelined_reads", default=current_pipelined_reads): bool,
+            vol.Optional("max_in_flight", default=current_max_in_flight): POSITIVE_INT,
+            vol.Optional("record_traffic", default=current_record_traffic): bool,
         })
 
         return self.async_show_form(
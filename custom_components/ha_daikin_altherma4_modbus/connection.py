@@ -0,0 +1,245 @@
+"""Modbus TCP connection manager for the Daikin Altherma 4 adapter.
+
+The adapter reboots from time to time (firmware updates, power cuts) and
+then refuses connections for a minute or more. Instead of trying to
+connect on every coordinator tick, the manager backs off exponentially
+with jitter and opens a circuit breaker after repeated failures: while
+the circuit is open, callers fail immediately without touching the
+network. Once the backoff delay has passed, a single half-open probe
+decides whether the circuit closes again.
+
+The adapter accepts at most three concurrent connections across ports 502
+and 802. ``acquire_connection`` therefore hands out one shared manager
+per (host, port, TLS) to every coordinator and tool in the process and
+closes the connection when the last user releases it. Entity unique_ids
+are not scoped per config entry yet, so a second entry for the same heat
+pump is not supported.
+"""
+import asyncio
+import logging
+import random
+import time
+
+from pymodbus.client import AsyncModbusTcpClient
+
+from homeassistant.core import callback
+
+from .const import (
+    DOMAIN,
+    DEFAULT_MAX_IN_FLIGHT,
+    DEFAULT_RECONNECT_DELAY,
+    DEFAULT_RECONNECT_DELAY_MAX,
+    DEFAULT_CIRCUIT_FAILURE_THRESHOLD,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class ModbusConnectionError(Exception):
+    """Raised when no connection to the adapter is available."""
+
+
+class CircuitOpenError(ModbusConnectionError):
+    """Raised without a connection attempt while the circuit breaker is open."""
+
+
+class ConnectionManager:
+    """Own the Modbus TCP client, its reconnects and the circuit breaker."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        reconnect_delay: float = DEFAULT_RECONNECT_DELAY,
+        reconnect_delay_max: float = DEFAULT_RECONNECT_DELAY_MAX,
+        failure_threshold: int = DEFAULT_CIRCUIT_FAILURE_THRESHOLD,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        tls: bool = False,
+    ):
+        self.host = host
+        self.port = port
+        self.key = (host, port, tls)
+        # Gemeinsame Obergrenze offener Anfragen aller Nutzer dieser Verbindung
+        self.max_in_flight = max(1, max_in_flight)
+        self.request_slots = asyncio.Semaphore(self.max_in_flight)
+        self.users = set()
+        self.reconnect_delay = reconnect_delay
+        self.reconnect_delay_max = reconnect_delay_max
+        self.failure_threshold = max(1, failure_threshold)
+        self.client: AsyncModbusTcpClient | None = None
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.retry_at = 0.0
+        # Metriken
+        self.connect_count = 0
+        self.reconnect_count = 0
+        self.last_connect_latency = None
+        self.last_error = None
+        self._connect_lock = asyncio.Lock()
+
+    @property
+    def connected(self):
+        """Return True if the client has an open transport."""
+        return self.client is not None and self.client.connected
+
+    @property
+    def metrics(self):
+        """Connection metrics for diagnostics."""
+        return {
+            "state": self.state,
+            "connected": self.connected,
+            "consecutive_failures": self.failures,
+            "connect_count": self.connect_count,
+            "reconnect_count": self.reconnect_count,
+            "last_connect_latency": self.last_connect_latency,
+            "retry_in": max(0.0, self.retry_at - time.monotonic()) if self.state == STATE_OPEN else 0.0,
+            "last_error": self.last_error,
+            "users": len(self.users),
+            "max_in_flight": self.max_in_flight,
+        }
+
+    async def async_get_client(self):
+        """Return a connected client, connecting if needed.
+
+        Raises CircuitOpenError without any network I/O while the circuit
+        breaker is open, ModbusConnectionError if the connect fails.
+        """
+        if self.connected:
+            return self.client
+
+        async with self._connect_lock:
+            # Ein anderer Aufrufer hat inzwischen verbunden
+            if self.connected:
+                return self.client
+            if self.state == STATE_OPEN:
+                if time.monotonic() < self.retry_at:
+                    raise CircuitOpenError(
+                        f"Modbus Verbindung zu {self.host}:{self.port} pausiert "
+                        f"(noch {self.retry_at - time.monotonic():.1f}s): {self.last_error}"
+                    )
+                # Half-open: genau ein Verbindungsversuch entscheidet
+                self.state = STATE_HALF_OPEN
+            return await self._async_connect()
+
+    async def _async_connect(self):
+        """Connect and wait for the real connected state."""
+        if self.client is None:
+            _LOGGER.debug(f"Creating new Modbus TCP client for {self.host}:{self.port}")
+            # Reconnects übernimmt der Manager, nicht pymodbus im Hintergrund
+            self.client = AsyncModbusTcpClient(self.host, port=self.port, reconnect_delay=0)
+        elif self.connect_count:
+            _LOGGER.warning(f"Modbus client disconnected, attempting reconnection to {self.host}:{self.port}")
+
+        started = time.monotonic()
+        try:
+            connected = await self.client.connect()
+        except Exception as err:
+            self.record_failure(err)
+            raise ModbusConnectionError(f"Modbus Verbindung zu {self.host}:{self.port} fehlgeschlagen: {err}") from err
+        if not connected or not self.client.connected:
+            self.record_failure("connect refused or timed out")
+            raise ModbusConnectionError(f"Modbus Verbindung zu {self.host}:{self.port} fehlgeschlagen")
+
+        self.last_connect_latency = time.monotonic() - started
+        if self.connect_count:
+            self.reconnect_count += 1
+        self.connect_count += 1
+        _LOGGER.debug(
+            f"Connected to Modbus TCP server at {self.host}:{self.port} in {self.last_connect_latency * 1000:.0f} ms"
+        )
+        self.record_success()
+        return self.client
+
+    def record_success(self):
+        """Close the circuit after a successful connect or request."""
+        if self.state != STATE_CLOSED:
+            _LOGGER.info(f"Modbus Verbindung zu {self.host}:{self.port} wiederhergestellt")
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.last_error = None
+
+    def record_failure(self, err):
+        """Count a failed connect or request and open the circuit if needed."""
+        self.failures += 1
+        self.last_error = str(err)
+        if self.state != STATE_HALF_OPEN and self.failures < self.failure_threshold:
+            return
+
+        # Exponentielles Backoff mit Jitter, damit mehrere Clients nicht gleichzeitig anklopfen
+        exponent = max(0, self.failures - self.failure_threshold)
+        delay = min(self.reconnect_delay_max, self.reconnect_delay * 2**exponent)
+        delay *= random.uniform(0.5, 1.0)
+        self.retry_at = time.monotonic() + delay
+        message = (
+            f"Modbus Verbindung zu {self.host}:{self.port} fehlgeschlagen ({self.last_error}), "
+            f"nächster Versuch in {delay:.1f}s"
+        )
+        if self.state == STATE_CLOSED:
+            _LOGGER.error(message)
+        else:
+            _LOGGER.debug(message)
+        self.state = STATE_OPEN
+        if self.client is not None:
+            self.client.close()
+
+    def limit_in_flight(self, max_in_flight):
+        """Apply the in-flight limit of another user; the strictest limit of all users wins."""
+        max_in_flight = max(1, max_in_flight)
+        if max_in_flight == self.max_in_flight:
+            return
+        if max_in_flight > self.max_in_flight:
+            _LOGGER.warning(
+                f"Modbus Verbindung zu {self.host}:{self.port} wird geteilt, es bleibt bei max. "
+                f"{self.max_in_flight} gleichzeitigen Anfragen statt {max_in_flight}"
+            )
+            return
+        _LOGGER.warning(
+            f"Modbus Verbindung zu {self.host}:{self.port} wird geteilt, max. gleichzeitige Anfragen "
+            f"von {self.max_in_flight} auf {max_in_flight} gesenkt"
+        )
+        self.max_in_flight = max_in_flight
+        # Laufende Anfragen geben noch den alten Semaphor frei, neue warten auf den neuen
+        self.request_slots = asyncio.Semaphore(max_in_flight)
+
+    def close(self):
+        """Close the client connection."""
+        if self.client is not None:
+            self.client.close()
+            self.client = None
+
+
+@callback
+def acquire_connection(hass, host, port, user, tls=False, max_in_flight=DEFAULT_MAX_IN_FLIGHT):
+    """Return the shared connection manager for an adapter and register a user.
+
+    All users share one in-flight limit, the smallest ``max_in_flight`` of
+    them; a differing limit is logged.
+    """
+    connections = hass.data.setdefault(f"{DOMAIN}_connections", {})
+    key = (host, port, tls)
+    manager = connections.get(key)
+    if manager is None:
+        _LOGGER.debug(f"Creating shared Modbus connection for {host}:{port}")
+        manager = ConnectionManager(host, port, max_in_flight=max_in_flight, tls=tls)
+        connections[key] = manager
+    else:
+        manager.limit_in_flight(max_in_flight)
+    manager.users.add(user)
+    return manager
+
+
+@callback
+def release_connection(hass, manager, user):
+    """Unregister a user and close the connection when it was the last one."""
+    manager.users.discard(user)
+    if manager.users:
+        return
+    connections = hass.data.get(f"{DOMAIN}_connections", {})
+    if connections.get(manager.key) is manager:
+        del connections[manager.key]
+    _LOGGER.debug(f"Closing shared Modbus connection to {manager.host}:{manager.port}")
+    manager.close()
@@ -4,6 +4,108 @@ DOMAIN = "ha_daikin_altherma4_modbus"
 DEFAULT_PORT = 502
 DEFAULT_SCAN_INTERVAL = 15
 
+# Modbus PDU-Grenzen pro Leseanfrage (FC03/FC04 Register, FC01/FC02 Bits)
+MODBUS_MAX_READ_REGISTERS = 125
+MODBUS_MAX_READ_BITS = 2000
+
+# Modbus PDU-Grenzen pro Schreibanfrage (FC16 Register, FC15 Coils)
+MODBUS_MAX_WRITE_REGISTERS = 123
+MODBUS_MAX_WRITE_BITS = 1968
+
+# Ruhezeit (Sekunden) nach dem letzten Schreibwunsch, bevor gesammelt geschrieben
+# wird; pro Adresse nur der letzte Wert, benachbarte Register in einer Anfrage
+DEFAULT_WRITE_DEBOUNCE = 0.3
+# Spätestens so lange (Sekunden) nach dem ersten Schreibwunsch wird geschrieben,
+# auch wenn laufend neue Werte kommen
+WRITE_DEBOUNCE_MAX_DELAY = 2.0
+
+# Verbindungsaufbau: exponentielles Backoff (Sekunden) und Circuit Breaker,
+# der nach so vielen Fehlern in Folge Polls ohne Verbindungsversuch abweist
+DEFAULT_RECONNECT_DELAY = 1
+DEFAULT_RECONNECT_DELAY_MAX = 300
+DEFAULT_CIRCUIT_FAILURE_THRESHOLD = 3
+
+# Maximale Lücke (ungenutzte Adressen), die beim Zusammenfassen von Blöcken
+# mitgelesen wird, statt eine weitere Leseanfrage zu senden
+DEFAULT_MAX_REGISTER_GAP = 50
+DEFAULT_MAX_BIT_GAP = 256
+
+# Maximale Anzahl gleichzeitig offener Leseanfragen im Pipelining-Modus
+DEFAULT_MAX_IN_FLIGHT = 4
+
+# Abfragestufen: jedes Register trägt einen "poll_tier" (Standard: normal).
+# "normal" folgt dem konfigurierten scan_interval, die anderen Stufen haben
+# eigene Intervalle in Sekunden.
+POLL_TIER_FAST = "fast"
+POLL_TIER_NORMAL = "normal"
+POLL_TIER_SLOW = "slow"
+POLL_TIERS = (POLL_TIER_FAST, POLL_TIER_NORMAL, POLL_TIER_SLOW)
+# Die schnelle Stufe liest standardmäßig im bisherigen 10-s-Takt; kürzere
+# Intervalle erhöhen die Last auf Bus und Adapter
+DEFAULT_FAST_SCAN_INTERVAL = 10
+DEFAULT_SLOW_SCAN_INTERVAL = 600
+
+# Intervall (Sekunden), in dem zwischen den Polls nur die Discrete Inputs
+# gelesen werden, damit kurze Verdichter-, Abtau- und WW-Impulse erkannt
+# werden; 0 = aus. Standardmäßig aus, da jede Abfrage eine zusätzliche
+# Anfrage an den Adapter ist
+DEFAULT_EDGE_WATCH_INTERVAL = 0
+
+# Adaptives Abfrageintervall: bei laufendem Verdichter (11), Abtauen (17),
+# WW-Bereitung (19) oder nach einem Schreibzugriff (ADAPTIVE_WRITE_HOLD
+# Sekunden) wird im schnellen Takt gelesen; im Leerlauf ohne Zustands-
+# änderungen verdoppelt sich das Intervall bis DEFAULT_IDLE_SCAN_INTERVAL
+# (0 = festes Intervall)
+ADAPTIVE_ACTIVE_DISCRETE_ADDRESSES = (11, 17, 19)
+ADAPTIVE_WRITE_HOLD = 120
+DEFAULT_IDLE_SCAN_INTERVAL = 60
+
+# Werte eines Blocks, dessen Lesen fehlschlägt, bleiben mit ihrem Alter
+# erhalten und werden erst nach DEFAULT_MAX_VALUE_AGE Sekunden ununterbrochener
+# Fehler als nicht verfügbar gemeldet
+DEFAULT_MAX_VALUE_AGE = 300
+
+# Letzter Register-Snapshot auf Platte für den Warmstart; gespeichert wird
+# höchstens alle SNAPSHOT_SAVE_DELAY Sekunden
+SNAPSHOT_STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 300
+
+# Anzahl der letzten Antwortzeiten pro Block und Function Code, aus denen
+# p50/p95/max der Modbus-Verbindung berechnet werden
+LINK_METRICS_WINDOW = 128
+
+# Modbus-Mitschnitt (Option "record_traffic"): Dateien unter
+# <config>/ha_daikin_altherma4_modbus_traffic, Aufzeichnung endet bei
+# TRAFFIC_LOG_MAX_BYTES
+TRAFFIC_LOG_MAX_BYTES = 50 * 1024 * 1024
+
+# Letzte Meldungen des externen Leistungssensors, aus denen pro Poll der zum
+# Lesezeitpunkt gültige Wert genommen wird
+EXTERNAL_POWER_SAMPLES = 16
+
+# Energiezähler: Wärme- und elektrische Energie pro Betriebsart, gespeichert
+# im Home Assistant Storage (höchstens alle ENERGY_SAVE_DELAY Sekunden und
+# beim Entladen). Liegen zwei Polls mehr als ENERGY_MAX_GAP Sekunden
+# auseinander, wird die Lücke nicht integriert.
+ENERGY_STORAGE_VERSION = 1
+ENERGY_SAVE_DELAY = 60
+ENERGY_MAX_GAP = 900
+ENERGY_KIND_HEAT = "heat"
+ENERGY_KIND_ELECTRIC = "electric"
+ENERGY_MODE_HEATING = "heating"
+ENERGY_MODE_DHW = "dhw"
+ENERGY_MODE_COOLING = "cooling"
+
+# Gleitende Leistungszahl (1 h, 24 h, 7 d) und Saison-Leistungszahl aus den
+# Energiezählern. Gezählt werden nur Heiz- und Warmwasser-Intervalle mit
+# laufendem Verdichter (Discrete Input 11) ohne Abtauung (Discrete Input 17).
+# Eine Saison beginnt am 1. des Monats COP_SEASON_START_MONTH.
+COP_COMPRESSOR_ADDRESS = 11
+COP_DEFROST_ADDRESS = 17
+COP_SEASON_START_MONTH = 9
+# Unter dieser elektrischen Energie (kWh) im Fenster gibt es keinen Wert
+COP_MIN_ELECTRIC_ENERGY = 0.01
+
 INPUT_DEVICE_INFO = {
     "identifiers": {("daikin_altherma_modbus", "input_registers")},
     "translation_key": "daikin_altherma_modbus_input_registers",
@@ -39,6 +141,13 @@ COIL_DEVICE_INFO = {
     "model": "Altherma 4"
 }
 
+LINK_DEVICE_INFO = {
+    "identifiers": {("daikin_altherma_modbus", "modbus_link")},
+    "translation_key": "daikin_altherma_modbus_link",
+    "manufacturer": "Daikin",
+    "model": "Altherma 4"
+}
+
 # Alle Input-Register aus 7.2.2 Daikin Configuration reference guide MMI user interface
 
 INPUT_REGISTERS = [
@@ -51,6 +160,7 @@ INPUT_REGISTERS = [
         "dtype": "int16",
         "icon": "mdi:alert-circle",
         "input_type": "input",
+        "poll_tier": "normal",
         "unique_id": f"{DOMAIN}_input_21",
         "entity_category": EntityCategory.DIAGNOSTIC,
         "enum_map": {0: "Kein Fehler", 1: "Störung", 2: "Warnung"},
@@ -65,6 +175,7 @@ INPUT_REGISTERS = [
         "count": 1,
         "icon": "mdi:alert-circle",
         "input_type": "input",
+        "poll_tier": "normal",
         "unique_id": f"{DOMAIN}_input_22",
         "entity_category": EntityCategory.DIAGNOSTIC,
         "translation_key": "input_22"
@@ -77,6 +188,7 @@ INPUT_REGISTERS = [
         "dtype": "uint16",
         "icon": "mdi:alert-circle",
         "input_type": "input",
+        "poll_tier": "normal",
         "unique_id": f"{DOMAIN}_input_23",
         "entity_category": EntityCategory.DIAGNOSTIC,
         "enum_map": {32766: "No error"},
@@ -92,6 +204,7 @@ INPUT_REGISTERS = [
         "dtype": "uint16",
         "icon": "mdi:pipe-valve",
         "input_type": "input",
+        "poll_tier": "fast",
         "unique_id": f"{DOMAIN}_input_37",
         "entity_category": None,
         "enum_map": {0: "Space heating", 1: "DHW"},
@@ -107,6 +220,7 @@ INPUT_REGISTERS = [
         "dtype": "uint16",
         "icon": "mdi:thermostat",
         "input_type": "input",
+        "poll_tier": "normal",
         "unique_id": f"{DOMAIN}_input_38",
         "entity_category": None,
         "enum_map": {
@@ -126,6 +240,7 @@ INPUT_REGISTERS = [
         "dtype": "int16",
         "icon": "mdi:thermometer",
         "input_type": "input",
+        "poll_tier": "fast",
         "unique_id": f"{DOMAIN}_input_40",
         "entity_category": None,
         "translation_key": "input_40"
@@ -138,6 +253,7 @@ INPUT_REGISTERS = [
         "dtype": "int16",
         "icon": "mdi:thermometer",
         "input_type": "input",
+        "poll_tier": "fast",
         "unique_id": f"{DOMAIN}_input_41",
         "entity_category": None,
         "translation_key": "input_41"
@@ -150,6 +266,7 @@ INPUT_REGISTERS = [
         "dtype": "int16",
         "icon": "mdi:thermometer",
         "input_type": "input",
+        "poll_tier": "fast",
         "unique_id": f"{DOMAIN}_input_42",
         "entity_category": None,
         "translation_key": "input_42"
@@ -162,6 +279,7 @@ INPUT_REGISTERS = [
         "dtype": "int16",
         "icon": "mdi:thermometer",
         "input_type": "input",
+        "poll_tier": "fast",
         "unique_id": f"{DOMAIN}_input_43",
         "entity_category": None,
         "translation_key": "input_43"
@@ -174,6 +292,7 @@ INPUT_REGISTERS = [
         "dtype": "int16",
         "icon": "mdi:thermometer",
         "input_type": "input",
+        "poll_tier": "normal",
         "unique_id": f"{DOMAIN}_input_44",
         "entity_category": None,
         "translation_key": "input_44"
@@ -188,6 +307,7 @@ INPUT_REGISTERS = [
         "dtype": "uint16",
         "icon": "mdi:water-pump",
         "input_type": "input",
+        "poll_tier": "fast",
         "unique_id": f"{DOMAIN}_input_49",
         "entity_category": None,
         "translation_key": "input_49"
@@ -202,6 +322,7 @@ INPUT_REGISTERS = [
         "dtype": "uint16",
         "icon": "mdi:lightning-bolt",
         "input_type": "input",
+        "poll_tier": "fast",
         "unique_id": f"{DOMAIN}_input_51",
         "entity_category": None,
         "translation_key": "input_51"
@@ -216,6 +337,7 @@ INPUT_REGISTERS = [
         "dtype": "uint16",
         "icon": "mdi:information",
         "input_type": "input",
+        "poll_tier": "normal",
         "unique_id": f"{DOMAIN}_input_52",
         "entity_category": None,
         "translation_key": "input_52",
@@ -229,6 +351,7 @@ INPUT_REGISTERS = [
         "dtype": "uint16",
         "icon": "mdi:information",
         "input_type": "input",
+        "poll_tier": "normal",
         "unique_id": f"{DOMAIN}_input_53",
         "entity_category": None,
         "translation_key": "input_53",
@@ -244,6 +367,7 @@ INPUT_REGISTERS = [
         "dtype": "int16",
         "icon": "mdi:thermometer",
         "input_type": "input",
+        "poll_tier": "slow",
         "unique_id": f"{DOMAIN}_input_54",
         "entity_category": None,
         "translation_key": "input_54"
@@ -256,6 +380,7 @@ INPUT_REGISTERS = [
         "dtype": "int16",
         "icon": "mdi:thermometer",
         "input_type": "input",
+        "poll_tier": "slow",
         "unique_id": f"{DOMAIN}_input_55",
         "entity_category": None,
         "translation_key": "input_55"
@@ -268,6 +393,7 @@ INPUT_REGISTERS = [
         "dtype": "int16",
         "icon": "mdi:thermometer",
         "input_type": "input",
+        "poll_tier": "slow",
         "unique_id": f"{DOMAIN}_input_56",
         "entity_category": None,
         "translation_key": "input_56"
@@ -280,6 +406,7 @@ INPUT_REGISTERS = [
         "dtype": "int16",
         "icon": "mdi:thermometer",
         "input_type": "input",
+        "poll_tier": "slow",
         "unique_id": f"{DOMAIN}_input_57",
         "entity_category": None,
         "translation_key": "input_57"
@@ -294,6 +421,7 @@ INPUT_REGISTERS = [
         "dtype": "int16",
         "icon": "mdi:thermometer",
         "input_type": "input",
+        "poll_tier": "slow",
         "unique_id": f"{DOMAIN}_input_58",
         "entity_category": None,
         "translation_key": "input_58"
@@ -306,6 +434,7 @@ INPUT_REGISTERS = [
         "dtype": "int16",
         "icon": "mdi:thermometer",
         "input_type": "input",
+        "poll_tier": "slow",
         "unique_id": f"{DOMAIN}_input_59",
         "entity_category": None,
         "translation_key": "input_59"
@@ -318,6 +447,7 @@ INPUT_REGISTERS = [
         "dtype": "int16",
         "icon": "mdi:thermometer",
         "input_type": "input",
+        "poll_tier": "slow",
         "unique_id": f"{DOMAIN}_input_60",
         "entity_category": None,
         "translation_key": "input_60"
@@ -330,6 +460,7 @@ INPUT_REGISTERS = [
         "dtype": "int16",
         "icon": "mdi:thermometer",
         "input_type": "input",
+        "poll_tier": "slow",
         "unique_id": f"{DOMAIN}_input_61",
         "entity_category": None,
         "translation_key": "input_61"
@@ -344,6 +475,7 @@ INPUT_REGISTERS = [
         "dtype": "uint16",
         "icon": "mdi:water-pump",
         "input_type": "input",
+        "poll_tier": "normal",
         "unique_id": f"{DOMAIN}_input_63",
         "entity_category": None,
         "enum_map": {0: "Unsuccessful", 1: "Successful", 2: "Maintain", 3: "Heat Up"},
@@ -357,6 +489,7 @@ INPUT_REGISTERS = [
         "dtype": "uint16",
         "icon": "mdi:beach",
         "input_type": "input",
+        "poll_tier": "normal",
         "unique_id": f"{DOMAIN}_input_64",
         "entity_category": None,
         "enum_map": {0: "OFF", 1: "ON"},
@@ -370,6 +503,7 @@ INPUT_REGISTERS = [
         "dtype": "uint16",
         "icon": "mdi:lightning-bolt",
         "input_type": "input",
+        "poll_tier": "normal",
         "unique_id": f"{DOMAIN}_input_65",
         "entity_category": None,
         "enum_map": {0: "Free", 1: "Forced Off", 2: "Forced On", 3: "Recommended On", 4: "Reduced"},
@@ -384,6 +518,7 @@ INPUT_REGISTERS = [
         "dtype": "uint16",
         "icon": "mdi:valve",
         "input_type": "input",
+        "poll_tier": "normal",
         "unique_id": f"{DOMAIN}_input_66",
         "entity_category": None,
         "translation_key": "input_66"
@@ -396,6 +531,7 @@ INPUT_REGISTERS = [
         "dtype": "uint16",
         "icon": "mdi:valve",
         "input_type": "input",
+        "poll_tier": "normal",
         "unique_id": f"{DOMAIN}_input_67",
         "entity_category": None,
         "translation_key": "input_67"
@@ -408,6 +544,7 @@ INPUT_REGISTERS = [
         "dtype": "uint16",
         "icon": "mdi:water-pump",
         "input_type": "input",
+        "poll_tier": "normal",
         "unique_id": f"{DOMAIN}_input_68",
         "entity_category": None,
         "translation_key": "input_68"
@@ -420,6 +557,7 @@ INPUT_REGISTERS = [
         "dtype": "uint16",
         "icon": "mdi:fan",
         "input_type": "input",
+        "poll_tier": "normal",
         "unique_id": f"{DOMAIN}_input_69",
         "entity_category": None,
         "translation_key": "input_69"
@@ -432,6 +570,7 @@ INPUT_REGISTERS = [
         "dtype": "uint16",
         "icon": "mdi:fan",
         "input_type": "input",
+        "poll_tier": "normal",
         "unique_id": f"{DOMAIN}_input_70",
         "entity_category": None,
         "translation_key": "input_70"
@@ -444,6 +583,7 @@ INPUT_REGISTERS = [
         "dtype": "uint16",
         "icon": "mdi:valve",
         "input_type": "input",
+        "poll_tier": "normal",
         "unique_id": f"{DOMAIN}_input_71",
         "entity_category": None,
         "translation_key": "input_71"
@@ -456,6 +596,7 @@ INPUT_REGISTERS = [
         "dtype": "int16",
         "icon": "mdi:thermometer",
         "input_type": "input",
+        "poll_tier": "normal",
         "unique_id": f"{DOMAIN}_input_72",
         "entity_category": None,
         "translation_key": "input_72"
@@ -468,6 +609,7 @@ INPUT_REGISTERS = [
         "dtype": "int16",
         "icon": "mdi:thermometer",
         "input_type": "input",
+        "poll_tier": "normal",
         "unique_id": f"{DOMAIN}_input_73",
         "entity_category": None,
         "translation_key": "input_73"
@@ -480,6 +622,7 @@ INPUT_REGISTERS = [
         "dtype": "int16",
         "icon": "mdi:thermometer",
         "input_type": "input",
+        "poll_tier": "normal",
         "unique_id": f"{DOMAIN}_input_74",
         "entity_category": None,
         "translation_key": "input_74"
@@ -492,6 +635,7 @@ INPUT_REGISTERS = [
         "dtype": "int16",
         "icon": "mdi:thermometer",
         "input_type": "input",
+        "poll_tier": "normal",
         "unique_id": f"{DOMAIN}_input_75",
         "entity_category": None,
         "translation_key": "input_75"
@@ -504,6 +648,7 @@ INPUT_REGISTERS = [
         "dtype": "int16",
         "icon": "mdi:thermometer",
         "input_type": "input",
+        "poll_tier": "normal",
         "unique_id": f"{DOMAIN}_input_76",
         "entity_category": None,
         "translation_key": "input_76"
@@ -516,6 +661,7 @@ INPUT_REGISTERS = [
         "dtype": "int16",
         "icon": "mdi:thermometer",
         "input_type": "input",
+        "poll_tier": "normal",
         "unique_id": f"{DOMAIN}_input_77",
         "entity_category": None,
         "translation_key": "input_77"
@@ -528,6 +674,7 @@ INPUT_REGISTERS = [
         "dtype": "int16",
         "icon": "mdi:gauge",
         "input_type": "input",
+        "poll_tier": "normal",
         "unique_id": f"{DOMAIN}_input_79",
         "entity_category": None,
         "translation_key": "input_79"
@@ -540,6 +687,7 @@ INPUT_REGISTERS = [
         "dtype": "uint16",
         "icon": "mdi:cog",
         "input_type": "input",
+        "poll_tier": "normal",
         "unique_id": f"{DOMAIN}_input_83",
         "entity_category": None,
         "translation_key": "input_83",
@@ -558,6 +706,7 @@ HOLDING_REGISTERS = [
         "dtype": "int16",
         "icon": "mdi:thermometer",
         "input_type": "holding",
+        "poll_tier": "slow",
         "unique_id": f"{DOMAIN}_holding_1",
         "min_value": 0,
         "max_value": 100,
@@ -572,6 +721,7 @@ HOLDING_REGISTERS = [
         "dtype": "int16",
         "icon": "mdi:thermometer",
         "input_type": "holding",
+        "poll_tier": "slow",
         "unique_id": f"{DOMAIN}_holding_2",
         "min_value": 0,
         "max_value": 100,
@@ -586,6 +736,7 @@ HOLDING_REGISTERS = [
         "dtype": "int16",
         "icon": "mdi:thermometer",
         "input_type": "holding",
+        "poll_tier": "slow",
         "unique_id": f"{DOMAIN}_holding_6",
         "min_value": 12,
         "max_value": 30,
@@ -600,6 +751,7 @@ HOLDING_REGISTERS = [
         "dtype": "int16",
         "icon": "mdi:thermometer",
         "input_type": "holding",
+        "poll_tier": "slow",
         "unique_id": f"{DOMAIN}_holding_7",
         "min_value": 12,
         "max_value": 35,
@@ -614,6 +766,7 @@ HOLDING_REGISTERS = [
         "dtype": "int16",
         "icon": "mdi:thermometer",
         "input_type": "holding",
+        "poll_tier": "slow",
         "unique_id": f"{DOMAIN}_holding_9",
         "min_value": 30,
         "max_value": 85,
@@ -631,6 +784,7 @@ HOLDING_REGISTERS = [
         "dtype": "uint16",
         "icon": "mdi:cog",
         "input_type": "holding",
+        "poll_tier": "slow",
         "unique_id": f"{DOMAIN}_holding_68",
         "enum_map": {
             0: "Constant",
@@ -649,6 +803,7 @@ HOLDING_REGISTERS = [
         "dtype": "uint16",
         "icon": "mdi:cog",
         "input_type": "holding",
+        "poll_tier": "slow",
         "unique_id": f"{DOMAIN}_holding_69",
         "enum_map": {
             0: "Constant",
@@ -667,6 +822,7 @@ HOLDING_REGISTERS = [
         "dtype": "uint16",
         "icon": "mdi:thermostat",
         "input_type": "holding",
+        "poll_tier": "slow",
         "unique_id": f"{DOMAIN}_holding_74",
         "enum_map": {
             0: "None",
@@ -686,6 +842,7 @@ HOLDING_REGISTERS = [
         "dtype": "uint16",
         "icon": "mdi:thermostat",
         "input_type": "holding",
+        "poll_tier": "slow",
         "unique_id": f"{DOMAIN}_holding_75",
         "enum_map": {
             0: "None",
@@ -721,6 +878,7 @@ HOLDING_REGISTERS = [
         "dtype": "int16",
         "icon": "mdi:thermometer",
         "input_type": "holding",
+        "poll_tier": "slow",
         "unique_id": f"{DOMAIN}_holding_10",
         "min_value": 30,
         "max_value": 85,
@@ -735,6 +893,7 @@ HOLDING_REGISTERS = [
         "dtype": "int16",
         "icon": "mdi:thermometer",
         "input_type": "holding",
+        "poll_tier": "slow",
         "unique_id": f"{DOMAIN}_holding_13",
         "min_value": 30,
         "max_value": 85,
@@ -749,6 +908,7 @@ HOLDING_REGISTERS = [
         "dtype": "int16",
         "icon": "mdi:thermometer",
         "input_type": "holding",
+        "poll_tier": "slow",
         "unique_id": f"{DOMAIN}_holding_14",
         "min_value": 30,
         "max_value": 85,
@@ -763,6 +923,7 @@ HOLDING_REGISTERS = [
         "dtype": "int16",
         "icon": "mdi:thermometer",
         "input_type": "holding",
+        "poll_tier": "slow",
         "unique_id": f"{DOMAIN}_holding_15",
         "min_value": 30,
         "max_value": 85,
@@ -777,6 +938,7 @@ HOLDING_REGISTERS = [
         "dtype": "int16",
         "icon": "mdi:thermometer",
         "input_type": "holding",
+        "poll_tier": "slow",
         "unique_id": f"{DOMAIN}_holding_16",
         "min_value": 30,
         "max_value": 85,
@@ -791,6 +953,7 @@ HOLDING_REGISTERS = [
         "dtype": "uint16",
         "icon": "mdi:cog",
         "input_type": "holding",
+        "poll_tier": "slow",
         "unique_id": f"{DOMAIN}_holding_56",
         "min_value": 0,
         "max_value": 3,
@@ -805,6 +968,7 @@ HOLDING_REGISTERS = [
         "dtype": "int16",
         "icon": "mdi:thermometer",
         "input_type": "holding",
+        "poll_tier": "slow",
         "unique_id": f"{DOMAIN}_holding_54",
         "min_value": -5,
         "max_value": 5,
@@ -819,6 +983,7 @@ HOLDING_REGISTERS = [
         "dtype": "int16",
         "icon": "mdi:thermometer",
         "input_type": "holding",
+        "poll_tier": "slow",
         "unique_id": f"{DOMAIN}_holding_55",
         "min_value": -10,
         "max_value": 10,
@@ -833,6 +998,7 @@ HOLDING_REGISTERS = [
         "dtype": "uint16",
         "icon": "mdi:lightning-bolt",
         "input_type": "holding",
+        "poll_tier": "slow",
         "unique_id": f"{DOMAIN}_holding_58",
         "min_value": 0,
         "max_value": 20,
@@ -847,6 +1013,7 @@ HOLDING_REGISTERS = [
         "dtype": "int16",
         "icon": "mdi:thermometer",
         "input_type": "holding",
+        "poll_tier": "slow",
         "unique_id": f"{DOMAIN}_holding_63",
         "min_value": 3,
         "max_value": 85,
@@ -861,6 +1028,7 @@ HOLDING_REGISTERS = [
         "dtype": "int16",
         "icon": "mdi:thermometer",
         "input_type": "holding",
+        "poll_tier": "slow",
         "unique_id": f"{DOMAIN}_holding_64",
         "min_value": 3,
         "max_value": 85,
@@ -875,6 +1043,7 @@ HOLDING_REGISTERS = [
         "dtype": "int16",
         "icon": "mdi:thermometer",
         "input_type": "holding",
+        "poll_tier": "slow",
         "unique_id": f"{DOMAIN}_holding_66",
         "min_value": -10,
         "max_value": 10,
@@ -889,6 +1058,7 @@ HOLDING_REGISTERS = [
         "dtype": "int16",
         "icon": "mdi:thermometer",
         "input_type": "holding",
+        "poll_tier": "slow",
         "unique_id": f"{DOMAIN}_holding_67",
         "min_value": -10,
         "max_value": 10,
@@ -903,6 +1073,7 @@ HOLDING_REGISTERS = [
         "dtype": "int16",
         "icon": "mdi:thermometer",
         "input_type": "holding",
+        "poll_tier": "slow",
         "unique_id": f"{DOMAIN}_holding_76",
         "min_value": 12,
         "max_value": 30,
@@ -917,6 +1088,7 @@ HOLDING_REGISTERS = [
         "dtype": "int16",
         "icon": "mdi:thermometer",
         "input_type": "holding",
+        "poll_tier": "slow",
         "unique_id": f"{DOMAIN}_holding_77",
         "min_value": 12,
         "max_value": 35,
@@ -931,6 +1103,7 @@ HOLDING_REGISTERS = [
         "dtype": "int16",
         "icon": "mdi:thermometer",
         "input_type": "holding",
+        "poll_tier": "slow",
         "unique_id": f"{DOMAIN}_holding_78",
         "min_value": 12,
         "max_value": 30,
@@ -945,6 +1118,7 @@ HOLDING_REGISTERS = [
         "dtype": "int16",
         "icon": "mdi:thermometer",
         "input_type": "holding",
+        "poll_tier": "slow",
         "unique_id": f"{DOMAIN}_holding_79",
         "min_value": 12,
         "max_value": 35,
@@ -967,6 +1141,7 @@ SELECT_REGISTERS = [
         "dtype": "uint16",
         "icon": "mdi:cog",
         "input_type": "holding",
+        "poll_tier": "slow",
         "unique_id": f"{DOMAIN}_holding_2",
         "translation_key": "holding_2",
         "enum_map": {
@@ -983,6 +1158,7 @@ SELECT_REGISTERS = [
         "dtype": "uint16",
         "icon": "mdi:thermostat",
         "input_type": "holding",
+        "poll_tier": "slow",
         "unique_id": f"{DOMAIN}_holding_3",
         "translation_key": "holding_3",
         "enum_map": {
@@ -998,6 +1174,7 @@ SELECT_REGISTERS = [
         "dtype": "uint16",
         "icon": "mdi:cog",
         "input_type": "holding",
+        "poll_tier": "slow",
         "unique_id": f"{DOMAIN}_holding_9",
         "translation_key": "holding_9",
         "enum_map": {
@@ -1014,6 +1191,7 @@ SELECT_REGISTERS = [
         "dtype": "uint16",
         "icon": "mdi:power",
         "input_type": "holding",
+        "poll_tier": "slow",
         "unique_id": f"{DOMAIN}_holding_13",
         "translation_key": "holding_13",
         "enum_map": {
@@ -1029,6 +1207,7 @@ SELECT_REGISTERS = [
         "dtype": "int16",
         "icon": "mdi:power",
         "input_type": "holding",
+        "poll_tier": "slow",
         "unique_id": f"{DOMAIN}_holding_15",
         "translation_key": "holding_15",
         "enum_map": {
@@ -1044,6 +1223,7 @@ SELECT_REGISTERS = [
         "dtype": "uint16",
         "icon": "mdi:thermostat",
         "input_type": "holding",
+        "poll_tier": "slow",
         "unique_id": f"{DOMAIN}_holding_67",
         "translation_key": "holding_67",
         "enum_map": {
@@ -1071,35 +1251,69 @@ SELECT_REGISTERS = [
 ]
 
 # Berechnete Sensoren
+# Typ "formula": "inputs" sind Register-Keys oder Keys anderer berechneter Werte, "formula" erhält
+# deren native Werte in dieser Reihenfolge. Berechnet wird einmal pro Poll und nur bei geänderten
+# Eingängen; Einträge mit "entity": False sind Zwischenwerte ohne eigene Entität.
+
+# Zustand des externen Leistungssensors (W) als Daten-Key, falls konfiguriert
+EXTERNAL_ELECTRIC_POWER_KEY = f"{DOMAIN}_external_electric_power"
 
 CALCULATED_SENSORS = [
+    {
+        "name": "Delta-T",
+        "unique_id": f"{DOMAIN}_delta_t",
+        "unit": "°C",
+        "device_class": "temperature",
+        "state_class": "measurement",
+        "icon": "mdi:thermometer-lines",
+        "entity_category": None,
+        "type": "formula",
+        # Vorlauf (PHE) - Rücklauf
+        "inputs": [f"{DOMAIN}_input_40", f"{DOMAIN}_input_42"],
+        "formula": lambda flow_temp, return_temp: flow_temp - return_temp,
+        "precision": 2,
+        "translation_key": "delta_t"
+    },
     {
         "name": "Heat Pump Power Calculated",
         "unique_id": f"{DOMAIN}_heat_pump_power_calc",
         "unit": "W",
         "device_class": "power",
+        "icon": "mdi:fire",
         "entity_category": None,
-        "type": "heat_power",
+        "type": "formula",
+        # Durchfluss (L/min) * ΔT * 70 ≈ Wärmeleistung in W
+        "inputs": [f"{DOMAIN}_input_49", f"{DOMAIN}_delta_t"],
+        "formula": lambda flow, delta_t: flow * delta_t * 70,
+        "precision": 2,
         "translation_key": "pump_power_calc"
     },
+    {
+        "name": "Electric Power",
+        "unique_id": f"{DOMAIN}_electric_power",
+        "type": "formula",
+        "entity": False,
+        # Externer Leistungssensor, sonst Leistungsaufnahme aus Input-Register 51
+        "inputs": [EXTERNAL_ELECTRIC_POWER_KEY, f"{DOMAIN}_input_51"],
+        "formula": lambda external, modbus: modbus if external is None else external,
+        "accepts_none": True,
+    },
     {
         "name": "Coefficient of Performance",
         "unique_id": f"{DOMAIN}_cop",
         "unit": "CoP",
         "device_class": None,
+        "state_class": "measurement",
+        "icon": "mdi:gauge",
         "entity_category": None,
-        "type": "cop",
+        "type": "formula",
+        "inputs": [f"{DOMAIN}_heat_pump_power_calc", f"{DOMAIN}_electric_power"],
+        "formula": lambda heat_power, electric_power: (
+            heat_power / electric_power if heat_power > 0 and electric_power > 0 else None
+        ),
+        "precision": 2,
         "translation_key": "cop"
     },
-    {
-        "name": "Delta-T",
-        "unique_id": f"{DOMAIN}_delta_t",
-        "unit": "°C",
-        "device_class": "temperature",
-        "entity_category": None,
-        "type": "delta_t",
-        "translation_key": "delta_t"
-    },
     {
         "name": "Last Compressor Run",
         "unique_id": f"{DOMAIN}_last_compressor_run",
@@ -1149,6 +1363,7 @@ DISCRETE_INPUT_SENSORS = [
         "address": 1,
         "device_class": "running",
         "input_type": "discrete_input",
+        "poll_tier": "fast",
         "unique_id": f"{DOMAIN}_discrete_0",
         "entity_category": EntityCategory.DIAGNOSTIC,
         "translation_key": "discrete_0"
@@ -1158,6 +1373,7 @@ DISCRETE_INPUT_SENSORS = [
         "address": 2,
         "device_class": "running",
         "input_type": "discrete_input",
+        "poll_tier": "fast",
         "unique_id": f"{DOMAIN}_discrete_1",
         "entity_category": EntityCategory.DIAGNOSTIC,
         "translation_key": "discrete_1"
@@ -1167,6 +1383,7 @@ DISCRETE_INPUT_SENSORS = [
         "address": 3,
         "device_class": "running",
         "input_type": "discrete_input",
+        "poll_tier": "fast",
         "unique_id": f"{DOMAIN}_discrete_2",
         "entity_category": EntityCategory.DIAGNOSTIC,
         "translation_key": "discrete_2"
@@ -1176,6 +1393,7 @@ DISCRETE_INPUT_SENSORS = [
         "address": 4,
         "device_class": "running",
         "input_type": "discrete_input",
+        "poll_tier": "fast",
         "unique_id": f"{DOMAIN}_discrete_3",
         "entity_category": EntityCategory.DIAGNOSTIC,
         "translation_key": "discrete_3"
@@ -1185,6 +1403,7 @@ DISCRETE_INPUT_SENSORS = [
         "address": 5,
         "device_class": "running",
         "input_type": "discrete_input",
+        "poll_tier": "fast",
         "unique_id": f"{DOMAIN}_discrete_4",
         "entity_category": EntityCategory.DIAGNOSTIC,
         "translation_key": "discrete_4"
@@ -1194,6 +1413,7 @@ DISCRETE_INPUT_SENSORS = [
         "address": 6,
         "device_class": "running",
         "input_type": "discrete_input",
+        "poll_tier": "fast",
         "unique_id": f"{DOMAIN}_discrete_5",
         "entity_category": EntityCategory.DIAGNOSTIC,
         "translation_key": "discrete_5"
@@ -1203,6 +1423,7 @@ DISCRETE_INPUT_SENSORS = [
         "address": 7,
         "device_class": "running",
         "input_type": "discrete_input",
+        "poll_tier": "fast",
         "unique_id": f"{DOMAIN}_discrete_6",
         "entity_category": EntityCategory.DIAGNOSTIC,
         "translation_key": "discrete_6"
@@ -1212,6 +1433,7 @@ DISCRETE_INPUT_SENSORS = [
         "address": 8,
         "device_class": "running",
         "input_type": "discrete_input",
+        "poll_tier": "fast",
         "unique_id": f"{DOMAIN}_discrete_7",
         "entity_category": EntityCategory.DIAGNOSTIC,
         "translation_key": "discrete_7"
@@ -1221,6 +1443,7 @@ DISCRETE_INPUT_SENSORS = [
         "address": 9,
         "device_class": "running",
         "input_type": "discrete_input",
+        "poll_tier": "fast",
         "unique_id": f"{DOMAIN}_discrete_8",
         "entity_category": EntityCategory.DIAGNOSTIC,
         "translation_key": "discrete_8"
@@ -1230,6 +1453,7 @@ DISCRETE_INPUT_SENSORS = [
         "address": 10,
         "device_class": "running",
         "input_type": "discrete_input",
+        "poll_tier": "fast",
         "unique_id": f"{DOMAIN}_discrete_9",
         "entity_category": EntityCategory.DIAGNOSTIC,
         "translation_key": "discrete_9"
@@ -1239,6 +1463,7 @@ DISCRETE_INPUT_SENSORS = [
         "address": 11,
         "device_class": "running",
         "input_type": "discrete_input",
+        "poll_tier": "fast",
         "unique_id": f"{DOMAIN}_discrete_10",
         "entity_category": EntityCategory.DIAGNOSTIC,
         "translation_key": "discrete_10"
@@ -1248,6 +1473,7 @@ DISCRETE_INPUT_SENSORS = [
         "address": 12,
         "device_class": None,
         "input_type": "discrete_input",
+        "poll_tier": "fast",
         "unique_id": f"{DOMAIN}_discrete_11",
         "entity_category": EntityCategory.DIAGNOSTIC,
         "translation_key": "discrete_11"
@@ -1257,6 +1483,7 @@ DISCRETE_INPUT_SENSORS = [
         "address": 13,
         "device_class": None,
         "input_type": "discrete_input",
+        "poll_tier": "fast",
         "unique_id": f"{DOMAIN}_discrete_12",
         "entity_category": EntityCategory.DIAGNOSTIC,
         "translation_key": "discrete_12"
@@ -1266,6 +1493,7 @@ DISCRETE_INPUT_SENSORS = [
         "address": 14,
         "device_class": None,
         "input_type": "discrete_input",
+        "poll_tier": "fast",
         "unique_id": f"{DOMAIN}_discrete_13",
         "entity_category": EntityCategory.DIAGNOSTIC,
         "translation_key": "discrete_13"
@@ -1275,6 +1503,7 @@ DISCRETE_INPUT_SENSORS = [
         "address": 15,
         "device_class": None,
         "input_type": "discrete_input",
+        "poll_tier": "fast",
         "unique_id": f"{DOMAIN}_discrete_14",
         "entity_category": EntityCategory.DIAGNOSTIC,
         "translation_key": "discrete_14"
@@ -1284,6 +1513,7 @@ DISCRETE_INPUT_SENSORS = [
         "address": 16,
         "device_class": "running",
         "input_type": "discrete_input",
+        "poll_tier": "fast",
         "unique_id": f"{DOMAIN}_discrete_15",
         "entity_category": EntityCategory.DIAGNOSTIC,
         "translation_key": "discrete_15"
@@ -1293,6 +1523,7 @@ DISCRETE_INPUT_SENSORS = [
         "address": 17,
         "device_class": "running",
         "input_type": "discrete_input",
+        "poll_tier": "fast",
         "unique_id": f"{DOMAIN}_discrete_16",
         "entity_category": EntityCategory.DIAGNOSTIC,
         "translation_key": "discrete_16"
@@ -1302,6 +1533,7 @@ DISCRETE_INPUT_SENSORS = [
         "address": 18,
         "device_class": "running",
         "input_type": "discrete_input",
+        "poll_tier": "fast",
         "unique_id": f"{DOMAIN}_discrete_17",
         "entity_category": EntityCategory.DIAGNOSTIC,
         "translation_key": "discrete_17"
@@ -1311,6 +1543,7 @@ DISCRETE_INPUT_SENSORS = [
         "address": 19,
         "device_class": "running",
         "input_type": "discrete_input",
+        "poll_tier": "fast",
         "unique_id": f"{DOMAIN}_discrete_18",
         "entity_category": EntityCategory.DIAGNOSTIC,
         "translation_key": "discrete_18"
@@ -1320,6 +1553,7 @@ DISCRETE_INPUT_SENSORS = [
         "address": 20,
         "device_class": "running",
         "input_type": "discrete_input",
+        "poll_tier": "fast",
         "unique_id": f"{DOMAIN}_discrete_19",
         "entity_category": EntityCategory.DIAGNOSTIC,
         "translation_key": "discrete_19"
@@ -1329,6 +1563,7 @@ DISCRETE_INPUT_SENSORS = [
         "address": 21,
         "device_class": "running",
         "input_type": "discrete_input",
+        "poll_tier": "fast",
         "unique_id": f"{DOMAIN}_discrete_20",
         "entity_category": EntityCategory.DIAGNOSTIC,
         "translation_key": "discrete_20"
@@ -1338,6 +1573,7 @@ DISCRETE_INPUT_SENSORS = [
         "address": 22,
         "device_class": None,
         "input_type": "discrete_input",
+        "poll_tier": "fast",
         "unique_id": f"{DOMAIN}_discrete_21",
         "entity_category": EntityCategory.DIAGNOSTIC,
         "translation_key": "discrete_21"
@@ -1347,6 +1583,7 @@ DISCRETE_INPUT_SENSORS = [
         "address": 23,
         "device_class": None,
         "input_type": "discrete_input",
+        "poll_tier": "fast",
         "unique_id": f"{DOMAIN}_discrete_22",
         "entity_category": EntityCategory.DIAGNOSTIC,
         "translation_key": "discrete_22"
@@ -1356,6 +1593,7 @@ DISCRETE_INPUT_SENSORS = [
         "address": 24,
         "device_class": "problem",
         "input_type": "discrete_input",
+        "poll_tier": "fast",
         "unique_id": f"{DOMAIN}_discrete_23",
         "entity_category": EntityCategory.DIAGNOSTIC,
         "translation_key": "discrete_23"
@@ -1365,6 +1603,7 @@ DISCRETE_INPUT_SENSORS = [
         "address": 25,
         "device_class": "running",
         "input_type": "discrete_input",
+        "poll_tier": "fast",
         "unique_id": f"{DOMAIN}_discrete_24",
         "entity_category": EntityCategory.DIAGNOSTIC,
         "translation_key": "discrete_24"
@@ -1374,6 +1613,7 @@ DISCRETE_INPUT_SENSORS = [
         "address": 26,
         "device_class": None,
         "input_type": "discrete_input",
+        "poll_tier": "fast",
         "unique_id": f"{DOMAIN}_discrete_25",
         "entity_category": EntityCategory.DIAGNOSTIC,
         "translation_key": "discrete_25"
@@ -1388,6 +1628,7 @@ COIL_SENSORS = [
         "address": 1,
         "device_class": "switch",
         "input_type": "coil",
+        "poll_tier": "normal",
         "unique_id": f"{DOMAIN}_coil_1",
         "entity_category": None,
         "translation_key": "coil_1"
@@ -1397,6 +1638,7 @@ COIL_SENSORS = [
         "address": 2,
         "device_class": "switch",
         "input_type": "coil",
+        "poll_tier": "normal",
         "unique_id": f"{DOMAIN}_coil_2",
         "entity_category": None,
         "translation_key": "coil_2"
@@ -1406,6 +1648,7 @@ COIL_SENSORS = [
         "address": 3,
         "device_class": "switch",
         "input_type": "coil",
+        "poll_tier": "normal",
         "unique_id": f"{DOMAIN}_coil_3",
         "entity_category": None,
         "translation_key": "coil_3"
@@ -1420,6 +1663,7 @@ BINARY_SENSORS = [
         "address": 29,
         "device_class": "running",
         "input_type": "input",
+        "poll_tier": "fast",
         "unique_id": f"{DOMAIN}_input_29",
         "entity_category": EntityCategory.DIAGNOSTIC,
         "translation_key": "input_29"
@@ -1429,6 +1673,7 @@ BINARY_SENSORS = [
         "address": 30,
         "device_class": "running",
         "input_type": "input",
+        "poll_tier": "fast",
         "unique_id": f"{DOMAIN}_input_30",
         "entity_category": EntityCategory.DIAGNOSTIC,
         "translation_key": "input_30"
@@ -1438,6 +1683,7 @@ BINARY_SENSORS = [
         "address": 31,
         "device_class": "running",
         "input_type": "input",
+        "poll_tier": "fast",
         "unique_id": f"{DOMAIN}_input_31",
         "entity_category": EntityCategory.DIAGNOSTIC,
         "translation_key": "input_31"
@@ -1447,6 +1693,7 @@ BINARY_SENSORS = [
         "address": 32,
         "device_class": "running",
         "input_type": "input",
+        "poll_tier": "normal",
         "unique_id": f"{DOMAIN}_input_32",
         "entity_category": EntityCategory.DIAGNOSTIC,
         "translation_key": "input_32"
@@ -1456,6 +1703,7 @@ BINARY_SENSORS = [
         "address": 34,
         "device_class": "running",
         "input_type": "input",
+        "poll_tier": "fast",
         "unique_id": f"{DOMAIN}_input_34",
         "entity_category": EntityCategory.DIAGNOSTIC,
         "translation_key": "input_34"
@@ -1465,6 +1713,7 @@ BINARY_SENSORS = [
         "address": 35,
         "device_class": "running",
         "input_type": "input",
+        "poll_tier": "fast",
         "unique_id": f"{DOMAIN}_input_35",
         "entity_category": EntityCategory.DIAGNOSTIC,
         "translation_key": "input_35"
@@ -1474,8 +1723,175 @@ BINARY_SENSORS = [
         "address": 63,
         "device_class": None,
         "input_type": "input",
+        "poll_tier": "normal",
         "unique_id": f"{DOMAIN}_input_63",
         "entity_category": EntityCategory.DIAGNOSTIC,
         "translation_key": "input_63"
     }
 ]
+
+# Diagnose-Sensoren der Modbus-Verbindung (Gerät "Modbus link")
+LINK_SENSORS = [
+    {
+        "name": "Input register latency",
+        "unique_id": f"{DOMAIN}_link_input_latency",
+        "type": "latency",
+        "function": "input",
+        "translation_key": "link_input_latency"
+    },
+    {
+        "name": "Holding register latency",
+        "unique_id": f"{DOMAIN}_link_holding_latency",
+        "type": "latency",
+        "function": "holding",
+        "translation_key": "link_holding_latency"
+    },
+    {
+        "name": "Discrete input latency",
+        "unique_id": f"{DOMAIN}_link_discrete_input_latency",
+        "type": "latency",
+        "function": "discrete_input",
+        "translation_key": "link_discrete_input_latency"
+    },
+    {
+        "name": "Coil latency",
+        "unique_id": f"{DOMAIN}_link_coil_latency",
+        "type": "latency",
+        "function": "coil",
+        "translation_key": "link_coil_latency"
+    },
+    {
+        "name": "Poll duration",
+        "unique_id": f"{DOMAIN}_link_poll_duration",
+        "type": "poll_duration",
+        "translation_key": "link_poll_duration"
+    },
+    {
+        "name": "Requests",
+        "unique_id": f"{DOMAIN}_link_requests",
+        "type": "counter",
+        "metric": "requests",
+        "icon": "mdi:swap-horizontal",
+        "translation_key": "link_requests"
+    },
+    {
+        "name": "Errors",
+        "unique_id": f"{DOMAIN}_link_errors",
+        "type": "counter",
+        "metric": "errors",
+        "icon": "mdi:alert-circle-outline",
+        "translation_key": "link_errors"
+    },
+    {
+        "name": "Timeouts",
+        "unique_id": f"{DOMAIN}_link_timeouts",
+        "type": "counter",
+        "metric": "timeouts",
+        "icon": "mdi:timer-alert-outline",
+        "translation_key": "link_timeouts"
+    },
+    {
+        "name": "Reconnects",
+        "unique_id": f"{DOMAIN}_link_reconnects",
+        "type": "counter",
+        "metric": "reconnects",
+        "icon": "mdi:lan-connect",
+        "translation_key": "link_reconnects"
+    },
+    {
+        "name": "Poll overruns",
+        "unique_id": f"{DOMAIN}_link_poll_overruns",
+        "type": "counter",
+        "metric": "poll_overruns",
+        "icon": "mdi:timer-sand-complete",
+        "translation_key": "link_poll_overruns"
+    }
+]
+
+# Energiezähler (kWh), Summe der Zähler der angegebenen Betriebsarten
+ENERGY_SENSORS = [
+    {
+        "unique_id": f"{DOMAIN}_heat_energy",
+        "kind": ENERGY_KIND_HEAT,
+        "modes": (ENERGY_MODE_HEATING, ENERGY_MODE_DHW),
+        "icon": "mdi:fire",
+        "translation_key": "heat_energy",
+    },
+    {
+        "unique_id": f"{DOMAIN}_heat_energy_heating",
+        "kind": ENERGY_KIND_HEAT,
+        "modes": (ENERGY_MODE_HEATING,),
+        "icon": "mdi:radiator",
+        "translation_key": "heat_energy_heating",
+    },
+    {
+        "unique_id": f"{DOMAIN}_heat_energy_dhw",
+        "kind": ENERGY_KIND_HEAT,
+        "modes": (ENERGY_MODE_DHW,),
+        "icon": "mdi:water-boiler",
+        "translation_key": "heat_energy_dhw",
+    },
+    {
+        "unique_id": f"{DOMAIN}_cooling_energy",
+        "kind": ENERGY_KIND_HEAT,
+        "modes": (ENERGY_MODE_COOLING,),
+        "icon": "mdi:snowflake",
+        "translation_key": "cooling_energy",
+    },
+    {
+        "unique_id": f"{DOMAIN}_electric_energy",
+        "kind": ENERGY_KIND_ELECTRIC,
+        "modes": (ENERGY_MODE_HEATING, ENERGY_MODE_DHW, ENERGY_MODE_COOLING),
+        "icon": "mdi:lightning-bolt",
+        "translation_key": "electric_energy",
+    },
+    {
+        "unique_id": f"{DOMAIN}_electric_energy_heating",
+        "kind": ENERGY_KIND_ELECTRIC,
+        "modes": (ENERGY_MODE_HEATING,),
+        "icon": "mdi:lightning-bolt",
+        "translation_key": "electric_energy_heating",
+    },
+    {
+        "unique_id": f"{DOMAIN}_electric_energy_dhw",
+        "kind": ENERGY_KIND_ELECTRIC,
+        "modes": (ENERGY_MODE_DHW,),
+        "icon": "mdi:lightning-bolt",
+        "translation_key": "electric_energy_dhw",
+    },
+    {
+        "unique_id": f"{DOMAIN}_electric_energy_cooling",
+        "kind": ENERGY_KIND_ELECTRIC,
+        "modes": (ENERGY_MODE_COOLING,),
+        "icon": "mdi:lightning-bolt",
+        "translation_key": "electric_energy_cooling",
+    },
+]
+
+
+# Leistungszahl-Fenster: Ringpuffer aus "buckets" Summen über je "bucket_seconds",
+# ohne "buckets" seit Saisonbeginn
+COP_WINDOWS = [
+    {
+        "unique_id": f"{DOMAIN}_cop_1h",
+        "bucket_seconds": 60,
+        "buckets": 60,
+        "translation_key": "cop_1h",
+    },
+    {
+        "unique_id": f"{DOMAIN}_cop_24h",
+        "bucket_seconds": 900,
+        "buckets": 96,
+        "translation_key": "cop_24h",
+    },
+    {
+        "unique_id": f"{DOMAIN}_cop_7d",
+        "bucket_seconds": 3600,
+        "buckets": 168,
+        "translation_key": "cop_7d",
+    },
+    {
+        "unique_id": f"{DOMAIN}_scop_season",
+        "translation_key": "scop_season",
+    },
+]
@@ -1,49 +1,199 @@
 import asyncio
 import logging
+import time
+from array import array
 from datetime import timedelta, datetime
-from pymodbus.client import AsyncModbusTcpClient
 from pymodbus.exceptions import ModbusException
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util import dt as dt_util
 from .const import (
     DOMAIN,
     INPUT_REGISTERS,
     HOLDING_REGISTERS,
-    SELECT_REGISTERS,
     DISCRETE_INPUT_SENSORS,
-    COIL_SENSORS,
     BINARY_SENSORS,
-    CALCULATED_SENSORS,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_MAX_IN_FLIGHT,
+    DEFAULT_FAST_SCAN_INTERVAL,
+    DEFAULT_SLOW_SCAN_INTERVAL,
+    DEFAULT_WRITE_DEBOUNCE,
+    DEFAULT_EDGE_WATCH_INTERVAL,
+    DEFAULT_IDLE_SCAN_INTERVAL,
+    DEFAULT_MAX_VALUE_AGE,
+    SNAPSHOT_STORAGE_VERSION,
+    SNAPSHOT_SAVE_DELAY,
+    POLL_TIERS,
+    POLL_TIER_FAST,
+    POLL_TIER_NORMAL,
+    POLL_TIER_SLOW,
+    EXTERNAL_ELECTRIC_POWER_KEY,
+    ENERGY_STORAGE_VERSION,
+    ENERGY_SAVE_DELAY,
 )
-
-def _get_last_run_trigger_addresses():
-    """Extract trigger addresses from CALCULATED_SENSORS for 'last_triggered' type sensors."""
-    trigger_addresses = []
-    for sensor in CALCULATED_SENSORS:
-        if sensor.get("type") == "last_triggered" and "trigger_address" in sensor:
-            trigger_addresses.append(sensor["trigger_address"])
-    return trigger_addresses
+from .calculated import CALCULATIONS
+from .connection import ModbusConnectionError, acquire_connection, release_connection
+from .edge_tracker import TRIGGER_ADDRESSES, EdgeTracker
+from .cop_windows import CopWindows, cop_active
+from .energy import ENERGY_INPUT_KEYS, ELECTRIC_INPUT_KEYS, EnergyAccumulator
+from .external_power import ExternalPowerTracker
+from .link_metrics import LinkMetrics
+from .pipeline import async_read_pipelined
+from .read_plan import (
+    READ_PLAN,
+    READ_PLANS,
+    READ_METHODS,
+    READBACK_BLOCKS,
+    SLOT_INDEX,
+    SLOT_IDS,
+    FUNCTION_COIL,
+    FUNCTION_HOLDING,
+    coalesce_blocks,
+    decode_block,
+    merge_readback_blocks,
+)
+from .scan_interval import AdaptiveScanInterval
+from .snapshot import RegisterSnapshot
+from .traffic_log import ReplayConnection, TrafficRecorder
+from .write_scheduler import WriteScheduler
 
 _LOGGER = logging.getLogger(__name__)
 
+
+async def async_remove_snapshot(hass, storage_key):
+    """Remove the persisted snapshot and energy counters of a deleted config entry."""
+    await Store(hass, SNAPSHOT_STORAGE_VERSION, storage_key).async_remove()
+    await Store(hass, ENERGY_STORAGE_VERSION, f"{storage_key}.energy").async_remove()
+
+
 class DaikinAlthermaCoordinator(DataUpdateCoordinator):
     """Koordinator für alle Register."""
 
-    def __init__(self, hass, host: str, port: int, scan_interval: int = 10, demo_mode: bool = False):
+    def __init__(
+        self,
+        hass,
+        host: str,
+        port: int,
+        scan_interval: int = 10,
+        demo_mode: bool = False,
+        pipelined_reads: bool = False,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        fast_scan_interval: int = DEFAULT_FAST_SCAN_INTERVAL,
+        slow_scan_interval: int = DEFAULT_SLOW_SCAN_INTERVAL,
+        write_debounce: float = DEFAULT_WRITE_DEBOUNCE,
+        edge_watch_interval: int = DEFAULT_EDGE_WATCH_INTERVAL,
+        storage_key: str | None = None,
+        idle_scan_interval: int = DEFAULT_IDLE_SCAN_INTERVAL,
+        traffic_log: str | None = None,
+        replay_log: str | None = None,
+        replay_speed: float = 1.0,
+        max_value_age: int = DEFAULT_MAX_VALUE_AGE,
+        electric_power_sensor: str | None = None,
+    ):
+        # Intervall pro Abfragestufe; "normal" entspricht dem scan_interval
+        self.tier_intervals = {
+            POLL_TIER_FAST: min(fast_scan_interval, scan_interval),
+            POLL_TIER_NORMAL: scan_interval,
+            POLL_TIER_SLOW: max(slow_scan_interval, scan_interval),
+        }
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=scan_interval),
+            # Der Koordinator tickt im Takt der schnellsten Stufe
+            update_interval=timedelta(seconds=min(self.tier_intervals.values())),
         )
         self.host = host
         self.port = port
+        # Intervall je nach Betriebszustand zwischen schnellster Stufe und Leerlauf-Obergrenze;
+        # tier_intervals bleibt die Konfiguration, gestreckt wird nur beim Prüfen der Fälligkeit
+        self.adaptive_interval = AdaptiveScanInterval(self.update_interval.total_seconds(), idle_scan_interval)
         self.demo_mode = demo_mode
-        self.client: AsyncModbusTcpClient | None = None
-        self.data = {}
-        self.previous_data = {}
+        # Gemeinsame Verbindung pro Adapter (max. 3 Verbindungen) mit Backoff und Circuit Breaker
+        if replay_log:
+            # Offline: Antworten kommen aus einem Mitschnitt, siehe traffic_log.async_replay()
+            self.connection = ReplayConnection(replay_log, replay_speed, max_in_flight)
+        else:
+            self.connection = acquire_connection(hass, host, port, self, max_in_flight=max_in_flight)
+        # Optional: alle Anfragen und Antworten binär mitschneiden
+        self.recorder = TrafficRecorder(hass, traffic_log) if traffic_log and not demo_mode else None
+        # Antwortzeiten, Fehler, Timeouts und Poll-Überläufe für die Diagnose-Sensoren
+        self.link_metrics = LinkMetrics(self.connection)
+        # Zuletzt gelesene Rohwerte pro Block (nur Referenzen) für die Diagnose
+        self.raw_blocks = {}
+        # Teilausfälle: Werte fehlgeschlagener Blöcke bleiben bis max_value_age erhalten
+        self.max_value_age = max_value_age
+        self.block_last_success = {}
+        self._slot_read_at = array("d", bytes(8 * len(SLOT_IDS)))
+        # Beginn der ununterbrochenen Lesefehler pro Slot, 0 = zuletzt gelesen
+        self._slot_failed_at = array("d", bytes(8 * len(SLOT_IDS)))
+        self._retry_blocks = ()
+        self.last_success_at = None
+        # Daten-Keys, deren Lesen länger als max_value_age fehlschlägt
+        self.expired_keys = frozenset()
+        # Externer Leistungssensor als Eingang der berechneten Werte, per Zustandsänderung verfolgt
+        self.electric_power_sensor = electric_power_sensor
+        self.external_power = (
+            ExternalPowerTracker(hass, electric_power_sensor, self._external_power_reported)
+            if electric_power_sensor
+            else None
+        )
+        self._external_power_pending = False
+        # Zwei Snapshots, die nach jedem Poll getauscht statt kopiert werden
+        self.data = RegisterSnapshot()
+        self.previous_data = RegisterSnapshot()
         self.last_triggered = {}
+        # Gepackte Zustände für die Flankenerkennung
+        self._edges = EdgeTracker()
+        # Schnelle Spur: nur die Discrete-Input-Blöcke mit Trigger-Adressen
+        self.edge_watch_interval = edge_watch_interval
+        self._watch_blocks = tuple(
+            block
+            for block in READ_PLAN.discrete_blocks
+            if any(slot.address in TRIGGER_ADDRESSES for slot in block.slots)
+        )
+        self._unsub_edge_watch = None
+        self._edge_watch_running = False
+        self._polling = False
+        self._shut_down = False
+        # Letzter Snapshot auf Platte für den Warmstart, siehe async_load_snapshot()
+        self._store = Store(hass, SNAPSHOT_STORAGE_VERSION, storage_key) if storage_key and not demo_mode else None
+        # Wärme- und elektrische Energie pro Betriebsart, getrennt vom Snapshot gespeichert
+        self.energy = EnergyAccumulator()
+        # Gleitende und Saison-Leistungszahl aus denselben Intervallen, mit den Zählern gespeichert
+        self.cop_windows = CopWindows()
+        self._cop_active = False
+        self._energy_store = (
+            Store(hass, ENERGY_STORAGE_VERSION, f"{storage_key}.energy") if storage_key and not demo_mode else None
+        )
+        self._energy_input_indexes = tuple(SLOT_INDEX[key] for key in ENERGY_INPUT_KEYS if key in SLOT_INDEX)
+        self._electric_input_indexes = tuple(SLOT_INDEX[key] for key in ELECTRIC_INPUT_KEYS if key in SLOT_INDEX)
+        # Zeitpunkt des gespeicherten Snapshots, solange noch kein Live-Poll gelungen ist
+        self.cached_at = None
+        # Kompilierte Lesepläne pro Kombination fälliger Stufen, siehe read_plan.build_read_plan()
+        self.read_plans = READ_PLANS
+        self.read_plan = READ_PLANS[frozenset(POLL_TIERS)]
+        self._tier_last_read = {}
+        self._refresh_all_tiers = True
+        # Fest vorgegebene Stufen (Replay eines Mitschnitts), None = nach Intervall
+        self.pinned_tiers = None
+        # Geänderte Daten-Keys des letzten Polls; None = alle Listener benachrichtigen
+        self._changed_keys = None
+        self._notified_success = None
+        # Zeitpunkt des letzten Schreibzugriffs pro Daten-Key (monotonic)
+        self._write_times = {}
+        # Schreibwünsche sammeln, entprellen und benachbarte Register bündeln
+        # Gleiche Werte nur verwerfen, wenn sie höchstens eine schnelle Stufe alt sind
+        self._write_scheduler = WriteScheduler(self, write_debounce, self.tier_intervals[POLL_TIER_FAST])
+        # Optional: alle Blöcke gleichzeitig anfragen (Modbus TCP Transaction IDs)
+        self.pipelined = pipelined_reads
+
+    @property
+    def client(self):
+        """Return the Modbus client of the connection manager."""
+        return self.connection.client
 
     async def _async_update_data(self):
         """Lese alle Register blockweise."""
@@ -51,270 +201,573 @@ class DaikinAlthermaCoordinator(DataUpdateCoordinator):
             _LOGGER.debug("Demo mode active - generating dummy data")
             return self._generate_demo_data()
         
-        if self.client is None:
-            _LOGGER.debug(f"Creating new Modbus TCP client for {self.host}:{self.port}")
-            self.client = AsyncModbusTcpClient(self.host, port=self.port)
-            _LOGGER.debug(f"Connecting to Modbus TCP server at {self.host}:{self.port}")
-            
-            try:
-                await self.client.connect()
-                await asyncio.sleep(0.1)
-                if not self.client.connected:
-                    _LOGGER.error(f"Modbus connection failed to {self.host}:{self.port}")
-                    raise UpdateFailed(f"Modbus Verbindung zu {self.host}:{self.port} fehlgeschlagen")
-                else:
-                    _LOGGER.debug(f"Successfully connected to Modbus TCP server at {self.host}:{self.port}")
-            except Exception as e:
-                _LOGGER.error(f"Exception during Modbus connection to {self.host}:{self.port}: {e}")
-                raise UpdateFailed(f"Modbus Verbindung zu {self.host}:{self.port} fehlgeschlagen: {e}")
-        else:
-            # Check if existing client is still connected
-            if not self.client.connected:
-                _LOGGER.warning(f"Modbus client disconnected, attempting reconnection to {self.host}:{self.port}")
-                try:
-                    await self.client.connect()
-                    await asyncio.sleep(0.1)
-                    if not self.client.connected:
-                        _LOGGER.error(f"Modbus reconnection failed to {self.host}:{self.port}")
-                        raise UpdateFailed(f"Modbus Verbindung zu {self.host}:{self.port} fehlgeschlagen")
-                    else:
-                        _LOGGER.debug(f"Successfully reconnected to Modbus TCP server at {self.host}:{self.port}")
-                except Exception as e:
-                    _LOGGER.error(f"Exception during Modbus reconnection to {self.host}:{self.port}: {e}")
-                    raise UpdateFailed(f"Modbus Verbindung zu {self.host}:{self.port} fehlgeschlagen: {e}")
-
-        # Adressen sammeln und 1-basiert zu 0-basiert konvertieren
-        addresses = [item["address"] - 1 for item in INPUT_REGISTERS]
-        start = 0
-        end = max(addresses)
-        count = end - start + 1
+        try:
+            await self.connection.async_get_client()
+        except ModbusConnectionError as err:
+            return self._stale_data(err)
 
+        self._polling = True
+        if self.recorder is not None:
+            self.recorder.mark_poll()
+        poll_started = time.monotonic()
+        poll_interval = self.update_interval.total_seconds()
         try:
-            rr = await self.client.read_input_registers(address=start, count=count)
-            if rr.isError():
-                raise UpdateFailed(f"Modbus Error beim Lesen der Register {start}-{end}")
+            due_tiers = self._due_tiers()
+            self.read_plan = self.read_plans[due_tiers]
+            # Snapshot fortschreiben: nicht fällige Stufen behalten ihre letzten Werte.
+            # Dekodiert wird in den hinteren Puffer, der vordere bleibt für die Entitäten gültig.
+            data = self.previous_data
+            data.copy_from(self.data)
+            blocks = self.read_plan.blocks
+            if self._retry_blocks:
+                # Im letzten Poll fehlgeschlagene Blöcke erneut lesen, auch wenn ihre Stufe nicht fällig ist;
+                # mit dem Plan zusammengefasst, damit überlappende Bereiche nur einmal gelesen werden
+                blocks = coalesce_blocks(blocks + self._retry_blocks)
+            responses = await self._read_blocks(blocks)
 
-            # Werte ins Dictionary schreiben
-            data = {}
-            
-            # INPUT_REGISTERS verarbeiten
-            for item in INPUT_REGISTERS:
-                address = item["address"] - 1  # 1-basierte zu 0-basierten Adressen konvertieren
-                reg_count = item.get("count", 1)
-                dtype = item.get("dtype", "uint16")
-                scale = item.get("scale", 1)
-                input_type = item.get("input_type", "input")
-                unique_id = item.get("unique_id", f"{address}")
-                
-                if reg_count == 1:
-                    raw_value = rr.registers[address - start]
-                    # Entity nicht erstellen wenn Wert 32766 (Kein Fehler/Normalzustand)
-                    if raw_value == 32766:
-                        _LOGGER.debug(f"Register {address + 1} hat Wert 32766, wird übersprungen")
-                        continue
-                    data[unique_id] = {
-                        "value": raw_value,
-                        "input_type": input_type,
-                        "address": address
-                    }
+            read_at = time.monotonic()
+            failed = []
+            error = None
+            for block, response in zip(blocks, responses):
+                if isinstance(response, Exception) or response.isError():
+                    # Werte des Blocks bleiben mit ihrem Alter erhalten; bereits fehlgeschlagene Werte nur im Debug-Log
+                    failed_times = self._slot_failed_at
+                    retried = all(failed_times[index] for index in block.slot_indexes)
+                    log = _LOGGER.debug if retried else _LOGGER.warning
+                    log(f"Konnte {block.function} {block.start}-{block.end} nicht lesen: {response}")
+                    failed.append(block)
+                    error = error or response
+                    continue
+                values = response.bits if block.is_bit else response.registers
+                decode_block(block, values, data)
+                self.raw_blocks[block.function, block.start, block.count] = values
+                self._mark_block_read(block, read_at)
+            # Nach einem Verbindungsabbruch nicht mehr angefragte Blöcke
+            failed.extend(blocks[len(responses):])
+            if len(failed) == len(blocks):
+                if isinstance(error, ModbusException):
+                    # Zeitüberschreitungen und Verbindungsabbrüche zählen für den Circuit Breaker
+                    self.connection.record_failure(error)
+                return self._stale_data(error)
+            for block in failed:
+                self._mark_block_failed(block, read_at)
+            self._retry_blocks = tuple(failed)
+
+            # Während des Polls geschriebene Werte nicht mit älteren Lesewerten überschreiben
+            for unique_id, written_at in list(self._write_times.items()):
+                if written_at >= poll_started:
+                    data.copy_slot(self.data, unique_id)
                 else:
-                    raw_value = rr.registers[address - start : address - start + reg_count]
-                    # Entity nicht erstellen wenn Wert 32766 (Kein Fehler/Normalzustand)
-                    if raw_value and raw_value[0] == 32766:
-                        _LOGGER.debug(f"Register {address + 1} hat Wert 32766, wird übersprungen")
-                        continue
-                    data[unique_id] = {
-                        "value": raw_value,
-                        "input_type": input_type,
-                        "address": address
-                    }
-
-            # DISCRETE_INPUT_SENSORS verarbeiten (mit separatem Modbus-Aufruf)
-            if DISCRETE_INPUT_SENSORS:
-                try:
-                    # Discrete Inputs mit Function Code 2 lesen
-                    discrete_addresses = [item["address"] - 1 for item in DISCRETE_INPUT_SENSORS]  # 1-basiert zu 0-basiert
-                    discrete_start = min(discrete_addresses)
-                    discrete_end = max(discrete_addresses)
-                    discrete_count = discrete_end - discrete_start + 1
-                    
-                    di = await self.client.read_discrete_inputs(address=discrete_start, count=discrete_count)
-                    if not di.isError():
-                        for item in DISCRETE_INPUT_SENSORS:
-                            address = item["address"] - 1  # 1-basiert zu 0-basiert
-                            input_type = item.get("input_type", "discrete_input")
-                            unique_id = item.get("unique_id", f"discrete_{address}")
-                            
-                            # Discrete Inputs sind 0-basiert im Array
-                            if address - discrete_start < len(di.bits):
-                                raw_value = 1 if di.bits[address - discrete_start] else 0
-                                data[unique_id] = {
-                                    "value": raw_value,
-                                    "input_type": input_type,
-                                    "address": address + 1  # Original 1-basierte Adresse für Logging
-                                }
-                            else:
-                                _LOGGER.warning(f"Discrete Input {address + 1} nicht im gelesenen Bereich ({len(di.bits)} Bits)")
-                    else:
-                        _LOGGER.error(f"Discrete Input-Lesen fehlgeschlagen")
-                except Exception as e:
-                    _LOGGER.warning(f"Konnte Discrete Inputs nicht lesen: {e}")
-
-            # COIL_SENSORS verarbeiten (mit separatem Modbus-Aufruf)
-            if COIL_SENSORS:
-                try:
-                    # Coils mit Function Code 1 lesen
-                    coil_addresses = [item["address"] - 1 for item in COIL_SENSORS]  # 1-basiert zu 0-basiert
-                    coil_start = min(coil_addresses)
-                    coil_end = max(coil_addresses)
-                    coil_count = coil_end - coil_start + 1
-                    
-                    cr = await self.client.read_coils(address=coil_start, count=coil_count)
-                    if not cr.isError():
-                        for item in COIL_SENSORS:
-                            address = item["address"] - 1  # 1-basiert zu 0-basiert
-                            input_type = item.get("input_type", "coil")
-                            unique_id = item.get("unique_id", f"coil_{address}")
-                            
-                            # Coils sind 0-basiert im Array
-                            if address - coil_start < len(cr.bits):
-                                raw_value = 1 if cr.bits[address - coil_start] else 0
-                                data[unique_id] = {
-                                    "value": raw_value,
-                                    "input_type": input_type,
-                                    "address": address + 1  # Original 1-basierte Adresse für Logging
-                                }
-                            else:
-                                _LOGGER.warning(f"Coil {address + 1} nicht im gelesenen Bereich ({len(cr.bits)} Bits)")
-                    else:
-                        _LOGGER.error(f"Coil-Lesen fehlgeschlagen")
-                except Exception as e:
-                    _LOGGER.warning(f"Konnte Coils nicht lesen: {e}")
-            
-            # HOLDING_REGISTERS und SELECT_REGISTERS verarbeiten (wenn vorhanden)
-            all_holding_registers = []
-            if HOLDING_REGISTERS:
-                all_holding_registers.extend(HOLDING_REGISTERS)
-            if SELECT_REGISTERS:
-                all_holding_registers.extend(SELECT_REGISTERS)
-            
-            if all_holding_registers:
-                try:
-                    hr = await self.client.read_holding_registers(address=0, count=79)
-                    if not hr.isError():
-                        for item in all_holding_registers:
-                            address = item["address"] - 1  # 1-basiert zu 0-basiert
-                            input_type = item.get("input_type", "holding")
-                            unique_id = item.get("unique_id", f"holding_{address}")
-                            
-                            if address < len(hr.registers):
-                                raw_value = hr.registers[address]
-                                # Entity nicht erstellen wenn Wert 32766 (Kein Fehler/Normalzustand)
-                                if raw_value == 32766:
-                                    _LOGGER.debug(f"Holding-Register {address + 1} hat Wert 32766, wird übersprungen")
-                                    continue
-                                data[unique_id] = {
-                                    "value": raw_value,
-                                    "input_type": input_type,
-                                    "address": address + 1  # Original 1-basierte Adresse für Logging
-                                }
-                            else:
-                                _LOGGER.warning(f"Holding-Register {address + 1} nicht im gelesenen Bereich ({len(hr.registers)} Register)")
-                    else:
-                        _LOGGER.error(f"Holding-Register-Lesen fehlgeschlagen, nutze Input-Register als Fallback")
-                except Exception as e:
-                    _LOGGER.warning(f"Konnte Holding-Register nicht lesen: {e}")
-                    # Fallback bei Exception
-                    for item in all_holding_registers:
-                        address = item["address"] - 1  # 1-basiert zu 0-basiert
-                        input_type = item.get("input_type", "holding")
-                        unique_id = item.get("unique_id", f"holding_{address}")
-                        
-                        if address <= end and address >= start:
-                            raw_value = rr.registers[address - start]
-                            # Entity nicht erstellen wenn Wert 32766 (Kein Fehler/Normalzustand)
-                            if raw_value == 32766:
-                                _LOGGER.debug(f"Holding-Register {address + 1} hat Wert 32766, wird übersprungen (Fallback)")
-                                continue
-                            _LOGGER.debug(f"Holding-Register {address + 1} als Input-Register gelesen (Exception): Wert {raw_value} -> {unique_id}")
-                            data[unique_id] = {
-                                "value": raw_value,
-                                "input_type": input_type,
-                                "address": address + 1  # Original 1-basierte Adresse für Logging
-                            }
-            
-            # BINARY_SENSORS verarbeiten (überschreibt keine INPUT_REGISTERS)
-            for item in BINARY_SENSORS:
-                address = item["address"] - 1  # 1-basiert zu 0-basiert
-                input_type = item.get("input_type", "input")
-                unique_id = item.get("unique_id", f"binary_{address}")
-                
-                if unique_id not in data:  # Nur wenn nicht schon vorhanden
-                    raw_value = rr.registers[address - start]
-                    # Entity nicht erstellen wenn Wert 32766 (Kein Fehler/Normalzustand)
-                    if raw_value == 32766:
-                        _LOGGER.debug(f"Binary-Sensor {address + 1} hat Wert 32766, wird übersprungen")
-                        continue
-                    data[unique_id] = {
-                        "value": raw_value,
-                        "input_type": input_type,
-                        "address": address + 1  # Original 1-basierte Adresse für Logging
-                    }
-
-            self.data = data
-
-            # Track last triggered for binary sensors
-            for binary in BINARY_SENSORS:
-                unique_id = binary.get("unique_id", f"binary_{binary['address']}")
-                current_data = data.get(unique_id, {})
-                current_val = current_data.get("value")
-                previous_data = self.previous_data.get(unique_id, {})
-                previous_val = previous_data.get("value") if previous_data else None
-                device_class = binary.get("device_class")
-
-                if device_class == "running":
-                    is_on = current_val == 0
-                    was_on = previous_val == 0 if previous_val is not None else False
-                    if is_on and not was_on:
-                        self.last_triggered[binary["address"]] = dt_util.now()
-                elif device_class == "problem":
-                    is_on = current_val == 1
-                    was_on = previous_val == 1 if previous_val is not None else False
-                    if is_on and not was_on:
-                        self.last_triggered[binary["address"]] = dt_util.now()
-
-                # Add to data
-                if binary["address"] in self.last_triggered:
-                    data[f"last_triggered_{binary['address']}"] = self.last_triggered[binary["address"]]
-
-            # Track last triggered for discrete input sensors (dynamisch aus CALCULATED_SENSORS)
-            last_run_addresses = _get_last_run_trigger_addresses()
-            for discrete in DISCRETE_INPUT_SENSORS:
-                address = discrete["address"]
-                if address in last_run_addresses:  # Only track addresses configured in CALCULATED_SENSORS
-                    unique_id = discrete.get("unique_id", f"discrete_{address}")
-                    current_data = data.get(unique_id, {})
-                    current_val = current_data.get("value")
-                    previous_data = self.previous_data.get(unique_id, {})
-                    previous_val = previous_data.get("value") if previous_data else None
-
-                    # Track when discrete input turns on (value = 1)
-                    is_on = current_val == 1
-                    was_on = previous_val == 1 if previous_val is not None else False
-                    if is_on and not was_on:
-                        self.last_triggered[address] = dt_util.now()
-
-                    # Add to data
-                    if address in self.last_triggered:
-                        data[f"last_triggered_{address}"] = self.last_triggered[address]
-
-            self.previous_data = data.copy()
-            return self.data
+                    del self._write_times[unique_id]
+
+            read_at = time.monotonic()
+            for tier in due_tiers:
+                self._tier_last_read[tier] = read_at
+            self._refresh_all_tiers = False
+
+            self._track_last_triggered(data)
+            if self.external_power is not None:
+                # Wert beim Absenden der Leseanfragen, nicht eine während des Polls eingetroffene Meldung
+                data[EXTERNAL_ELECTRIC_POWER_KEY] = self.external_power.value_at(poll_started)
 
+            self._changed_keys = data.diff(self.data)
+            self._changed_keys |= CALCULATIONS.update(data, self._changed_keys)
+            self._integrate_energy(read_at, data)
+            self._changed_keys |= self.link_metrics.changed_keys()
+            self._changed_keys |= self._update_expired_keys(read_at)
+            if self._apply_scan_interval(self.adaptive_interval.update(data, self._changed_keys)):
+                self._changed_keys.add("scan_interval")
+            # Puffer tauschen: der neue Snapshot wird vorne, der alte hinten
+            self.previous_data = self.data
+            self.connection.record_success()
+            self.last_success_at = read_at
+            self.cached_at = None
+            if self._store is not None:
+                # Verzögert speichern; ein bereits geplanter Termin wird nicht verschoben
+                self._store.async_delay_save(self._snapshot_to_store, SNAPSHOT_SAVE_DELAY)
+            return data
+
+        except UpdateFailed:
+            raise
         except ModbusException as err:
+            # Zeitüberschreitungen und Verbindungsabbrüche zählen für den Circuit Breaker
+            self.connection.record_failure(err)
+            self.energy.reset_segment()
             raise UpdateFailed(f"Modbus Exception: {err}") from err
         except Exception as err:
-            raise UpdateFailed(f"Fehler beim Lesen der Input-Register: {err}") from err
+            self.energy.reset_segment()
+            raise UpdateFailed(f"Fehler beim Lesen der Register: {err}") from err
+        finally:
+            self._polling = False
+            self.link_metrics.record_poll(time.monotonic() - poll_started, poll_interval)
+            if self.recorder is not None:
+                self.recorder.schedule_flush()
+
+    def _mark_block_read(self, block, read_at):
+        """Record a successful read of all values of a block."""
+        self.block_last_success[block.function, block.start, block.count] = read_at
+        read_times = self._slot_read_at
+        failed_times = self._slot_failed_at
+        for index in block.slot_indexes:
+            read_times[index] = read_at
+            failed_times[index] = 0.0
+
+    def _mark_block_failed(self, block, failed_at):
+        """Start the failure age of the values of a block, if not already failing."""
+        failed_times = self._slot_failed_at
+        for index in block.slot_indexes:
+            if not failed_times[index]:
+                failed_times[index] = failed_at
+
+    def _update_expired_keys(self, now):
+        """Recompute the keys failing longer than max_value_age, return the keys that changed."""
+        failed_times = self._slot_failed_at
+        if not self.expired_keys and failed_times.count(0.0) == len(failed_times):
+            return set()
+        max_age = self.max_value_age
+        expired = frozenset(
+            SLOT_IDS[index]
+            for index, failed_at in enumerate(failed_times)
+            if failed_at and now - failed_at > max_age
+        )
+        changed = expired ^ self.expired_keys
+        if changed:
+            _LOGGER.debug(f"{len(expired)} Werte länger als {max_age}s nicht gelesen")
+        self.expired_keys = expired
+        return set(changed)
+
+    def _stale_data(self, err):
+        """Keep the last values when nothing could be read, until they are older than max_value_age."""
+        now = time.monotonic()
+        if self.last_success_at is None or now - self.last_success_at > self.max_value_age:
+            raise UpdateFailed(f"Modbus Register nicht lesbar: {err}")
+        _LOGGER.warning(
+            f"Modbus Register nicht lesbar ({err}), letzte Werte von vor {now - self.last_success_at:.0f}s bleiben erhalten"
+        )
+        for block in READ_PLAN.blocks:
+            self._mark_block_failed(block, now)
+        # Nach dem Ausfall alle Stufen auf einmal nachlesen
+        self._refresh_all_tiers = True
+        # Keine Energie über die Lücke integrieren
+        self.energy.reset_segment()
+        self._changed_keys = self._update_expired_keys(now)
+        self._changed_keys |= self.link_metrics.changed_keys()
+        return self.data
+
+    def _integrate_energy(self, read_at, data):
+        """Integrate heat and electric power up to this poll and schedule saving the counters."""
+        failed_times = self._slot_failed_at
+        input_indexes = self._energy_input_indexes
+        if self.external_power is None or data.get(EXTERNAL_ELECTRIC_POWER_KEY) is None:
+            # Elektrische Leistung kommt aus Input 51
+            input_indexes += self._electric_input_indexes
+        if any(failed_times[index] for index in input_indexes):
+            # Alte Leistungswerte nicht fortschreiben, solange ihre Register nicht lesbar sind
+            self.energy.reset_segment()
+            return
+        changed = self.energy.update(read_at, data)
+        # Nur Intervalle, die mit laufendem Verdichter ohne Abtauung beginnen und enden
+        active = cop_active(data)
+        interval = self.energy.last_interval if self._cop_active and active else None
+        self._cop_active = active
+        changed |= self.cop_windows.update(dt_util.now(), interval)
+        if changed:
+            self._changed_keys |= changed
+            if self._energy_store is not None:
+                self._energy_store.async_delay_save(self._energy_to_store, ENERGY_SAVE_DELAY)
+
+    def _energy_to_store(self):
+        """Return the energy counters and COP windows in storage format."""
+        return {**self.energy.as_dict(), "cop_windows": self.cop_windows.as_dict()}
+
+    async def async_load_energy(self):
+        """Restore the energy counters and COP windows saved before the last shutdown."""
+        if self._energy_store is None:
+            return
+        try:
+            stored = await self._energy_store.async_load()
+        except Exception as err:
+            _LOGGER.warning(f"Gespeicherte Energiezähler konnten nicht geladen werden: {err}")
+            return
+        if stored:
+            self.energy.load(stored)
+            self.cop_windows.load(stored.get("cop_windows") or {})
+
+    def value_age(self, unique_id):
+        """Return the seconds since a value was last read, None if never read."""
+        index = SLOT_INDEX.get(unique_id)
+        if index is None or not self._slot_read_at[index]:
+            return None
+        return time.monotonic() - self._slot_read_at[index]
+
+    def keys_available(self, keys):
+        """Return False if one of the data keys failed to read for longer than max_value_age."""
+        return not keys or self.expired_keys.isdisjoint(keys)
+
+    async def async_load_snapshot(self):
+        """Load the persisted snapshot as current data.
+
+        Returns True if a snapshot was loaded. Entities can then be set up
+        from it right away while the first live refresh runs in the
+        background; ``cached_at`` stays set until that refresh succeeds.
+        The values count as read when the snapshot was saved, so an
+        unreachable adapter keeps them until ``max_value_age``.
+        """
+        if self._store is None:
+            return False
+        try:
+            stored = await self._store.async_load()
+        except Exception as err:
+            _LOGGER.warning(f"Gespeicherter Snapshot konnte nicht geladen werden: {err}")
+            return False
+        if not stored or not stored.get("registers"):
+            return False
+
+        snapshot = RegisterSnapshot()
+        snapshot.load_raw_values(stored["registers"])
+        self.cached_at = dt_util.parse_datetime(stored.get("saved_at") or "") or dt_util.utcnow()
+        # Alter der gespeicherten Werte ab dem Speichern, auf die monotone Uhr umgerechnet
+        saved_at = time.monotonic() - max((dt_util.utcnow() - self.cached_at).total_seconds(), 0.0)
+        for unique_id in snapshot:
+            if unique_id in SLOT_INDEX:
+                self._slot_read_at[SLOT_INDEX[unique_id]] = saved_at
+        # Ist der Adapter beim Start nicht erreichbar, gelten die Werte bis max_value_age weiter
+        self.last_success_at = saved_at
+        for address, triggered_at in stored.get("last_triggered", {}).items():
+            triggered_at = dt_util.parse_datetime(triggered_at)
+            if triggered_at is None:
+                continue
+            self.last_triggered[int(address)] = triggered_at
+            snapshot[f"last_triggered_{address}"] = triggered_at
+        # Flankenerkennung ab dem gespeicherten Zustand, sonst gälte jeder aktive Zustand als neue Flanke
+        self._edges.update(snapshot)
+        CALCULATIONS.update(snapshot)
+        self.data = snapshot
+        _LOGGER.debug(f"Snapshot vom {self.cached_at} geladen ({len(snapshot)} Werte)")
+        return True
+
+    def _snapshot_to_store(self):
+        """Return the current snapshot in storage format."""
+        return {
+            "saved_at": dt_util.utcnow().isoformat(),
+            "registers": self.data.raw_values(),
+            "last_triggered": {
+                str(address): triggered_at.isoformat() for address, triggered_at in self.last_triggered.items()
+            },
+        }
+
+    @callback
+    def async_start_external_power(self):
+        """Start following the state changes of the external power sensor."""
+        if self.external_power is not None:
+            self.external_power.async_start()
+
+    @callback
+    def _external_power_reported(self, power):
+        """Recompute the values depending on the external power sensor right away."""
+        if self._polling:
+            # Der Poll rechnet mit dem Wert zu seinem Lesezeitpunkt, die neue Meldung folgt danach
+            self._external_power_pending = True
+            return
+        if not self.data:
+            return
+        self.data[EXTERNAL_ELECTRIC_POWER_KEY] = power
+        changed = {EXTERNAL_ELECTRIC_POWER_KEY}
+        changed |= CALCULATIONS.update(self.data, changed)
+        self._push_changes(changed)
+
+    def _track_last_triggered(self, data):
+        """Record rising edges of running/problem states and add last_triggered keys to data.
+
+        Returns the data keys that got a new timestamp.
+        """
+        changed = set()
+        for address, triggered_at in self._edges.update(data).items():
+            self.last_triggered[address] = triggered_at
+            data[f"last_triggered_{address}"] = triggered_at
+            changed.add(f"last_triggered_{address}")
+        return changed
+
+    @callback
+    def async_start_edge_watch(self):
+        """Start reading the discrete inputs between the polls."""
+        if self.demo_mode or self.edge_watch_interval <= 0 or not self._watch_blocks or self._unsub_edge_watch:
+            return
+        self._unsub_edge_watch = async_track_time_interval(
+            self.hass,
+            self._async_watch_edges,
+            timedelta(seconds=self.edge_watch_interval),
+            name=f"{DOMAIN} discrete input watch",
+        )
+
+    async def _async_watch_edges(self, now=None):
+        """Read only the discrete inputs and feed their transitions to the edge tracker.
+
+        Skipped while a full poll is running (it reads the same block) and
+        while the adapter is not connected, so the fast lane never triggers
+        reconnects on its own.
+        """
+        if self._polling or self._edge_watch_running or not self.connection.connected or not self.data:
+            return
+        self._edge_watch_running = True
+        changed = set()
+        try:
+            for block in self._watch_blocks:
+                try:
+                    response = await self._read_block(block)
+                except Exception as err:
+                    _LOGGER.debug(f"Discrete Inputs {block.start}-{block.end} nicht gelesen: {err}")
+                    return
+                if response.isError() or self._polling:
+                    return
+                old = {slot.unique_id: self._raw_value(slot.unique_id) for slot in block.slots}
+                decode_block(block, response.bits, self.data)
+                self._mark_block_read(block, time.monotonic())
+                changed.update(unique_id for unique_id, old_value in old.items() if self._raw_value(unique_id) != old_value)
+        finally:
+            self._edge_watch_running = False
+
+        if changed:
+            # Zeitstempel der Flanke ist der Lesezeitpunkt der schnellen Spur
+            changed |= self._track_last_triggered(self.data)
+            changed |= CALCULATIONS.update(self.data, changed)
+            # Verdichter, Abtauen oder WW gestartet: nicht bis zum Ende eines langen Leerlauf-Intervalls warten
+            if self.adaptive_interval.is_active(self.data) and self._reset_scan_interval():
+                changed.add("scan_interval")
+            self._push_changes(changed)
+
+    def _apply_scan_interval(self, seconds):
+        """Set the coordinator tick, True if it changed."""
+        if seconds == self.update_interval.total_seconds():
+            return False
+        _LOGGER.debug(f"Abfrageintervall {self.update_interval.total_seconds():g}s -> {seconds:g}s")
+        self.update_interval = timedelta(seconds=seconds)
+        return True
+
+    def tier_interval(self, tier):
+        """Return the effective interval of a tier; fast and normal stretch with the adaptive tick."""
+        interval = self.tier_intervals[tier]
+        if tier == POLL_TIER_SLOW or not self.update_interval:
+            return interval
+        return max(interval, self.update_interval.total_seconds())
+
+    @callback
+    def _reset_scan_interval(self):
+        """Return to the base interval and reschedule the next poll, True if it changed."""
+        if not self._apply_scan_interval(self.adaptive_interval.reset()):
+            return False
+        if self._listeners:
+            self._schedule_refresh()
+        return True
+
+    async def async_write_register(self, address, value):
+        """Write a holding register and patch the snapshot right away.
+
+        Writes are debounced and batched by the write scheduler. Only the
+        entities reading the written register are updated, and a single
+        targeted readback replaces the full refresh.
+        """
+        return await self._write_scheduler.async_write(FUNCTION_HOLDING, address, value)
+
+    async def async_write_coil(self, address, value):
+        """Write a coil and patch the snapshot right away."""
+        return await self._write_scheduler.async_write(FUNCTION_COIL, address, 1 if value else 0)
+
+    async def async_shutdown(self):
+        """Send pending writes and release the shared connection, only once."""
+        # DataUpdateCoordinator ruft das beim Entladen des Eintrags selbst auf
+        if self._shut_down:
+            return
+        self._shut_down = True
+        if self._unsub_edge_watch:
+            self._unsub_edge_watch()
+            self._unsub_edge_watch = None
+        if self.external_power is not None:
+            self.external_power.async_stop()
+        await self._write_scheduler.async_flush()
+        if self.recorder is not None:
+            await self.recorder.async_flush()
+        if self._energy_store is not None:
+            # Sofort speichern, damit ein Neuladen nicht mit älteren Zählerständen startet
+            await self._energy_store.async_save(self._energy_to_store())
+        await super().async_shutdown()
+        release_connection(self.hass, self.connection, self)
+
+    def cached_value(self, function, address, max_age=None):
+        """Return the snapshot value of a written address, None if unknown or read more than max_age ago."""
+        block = READBACK_BLOCKS.get((function, address))
+        if block is None or not self.data:
+            return None
+        unique_id = block.slots[0].unique_id
+        entry = self.data.get(unique_id)
+        if not entry:
+            return None
+        if max_age is not None:
+            age = self.value_age(unique_id)
+            if age is None or age > max_age:
+                return None
+        return entry["value"]
+
+    @callback
+    def apply_writes(self, function, writes):
+        """Patch written values into the snapshot and schedule one readback.
+
+        ``writes`` maps 1-based addresses to the written values of one
+        write request.
+        """
+        blocks = [READBACK_BLOCKS.get((function, address)) for address in writes]
+        if None in blocks or self.data is None:
+            # Register ist nicht im Leseplan – klassischer Refresh
+            self.hass.async_create_task(self.async_request_refresh())
+            return
+
+        written_at = time.monotonic()
+        changed = set()
+        self.adaptive_interval.note_write()
+        if self._reset_scan_interval():
+            changed.add("scan_interval")
+        for block, value in zip(blocks, writes.values()):
+            for slot in block.slots:
+                self.data.store(slot.unique_id, value)
+                self._write_times[slot.unique_id] = written_at
+                changed.add(slot.unique_id)
+        self._push_changes(changed)
+        self.hass.async_create_task(self._async_readback(merge_readback_blocks(blocks)))
+
+    async def _async_readback(self, block):
+        """Read back a written register and push it if the device disagrees."""
+        try:
+            response = await self._read_block(block)
+        except Exception as err:
+            _LOGGER.debug(f"Readback {block.function} {block.start} fehlgeschlagen: {err}")
+            return
+        if response.isError():
+            _LOGGER.debug(f"Readback {block.function} {block.start} fehlgeschlagen: {response}")
+            return
+
+        # Rohwerte merken, die Views zeigen live auf den Snapshot
+        old = {slot.unique_id: self._raw_value(slot.unique_id) for slot in block.slots}
+        decode_block(block, response.bits if block.is_bit else response.registers, self.data)
+        self._mark_block_read(block, time.monotonic())
+        changed = {unique_id for unique_id, old_value in old.items() if self._raw_value(unique_id) != old_value}
+        if changed:
+            _LOGGER.debug(f"Readback weicht vom geschriebenen Wert ab: {changed}")
+            self._push_changes(changed)
+
+    def _raw_value(self, unique_id):
+        """Return the raw snapshot value of a key, None if missing."""
+        entry = self.data.get(unique_id)
+        return entry["value"] if entry else None
+
+    @callback
+    def _push_changes(self, changed):
+        """Notify only the listeners of the given data keys."""
+        self._changed_keys = changed
+        self.async_update_listeners()
+
+    @callback
+    def async_update_listeners(self):
+        """Notify only listeners whose data keys changed in the last poll.
+
+        Entities register a frozenset of the data keys they read as their
+        coordinator context. Listeners without context, the first update and
+        availability changes always notify every listener.
+        """
+        changed = self._changed_keys
+        self._changed_keys = None
+        if changed is None or self._notified_success != self.last_update_success:
+            self._notified_success = self.last_update_success
+            super().async_update_listeners()
+            self._apply_pending_external_power()
+            return
+
+        for update_callback, context in list(self._listeners.values()):
+            if context is None or not context.isdisjoint(changed):
+                update_callback()
+        self._apply_pending_external_power()
+
+    def _apply_pending_external_power(self):
+        """Apply a power report that arrived during the poll after its result was published."""
+        if self._external_power_pending and not self._polling:
+            self._external_power_pending = False
+            self._external_power_reported(self.external_power.value)
+
+    def _due_tiers(self):
+        """Return the poll tiers that are due in this cycle."""
+        if self.pinned_tiers is not None:
+            return self.pinned_tiers
+        if self._refresh_all_tiers:
+            return frozenset(POLL_TIERS)
+        now = time.monotonic()
+        # Halber Tick Toleranz, damit eine Stufe nicht wegen Jitter einen Tick zu spät kommt
+        tolerance = self.update_interval.total_seconds() / 2 if self.update_interval else 0
+        due = frozenset(
+            tier
+            for tier in POLL_TIERS
+            if tier not in self._tier_last_read
+            or now - self._tier_last_read[tier] >= self.tier_interval(tier) - tolerance
+        )
+        return due or frozenset((POLL_TIER_FAST,))
+
+    async def async_request_refresh(self):
+        """Request a refresh of all tiers, e.g. after a write."""
+        self._refresh_all_tiers = True
+        await super().async_request_refresh()
+
+    async def _read_blocks(self, blocks):
+        """Read all blocks, one after another or pipelined on the same connection.
+
+        Exceptions are returned per block instead of raised, so the caller
+        decides which failures are fatal for the poll.
+        """
+        if self.pipelined:
+            return await asyncio.gather(
+                *(self._read_block_limited(block) for block in blocks),
+                return_exceptions=True,
+            )
+
+        responses = []
+        for block in blocks:
+            try:
+                responses.append(await self._read_block(block))
+            except Exception as err:
+                responses.append(err)
+                # Verbindung verloren: restliche Blöcke nicht anfragen, sie zählen als fehlgeschlagen
+                if not self.connection.connected:
+                    break
+        return responses
+
+    async def _read_block(self, block):
+        """Issue the Modbus read request for one block."""
+        method = READ_METHODS[block.function]
+        request = getattr(self.client, method)(address=block.start, count=block.count)
+        if self.recorder is not None:
+            request = self.recorder.async_exchange(request, method, address=block.start, count=block.count)
+        started = time.monotonic()
+        try:
+            response = await request
+        except Exception as err:
+            self.link_metrics.record_exception(block, err)
+            raise
+        self.link_metrics.record_response(block, time.monotonic() - started, response)
+        return response
+
+    async def _read_block_limited(self, block):
+        """Read one block pipelined while respecting the in-flight limit."""
+        async with self.connection.request_slots:
+            # Gemessen ab Versand, die Wartezeit auf einen freien Slot zählt nicht
+            method = READ_METHODS[block.function]
+            request = async_read_pipelined(self.client, method, block.start, block.count)
+            if self.recorder is not None:
+                request = self.recorder.async_exchange(request, method, address=block.start, count=block.count)
+            started = time.monotonic()
+            try:
+                response = await request
+            except Exception as err:
+                self.link_metrics.record_exception(block, err)
+                raise
+        self.link_metrics.record_response(block, time.monotonic() - started, response)
+        return response
 
     def _generate_demo_data(self):
         """Generiere Demo-Daten für alle Sensoren."""
@@ -416,8 +869,7 @@ class DaikinAlthermaCoordinator(DataUpdateCoordinator):
             }
             
             # Simuliere last_triggered für bestimmte Adressen (dynamisch aus CALCULATED_SENSORS)
-            last_run_addresses = _get_last_run_trigger_addresses()
-            if address in last_run_addresses and raw_value == 1:
+            if address in TRIGGER_ADDRESSES and raw_value == 1:
                 # Zufälliger Zeitstempel in den letzten 24 Stunden
                 hours_ago = random.uniform(0, 24)
                 trigger_time = dt_util.now() - timedelta(hours=hours_ago)
@@ -446,6 +898,14 @@ class DaikinAlthermaCoordinator(DataUpdateCoordinator):
                 trigger_time = dt_util.now() - timedelta(hours=hours_ago)
                 self.last_triggered[address] = trigger_time
                 data[f"last_triggered_{address}"] = trigger_time
-        
-        self.previous_data = data.copy()
-        return data
+
+        # Demo-Werte in einen Snapshot übernehmen, Endwerte wie beim Dekodieren echter Register
+        snapshot = RegisterSnapshot()
+        for key, entry in data.items():
+            snapshot[key] = entry
+        if self.external_power is not None:
+            snapshot[EXTERNAL_ELECTRIC_POWER_KEY] = self.external_power.value
+        CALCULATIONS.update(snapshot)
+        self.energy.update(time.monotonic(), snapshot)
+        self.previous_data = self.data
+        return snapshot
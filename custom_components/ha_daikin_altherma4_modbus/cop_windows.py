@@ -0,0 +1,206 @@
+"""Rolling and seasonal COP from the energy counters.
+
+Every integrated poll interval adds its heat and electric energy to the
+windows of ``COP_WINDOWS``. A rolling window is a ring buffer of bucket
+sums (e.g. 96 buckets of 15 minutes for 24 h) plus the running sum of all
+buckets: adding energy touches one bucket, and a bucket that falls out of
+the window is subtracted when the ring moves past it. Updates are O(1) per
+poll, without scanning any history. The season window is a plain sum that
+starts over on the first day of ``COP_SEASON_START_MONTH``.
+
+Buckets are numbered by wall-clock time, so the buffers persisted with the
+energy counters still line up after a restart. Only heating and DHW
+intervals with the compressor running and without defrost are counted.
+"""
+from array import array
+
+from .const import (
+    DISCRETE_INPUT_SENSORS,
+    COP_WINDOWS,
+    COP_COMPRESSOR_ADDRESS,
+    COP_DEFROST_ADDRESS,
+    COP_SEASON_START_MONTH,
+    COP_MIN_ELECTRIC_ENERGY,
+    ENERGY_MODE_COOLING,
+)
+
+_DISCRETE_KEYS = {item["address"]: item["unique_id"] for item in DISCRETE_INPUT_SENSORS if "unique_id" in item}
+COMPRESSOR_KEY = _DISCRETE_KEYS[COP_COMPRESSOR_ADDRESS]
+DEFROST_KEY = _DISCRETE_KEYS[COP_DEFROST_ADDRESS]
+
+
+def _on(data, key):
+    entry = data.get(key)
+    return entry is not None and entry["value"] == 1
+
+
+def cop_active(data):
+    """Return True while the compressor runs and no defrost is active."""
+    return _on(data, COMPRESSOR_KEY) and not _on(data, DEFROST_KEY)
+
+
+def _cop(heat, electric):
+    if electric < COP_MIN_ELECTRIC_ENERGY:
+        return None
+    return round(heat / electric, 2)
+
+
+def season_of(now):
+    """Return the year in which the season containing the local datetime started."""
+    return now.year if now.month >= COP_SEASON_START_MONTH else now.year - 1
+
+
+class RollingWindow:
+    """Heat and electric energy of the last ``buckets * bucket_seconds`` seconds."""
+
+    __slots__ = ("bucket_seconds", "_heat", "_electric", "_newest", "heat", "electric")
+
+    def __init__(self, bucket_seconds, buckets):
+        self.bucket_seconds = bucket_seconds
+        self._heat = array("d", bytes(8 * buckets))
+        self._electric = array("d", bytes(8 * buckets))
+        # Laufende Nummer des jüngsten Buckets (Unix-Zeit // bucket_seconds)
+        self._newest = None
+        self.heat = 0.0
+        self.electric = 0.0
+
+    def advance(self, now):
+        """Move the ring to the bucket of a datetime, dropping buckets that left the window."""
+        bucket = int(now.timestamp() // self.bucket_seconds)
+        if self._newest is None or bucket - self._newest >= len(self._heat):
+            for buffer in (self._heat, self._electric):
+                buffer[:] = array("d", bytes(8 * len(buffer)))
+            self.heat = self.electric = 0.0
+        elif bucket > self._newest:
+            size = len(self._heat)
+            for number in range(self._newest + 1, bucket + 1):
+                index = number % size
+                self.heat -= self._heat[index]
+                self.electric -= self._electric[index]
+                self._heat[index] = 0.0
+                self._electric[index] = 0.0
+            # Rundungsfehler der laufenden Summen nicht anwachsen lassen
+            self.heat = max(self.heat, 0.0)
+            self.electric = max(self.electric, 0.0)
+        elif bucket < self._newest:
+            # Uhr zurückgestellt: im jüngsten Bucket weiterzählen
+            return
+        self._newest = bucket
+
+    def add(self, heat, electric):
+        """Add energy to the newest bucket."""
+        index = self._newest % len(self._heat)
+        self._heat[index] += heat
+        self._electric[index] += electric
+        self.heat += heat
+        self.electric += electric
+
+    @property
+    def cop(self):
+        """Return heat / electric energy of the window, None below the minimum electric energy."""
+        return _cop(self.heat, self.electric)
+
+    def as_dict(self):
+        return {"newest": self._newest, "heat": list(self._heat), "electric": list(self._electric)}
+
+    def load(self, stored):
+        """Restore the buffers, ignored if the window size changed."""
+        heat = stored.get("heat")
+        electric = stored.get("electric")
+        if stored.get("newest") is None or not heat or len(heat) != len(self._heat) or len(electric) != len(heat):
+            return
+        self._heat = array("d", heat)
+        self._electric = array("d", electric)
+        self._newest = stored["newest"]
+        self.heat = sum(self._heat)
+        self.electric = sum(self._electric)
+
+
+class SeasonWindow:
+    """Heat and electric energy since the start of the current season."""
+
+    __slots__ = ("season", "heat", "electric")
+
+    def __init__(self):
+        self.season = None
+        self.heat = 0.0
+        self.electric = 0.0
+
+    def advance(self, now):
+        """Start over when a new season began."""
+        season = season_of(now)
+        if season != self.season:
+            self.season = season
+            self.heat = self.electric = 0.0
+
+    def add(self, heat, electric):
+        self.heat += heat
+        self.electric += electric
+
+    @property
+    def cop(self):
+        """Return the seasonal COP, None below the minimum electric energy."""
+        return _cop(self.heat, self.electric)
+
+    def as_dict(self):
+        return {"season": self.season, "heat": self.heat, "electric": self.electric}
+
+    def load(self, stored):
+        if stored.get("season") is None:
+            return
+        self.season = stored["season"]
+        self.heat = float(stored.get("heat", 0.0))
+        self.electric = float(stored.get("electric", 0.0))
+
+
+class CopWindows:
+    """All COP windows of ``COP_WINDOWS``, keyed by unique_id."""
+
+    def __init__(self):
+        self.windows = {
+            window["unique_id"]: (
+                RollingWindow(window["bucket_seconds"], window["buckets"]) if "buckets" in window else SeasonWindow()
+            )
+            for window in COP_WINDOWS
+        }
+        # {unique_id: (COP, heat kWh, electric kWh)}, einmal pro Energie-Update berechnet
+        self.current = self._compute()
+
+    def update(self, now, interval):
+        """Move the windows to a local datetime and add one energy interval.
+
+        ``interval`` is (mode, heat kWh, electric kWh) of an interval that
+        counts for the COP, None otherwise. Returns the unique_ids whose
+        COP or rounded energies changed.
+        """
+        before = self.current
+        for window in self.windows.values():
+            window.advance(now)
+        if interval is not None:
+            mode, heat, electric = interval
+            if mode != ENERGY_MODE_COOLING:
+                for window in self.windows.values():
+                    window.add(heat, electric)
+        after = self.current = self._compute()
+        return {unique_id for unique_id, value in after.items() if value != before[unique_id]}
+
+    def values(self):
+        """Return {unique_id: (COP, heat kWh, electric kWh)} as of the last update."""
+        return self.current
+
+    def _compute(self):
+        """Compute {unique_id: (COP, heat kWh, electric kWh)}, energies rounded to 10 Wh."""
+        return {
+            unique_id: (window.cop, round(window.heat, 2), round(window.electric, 2))
+            for unique_id, window in self.windows.items()
+        }
+
+    def as_dict(self):
+        return {unique_id: window.as_dict() for unique_id, window in self.windows.items()}
+
+    def load(self, stored):
+        """Restore the windows from ``as_dict()``, ignoring unknown windows."""
+        for unique_id, window in self.windows.items():
+            if isinstance(stored.get(unique_id), dict):
+                window.load(stored[unique_id])
+        self.current = self._compute()
@@ -0,0 +1,103 @@
+"""Diagnostics support for Daikin Altherma 4 Modbus."""
+import time
+from collections.abc import Mapping
+
+from homeassistant.components.diagnostics import REDACTED, async_redact_data
+
+from .const import DOMAIN
+from .read_plan import READ_PLAN
+
+# Adresse des Adapters und Dateipfade (enthalten den Konfigurationsordner)
+TO_REDACT = {"host", "traffic_log", "replay_log", "path"}
+
+
+def _block_name(block):
+    return f"{block.function} {block.start}-{block.end}"
+
+
+def _read_plan(read_plan):
+    """Return the compiled read plan as plain data."""
+    return [
+        {
+            "function": block.function,
+            "start": block.start,
+            "count": block.count,
+            "slots": [
+                {"unique_id": slot.unique_id, "address": slot.address, "offset": slot.offset, "count": slot.count}
+                for slot in block.slots
+            ],
+        }
+        for block in read_plan.blocks
+    ]
+
+
+def _block_ages(last_success):
+    """Return the seconds since the last successful read per block."""
+    now = time.monotonic()
+    return {
+        f"{function} {start}-{start + count - 1}": round(now - read_at, 1)
+        for (function, start, count), read_at in last_success.items()
+    }
+
+
+def _redact_host(data, host):
+    """Replace the adapter address in every string, e.g. in pymodbus error texts."""
+    if isinstance(data, str):
+        return data.replace(host, REDACTED)
+    if isinstance(data, Mapping):
+        return {key: _redact_host(value, host) for key, value in data.items()}
+    if isinstance(data, list):
+        return [_redact_host(value, host) for value in data]
+    return data
+
+
+def _snapshot(data):
+    """Return the decoded snapshot as {key: {"value", "native_value"}}, extras as they are."""
+    if not data:
+        return None
+    return {
+        key: {"value": entry["value"], "native_value": entry["native_value"]} if isinstance(entry, Mapping) else entry
+        for key, entry in data.items()
+    }
+
+
+async def async_get_config_entry_diagnostics(hass, entry):
+    """Return diagnostics for a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    diagnostics = {
+        "entry": {
+            "data": dict(entry.data),
+            "options": dict(entry.options),
+        },
+        "coordinator": {
+            "demo_mode": coordinator.demo_mode,
+            "pipelined_reads": coordinator.pipelined,
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": coordinator.update_interval.total_seconds() if coordinator.update_interval else None,
+            "tier_intervals": dict(coordinator.tier_intervals),
+            "cached_at": coordinator.cached_at,
+            "max_value_age": coordinator.max_value_age,
+            "expired_keys": sorted(coordinator.expired_keys),
+        },
+        "connection": coordinator.connection.metrics,
+        "link_metrics": coordinator.link_metrics.as_dict(),
+        "energy_kwh": coordinator.energy.as_dict(),
+        "cop_windows": {
+            unique_id: {"cop": cop, "heat_kwh": heat, "electric_kwh": electric}
+            for unique_id, (cop, heat, electric) in coordinator.cop_windows.values().items()
+        },
+        "recent_timings_ms": coordinator.link_metrics.recent_timings(),
+        "read_plan": _read_plan(READ_PLAN),
+        "last_poll_blocks": [_block_name(block) for block in coordinator.read_plan.blocks],
+        "block_ages": _block_ages(coordinator.block_last_success),
+        # Bits werden von pymodbus auf volle Bytes aufgefüllt
+        "raw_blocks": {
+            f"{function} {start}-{start + count - 1}": [int(value) for value in values[:count]]
+            for (function, start, count), values in coordinator.raw_blocks.items()
+        },
+        "snapshot": _snapshot(coordinator.data),
+    }
+    diagnostics = async_redact_data(diagnostics, TO_REDACT)
+    host = entry.data.get("host")
+    return _redact_host(diagnostics, host) if host else diagnostics
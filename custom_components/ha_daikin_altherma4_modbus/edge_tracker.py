@@ -0,0 +1,90 @@
+"""Rising-edge tracking for the last-triggered sensors.
+
+The tracked states of one register class (running/problem states in the
+input registers, discrete inputs used by ``last_triggered`` sensors) are
+packed into one integer per poll, one bit per state. Rising edges of a
+whole class are then found with a single ``new & ~old``, and only the set
+bits of the result are resolved to addresses and timestamps.
+"""
+from homeassistant.util import dt as dt_util
+
+from .const import BINARY_SENSORS, DISCRETE_INPUT_SENSORS, CALCULATED_SENSORS
+from .read_plan import SLOT_INDEX
+
+EDGE_GROUP_BINARY = "binary"
+EDGE_GROUP_DISCRETE = "discrete"
+
+# Adressen der Discrete Inputs, die ein "last_triggered" Sensor auswertet
+TRIGGER_ADDRESSES = frozenset(
+    sensor["trigger_address"]
+    for sensor in CALCULATED_SENSORS
+    if sensor.get("type") == "last_triggered" and "trigger_address" in sensor
+)
+
+
+class EdgeGroup:
+    """Packed on/off states of one register class."""
+
+    __slots__ = ("name", "unique_ids", "indexes", "on_values", "addresses", "state")
+
+    def __init__(self, name, states):
+        """``states`` is a list of (unique_id, address, value that means on)."""
+        states = [state for state in states if state[0] in SLOT_INDEX]
+        self.name = name
+        self.unique_ids = tuple(unique_id for unique_id, _, _ in states)
+        self.indexes = tuple(SLOT_INDEX[unique_id] for unique_id in self.unique_ids)
+        self.addresses = tuple(address for _, address, _ in states)
+        self.on_values = tuple(on_value for _, _, on_value in states)
+        self.state = 0
+
+    def feed(self, bits):
+        """Store new packed states and return the addresses that turned on."""
+        rising = bits & ~self.state
+        self.state = bits
+        addresses = []
+        while rising:
+            lowest = rising & -rising
+            addresses.append(self.addresses[lowest.bit_length() - 1])
+            rising ^= lowest
+        return addresses
+
+
+def _build_groups():
+    binary_states = []
+    for binary in BINARY_SENSORS:
+        device_class = binary.get("device_class")
+        # Laufmeldungen sind bei 0 aktiv, Störungen bei 1
+        if device_class == "running":
+            on_value = 0
+        elif device_class == "problem":
+            on_value = 1
+        else:
+            continue
+        binary_states.append((binary.get("unique_id", f"binary_{binary['address']}"), binary["address"], on_value))
+
+    discrete_states = [
+        (discrete.get("unique_id", f"discrete_{discrete['address']}"), discrete["address"], 1)
+        for discrete in DISCRETE_INPUT_SENSORS
+        if discrete["address"] in TRIGGER_ADDRESSES
+    ]
+    return {
+        EDGE_GROUP_BINARY: EdgeGroup(EDGE_GROUP_BINARY, binary_states),
+        EDGE_GROUP_DISCRETE: EdgeGroup(EDGE_GROUP_DISCRETE, discrete_states),
+    }
+
+
+class EdgeTracker:
+    """Find rising edges of all tracked states in a register snapshot."""
+
+    def __init__(self):
+        self.groups = _build_groups()
+
+    def update(self, snapshot, when=None):
+        """Pack the states of a snapshot and return {address: timestamp} of rising edges."""
+        triggered = {}
+        for group in self.groups.values():
+            for address in group.feed(snapshot.pack_bits(group.indexes, group.on_values)):
+                if when is None:
+                    when = dt_util.now()
+                triggered[address] = when
+        return triggered
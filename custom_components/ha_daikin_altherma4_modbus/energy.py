@@ -0,0 +1,132 @@
+"""Heat and electric energy counters integrated at every poll.
+
+The calculated heat power and the electric power (input register 51 or the
+external power sensor) are integrated with the trapezoidal rule between
+two polls, on monotonic timestamps so clock changes do not create or lose
+energy. Each interval is booked on the operating mode at its start: DHW
+while the 3-way valve (input 37) is on the tank, cooling while the
+operation mode (input 38) is cooling, space heating otherwise. Heat is only
+counted in the direction of the mode (heat flow while heating, heat removal
+while cooling), so the counters never decrease.
+
+The counters are kept per (kind, mode) in kWh; the energy sensors add up
+the modes they are declared with in ``ENERGY_SENSORS``.
+"""
+from .const import (
+    DOMAIN,
+    ENERGY_SENSORS,
+    ENERGY_MAX_GAP,
+    ENERGY_KIND_HEAT,
+    ENERGY_KIND_ELECTRIC,
+    ENERGY_MODE_HEATING,
+    ENERGY_MODE_DHW,
+    ENERGY_MODE_COOLING,
+)
+from .calculated import CALCULATIONS
+
+HEAT_POWER_KEY = f"{DOMAIN}_heat_pump_power_calc"
+ELECTRIC_POWER_KEY = f"{DOMAIN}_electric_power"
+VALVE_KEY = f"{DOMAIN}_input_37"
+OPERATION_MODE_KEY = f"{DOMAIN}_input_38"
+VALVE_DHW = 1
+OPERATION_MODE_COOLING = 2
+
+# Register, ohne die nicht integriert wird, solange ihr Lesen fehlschlägt
+ENERGY_INPUT_KEYS = CALCULATIONS.register_keys[HEAT_POWER_KEY] | {VALVE_KEY, OPERATION_MODE_KEY}
+# Register der elektrischen Leistung; zählen nur, solange kein externer Sensor sie liefert
+ELECTRIC_INPUT_KEYS = CALCULATIONS.register_keys[ELECTRIC_POWER_KEY]
+
+COUNTERS = tuple(
+    (kind, mode)
+    for kind in (ENERGY_KIND_HEAT, ENERGY_KIND_ELECTRIC)
+    for mode in (ENERGY_MODE_HEATING, ENERGY_MODE_DHW, ENERGY_MODE_COOLING)
+)
+
+
+def _raw(data, key):
+    entry = data.get(key)
+    return entry["value"] if entry is not None else None
+
+
+def operating_mode(data):
+    """Return the energy mode of a snapshot: DHW, cooling or space heating."""
+    if _raw(data, VALVE_KEY) == VALVE_DHW:
+        return ENERGY_MODE_DHW
+    if _raw(data, OPERATION_MODE_KEY) == OPERATION_MODE_COOLING:
+        return ENERGY_MODE_COOLING
+    return ENERGY_MODE_HEATING
+
+
+class EnergyAccumulator:
+    """Trapezoidal integration of heat and electric power per operating mode."""
+
+    def __init__(self):
+        # (kind, mode) -> kWh
+        self.counters = dict.fromkeys(COUNTERS, 0.0)
+        # (monotonic time, mode, heat W, electric W) des letzten Polls
+        self._last = None
+        # (mode, heat kWh, electric kWh) des zuletzt integrierten Intervalls, z.B. für die Leistungszahl
+        self.last_interval = None
+        # {unique_id: kWh} der Energiesensoren, einmal pro Poll berechnet
+        self.totals = self._sum_counters()
+
+    def update(self, timestamp, data):
+        """Integrate up to a new snapshot, return the unique_ids of the sensors that changed.
+
+        ``data`` None or missing power values end the current segment; the
+        next poll starts a new one instead of bridging the gap.
+        """
+        self.last_interval = None
+        heat_power = data.get(HEAT_POWER_KEY) if data is not None else None
+        electric_power = data.get(ELECTRIC_POWER_KEY) if data is not None else None
+        if heat_power is None or electric_power is None:
+            self._last = None
+            return set()
+        sample = (timestamp, operating_mode(data), heat_power, electric_power)
+        last, self._last = self._last, sample
+        if last is None:
+            return set()
+        started, mode, last_heat, last_electric = last
+        hours = (timestamp - started) / 3600
+        if hours <= 0 or hours * 3600 > ENERGY_MAX_GAP:
+            return set()
+
+        before = self.totals
+        # Wärme nur in Richtung der Betriebsart, Abtauen oder Umschalten zählen nicht negativ
+        direction = -1 if mode == ENERGY_MODE_COOLING else 1
+        heat = (max(direction * last_heat, 0) + max(direction * heat_power, 0)) / 2 * hours / 1000
+        electric = (max(last_electric, 0) + max(electric_power, 0)) / 2 * hours / 1000
+        self.counters[ENERGY_KIND_HEAT, mode] += heat
+        self.counters[ENERGY_KIND_ELECTRIC, mode] += electric
+        self.last_interval = (mode, heat, electric)
+        after = self.totals = self._sum_counters()
+        return {unique_id for unique_id, value in after.items() if value != before[unique_id]}
+
+    def reset_segment(self):
+        """Do not integrate across the next interval, e.g. after a failed poll."""
+        self._last = None
+
+    def value(self, unique_id):
+        """Return the energy of one sensor in kWh, rounded to Wh."""
+        return self.totals[unique_id]
+
+    def _sum_counters(self):
+        """Return {unique_id: kWh} of all energy sensors."""
+        return {
+            sensor["unique_id"]: round(
+                sum(self.counters[sensor["kind"], mode] for mode in sensor["modes"]), 3
+            )
+            for sensor in ENERGY_SENSORS
+        }
+
+    def as_dict(self):
+        """Return the counters in storage format."""
+        return {f"{kind}_{mode}": energy for (kind, mode), energy in self.counters.items()}
+
+    def load(self, stored):
+        """Restore counters from ``as_dict()``, ignoring unknown keys."""
+        for kind, mode in COUNTERS:
+            energy = stored.get(f"{kind}_{mode}")
+            if isinstance(energy, (int, float)):
+                self.counters[kind, mode] = float(energy)
+        self.totals = self._sum_counters()
@@ -0,0 +1,89 @@
+"""Samples of the external electric power sensor, fed by state change events.
+
+Instead of looking up and parsing the state of the configured power sensor
+on every property access, the coordinator subscribes once to its state
+changes and keeps the last reports with their (monotonic) arrival time. A
+poll takes the sample that was valid when its read requests were sent, so
+the CoP pairs the heat power with the electric power of the same moment and
+not with a report that arrived while the poll was waiting for the adapter.
+Reports that repeat the last value (e.g. attribute-only changes) are
+ignored.
+"""
+import logging
+import time
+from collections import deque
+
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .const import EXTERNAL_POWER_SAMPLES
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _parse_power(state):
+    """Return the state as float in W, None if unknown, unavailable or not a number."""
+    if state is None or state.state in ("unknown", "unavailable"):
+        return None
+    try:
+        return float(state.state)
+    except ValueError:
+        _LOGGER.debug(f"Externer Leistungssensor {state.entity_id}: {state.state} ist keine Zahl")
+        return None
+
+
+class ExternalPowerTracker:
+    """Last reports of the external power sensor as (monotonic time, W or None)."""
+
+    def __init__(self, hass, entity_id, on_report=None):
+        self.hass = hass
+        self.entity_id = entity_id
+        self._on_report = on_report
+        self._samples = deque(maxlen=EXTERNAL_POWER_SAMPLES)
+        self._unsub = None
+        # Zustand beim Start, falls der Sensor schon existiert
+        self._add(_parse_power(hass.states.get(entity_id)))
+
+    @property
+    def value(self):
+        """Return the latest reported power, None if unavailable."""
+        return self._samples[-1][1] if self._samples else None
+
+    @property
+    def updated_at(self):
+        """Return the monotonic time of the latest report, None before the first one."""
+        return self._samples[-1][0] if self._samples else None
+
+    def value_at(self, timestamp):
+        """Return the power reported last before the given monotonic time."""
+        for sampled_at, value in reversed(self._samples):
+            if sampled_at <= timestamp:
+                return value
+        # Alle Meldungen jünger: die älteste bekannte gilt auch davor
+        return self._samples[0][1] if self._samples else None
+
+    def _add(self, value):
+        self._samples.append((time.monotonic(), value))
+
+    @callback
+    def async_start(self):
+        """Subscribe to the state changes of the power sensor."""
+        if self._unsub is None:
+            self._unsub = async_track_state_change_event(self.hass, [self.entity_id], self._async_state_changed)
+
+    @callback
+    def async_stop(self):
+        """Unsubscribe from the power sensor."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def _async_state_changed(self, event):
+        value = _parse_power(event.data.get("new_state"))
+        if self._samples and self._samples[-1][1] == value:
+            # Nur Attribute geändert oder derselbe Wert erneut gemeldet
+            return
+        self._add(value)
+        if self._on_report is not None:
+            self._on_report(value)
@@ -0,0 +1,171 @@
+"""Latency and error metrics of the Modbus link.
+
+Every read request records its round-trip time into a fixed-size ring
+buffer per function code and per block, so recording is O(1) and needs
+no allocation. Percentiles are only computed when a sensor or the
+diagnostics read them, and cached until the next sample arrives. After a
+poll the coordinator only notifies the link sensors whose shown values
+(rounded p50, p95, max and the counters) changed.
+"""
+import asyncio
+from array import array
+
+from pymodbus.exceptions import ModbusIOException
+
+from .const import LINK_METRICS_WINDOW, LINK_SENSORS
+
+
+class LatencyWindow:
+    """Ring buffer of the last round-trip times in seconds."""
+
+    __slots__ = ("_samples", "_position", "_count", "_summary")
+
+    def __init__(self, size=LINK_METRICS_WINDOW):
+        self._samples = array("d", bytes(8 * size))
+        self._position = 0
+        self._count = 0
+        self._summary = None
+
+    def record(self, seconds):
+        """Add one sample, overwriting the oldest one when full."""
+        self._samples[self._position] = seconds
+        self._position = (self._position + 1) % len(self._samples)
+        if self._count < len(self._samples):
+            self._count += 1
+        self._summary = None
+
+    def recent(self):
+        """Return the samples oldest first, in milliseconds."""
+        if self._count < len(self._samples):
+            samples = self._samples[: self._count]
+        else:
+            samples = self._samples[self._position :] + self._samples[: self._position]
+        return [round(seconds * 1000, 1) for seconds in samples]
+
+    def summary(self):
+        """Return p50, p95 and max in milliseconds, None without samples."""
+        if self._summary is None and self._count:
+            samples = sorted(self._samples[: self._count])
+            last = len(samples) - 1
+            self._summary = {
+                "p50": round(samples[last // 2] * 1000, 1),
+                "p95": round(samples[min(last, int(len(samples) * 0.95))] * 1000, 1),
+                "max": round(samples[-1] * 1000, 1),
+                "samples": len(samples),
+            }
+        return self._summary
+
+
+def _shown(summary):
+    """Return the part of a latency summary a sensor shows."""
+    return (summary["p50"], summary["p95"], summary["max"]) if summary else None
+
+
+class LinkMetrics:
+    """Request latencies, error, timeout and poll overrun counters of one coordinator."""
+
+    def __init__(self, connection=None):
+        self.connection = connection
+        self.functions = {}
+        # (function, start, count) -> LatencyWindow
+        self.blocks = {}
+        self.poll_duration = LatencyWindow()
+        self.requests = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.polls = 0
+        self.poll_overruns = 0
+        # unique_id -> zuletzt gemeldeter Wert der Link-Sensoren
+        self._published = {}
+
+    @property
+    def reconnects(self):
+        """Reconnects of the (shared) connection."""
+        return self.connection.reconnect_count if self.connection else 0
+
+    def _windows(self, block):
+        key = (block.function, block.start, block.count)
+        window = self.blocks.get(key)
+        if window is None:
+            window = self.blocks[key] = LatencyWindow()
+            self.functions.setdefault(block.function, LatencyWindow())
+        return self.functions[block.function], window
+
+    def record_response(self, block, seconds, response):
+        """Record the round trip of an answered request."""
+        self.requests += 1
+        function_window, block_window = self._windows(block)
+        function_window.record(seconds)
+        block_window.record(seconds)
+        if response.isError():
+            self.errors += 1
+
+    def record_exception(self, block, err):
+        """Record a request that failed without a response."""
+        self.requests += 1
+        if isinstance(err, (asyncio.TimeoutError, ModbusIOException)):
+            self.timeouts += 1
+        else:
+            self.errors += 1
+
+    def record_poll(self, seconds, interval):
+        """Record the duration of a poll and count it as overrun if it took longer than the interval."""
+        self.polls += 1
+        self.poll_duration.record(seconds)
+        if interval and seconds > interval:
+            self.poll_overruns += 1
+
+    def latency(self, function):
+        """Return the latency summary of a function code, None without samples."""
+        window = self.functions.get(function)
+        return window.summary() if window else None
+
+    def block_latencies(self, function):
+        """Return the latency summaries of all blocks of a function code."""
+        return {
+            f"{start}-{start + count - 1}": window.summary()
+            for (block_function, start, count), window in self.blocks.items()
+            if block_function == function
+        }
+
+    def published(self, link):
+        """Return what the sensor of a ``LINK_SENSORS`` entry shows, for change detection."""
+        if link["type"] == "counter":
+            return getattr(self, link["metric"])
+        if link["type"] == "poll_duration":
+            return _shown(self.poll_duration.summary())
+        function = link["function"]
+        blocks = {name: _shown(summary) for name, summary in self.block_latencies(function).items()}
+        return _shown(self.latency(function)), blocks
+
+    def changed_keys(self):
+        """Return the unique_ids of the link sensors whose shown values changed since the last call."""
+        published = {link["unique_id"]: self.published(link) for link in LINK_SENSORS}
+        changed = {
+            unique_id
+            for unique_id, value in published.items()
+            if unique_id not in self._published or self._published[unique_id] != value
+        }
+        self._published = published
+        return changed
+
+    def as_dict(self):
+        """All metrics for diagnostics."""
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "reconnects": self.reconnects,
+            "polls": self.polls,
+            "poll_overruns": self.poll_overruns,
+            "poll_duration": self.poll_duration.summary(),
+            "functions": {function: window.summary() for function, window in self.functions.items()},
+            "blocks": {function: self.block_latencies(function) for function in self.functions},
+        }
+
+    def recent_timings(self):
+        """Return the recent round-trip times per block in milliseconds, oldest first."""
+        return {
+            f"{function} {start}-{start + count - 1}": window.recent()
+            for (function, start, count), window in self.blocks.items()
+        }
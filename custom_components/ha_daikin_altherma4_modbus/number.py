@@ -36,7 +36,7 @@ class DaikinNumber(CoordinatorEntity, NumberEntity):
     _attr_has_entity_name = True
     
     def __init__(self, coordinator, entry, name, address, min_v, max_v, step, unit, scale, unique_id=None, enum_map=None, entity_category=None, translation_key=None):
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=frozenset((unique_id,)))
 
         self._entry = entry
         self._address = address
@@ -54,24 +54,18 @@ class DaikinNumber(CoordinatorEntity, NumberEntity):
         self._enum_map = enum_map
         self._scale = scale
 
+    @property
+    def available(self):
+        """Unavailable once a register failed to read for longer than the max value age."""
+        return super().available and self.coordinator.keys_available(self.coordinator_context)
+
     @property
     def native_value(self):
         data = self.coordinator.data.get(self._attr_unique_id)
         if data is None:
             return None
-        val = data.get("value")
-        if val is None:
-            return None
-        
-        # Wenn enum_map vorhanden, den enum-Wert zurückgeben
-        if self._enum_map and val in self._enum_map:
-            return val  # Rohwert für enum
-        
-        # Handle signed 16-bit integers
-        if val > 32767:  # If value is negative (2's complement)
-            val = val - 65536
-            
-        return val * self._scale
+        # Enum-Rohwert bzw. vorzeichenrichtig skalierter Wert, siehe read_plan.native_value()
+        return data.get("native_value")
 
     @property
     def mode(self):
@@ -87,5 +81,4 @@ class DaikinNumber(CoordinatorEntity, NumberEntity):
         if raw < 0:
             raw = 65536 + raw  # Convert negative to 2's complement
             
-        await self.coordinator.client.write_register(self._address, raw)
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_write_register(self._address, raw)
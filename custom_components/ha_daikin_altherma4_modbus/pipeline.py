@@ -0,0 +1,74 @@
+"""Pipelined Modbus TCP reads on a single pymodbus connection.
+
+pymodbus serializes ``execute`` with a per-client lock, so awaiting several
+reads with ``asyncio.gather`` still costs one round trip each. Modbus TCP
+matches responses to requests by transaction id, so several requests can
+safely be outstanding on one connection. This module sends the request
+PDUs directly and lets the client's transaction manager route the replies.
+
+These are client internals of the pymodbus 3.5/3.6 line (the range pinned
+in the manifest). If a client lacks them, the reads fall back to the
+sequential ``execute`` path with a warning.
+"""
+import asyncio
+import logging
+
+from pymodbus.client.mixin import ModbusClientMixin
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _RequestFactory(ModbusClientMixin):
+    """Build pymodbus request PDUs without executing them."""
+
+    def execute(self, *args):
+        # pymodbus >= 3.7 ruft execute(no_response_expected, pdu) auf, ältere execute(pdu)
+        return args[-1]
+
+
+_REQUESTS = _RequestFactory()
+
+
+_warned_fallback = False
+
+
+def supports_pipelining(client):
+    """Return True if the client exposes the transaction internals we need."""
+    return (
+        all(hasattr(client, attr) for attr in ("transaction", "framer", "build_response", "send", "comm_params"))
+        and hasattr(client.transaction, "getNextTID")
+        and hasattr(client.transaction, "getTransaction")
+        and hasattr(client.framer, "buildPacket")
+    )
+
+
+def request_timeout(client):
+    """Return the timeout the client waits for a response to its own requests."""
+    comm_params = client.comm_params
+    # Bis pymodbus 3.6 liegt der Parameter ``timeout`` des Clients in timeout_connect
+    # und gilt dort für Verbindungsaufbau und Antworten
+    timeout = getattr(comm_params, "timeout_request", None)
+    return timeout if timeout is not None else comm_params.timeout_connect
+
+
+async def async_read_pipelined(client, method, address, count):
+    """Send one read request without waiting for other requests in flight."""
+    global _warned_fallback
+    if not supports_pipelining(client):
+        # Stellvertreter wie der Replay-Client lesen bewusst nacheinander
+        if not _warned_fallback and isinstance(client, ModbusClientMixin):
+            _LOGGER.warning("Diese pymodbus-Version unterstützt kein Pipelining, Blöcke werden nacheinander gelesen")
+            _warned_fallback = True
+        return await getattr(client, method)(address=address, count=count)
+
+    request = getattr(_REQUESTS, method)(address=address, count=count)
+    request.transaction_id = client.transaction.getNextTID()
+    packet = client.framer.buildPacket(request)
+    response = client.build_response(request.transaction_id)
+    client.send(packet)
+    try:
+        return await asyncio.wait_for(response, timeout=request_timeout(client))
+    except asyncio.TimeoutError:
+        # Offene Transaktion verwerfen, damit keine späte Antwort zugeordnet wird
+        client.transaction.getTransaction(request.transaction_id)
+        raise
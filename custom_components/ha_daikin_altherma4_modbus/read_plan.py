@@ -0,0 +1,515 @@
+"""Compiled read plan for the Daikin Altherma 4 register tables.
+
+The register tables in const.py are plain lists of dicts. Walking them on
+every poll costs dict lookups, ``.get()`` defaults and list concatenation
+for every entry. This module compiles them once at import time into
+read blocks (one per function code) with precomputed slot offsets and
+decoder callables, so a poll cycle only issues the reads and runs a tight
+decode loop.
+
+Decoding works column-wise per block: the response registers are turned
+into one unsigned and (if needed) one signed ``array`` in a single pass,
+the slot offsets are picked with a precompiled ``itemgetter`` and sign,
+enum mapping, scale and rounding are applied only to the columns that
+need them. Entities read the final ``native_value`` from the snapshot
+instead of converting the raw value on every state read.
+
+Every unique_id of the full plan gets a fixed slot index (``SLOT_INDEX``),
+so decoded columns are stored straight into the preallocated buffers of a
+``snapshot.RegisterSnapshot`` without building per-register dicts.
+"""
+import logging
+from array import array
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from itertools import combinations
+from operator import itemgetter
+from typing import Callable
+
+from .const import (
+    DOMAIN,
+    MODBUS_MAX_READ_REGISTERS,
+    MODBUS_MAX_READ_BITS,
+    DEFAULT_MAX_REGISTER_GAP,
+    DEFAULT_MAX_BIT_GAP,
+    POLL_TIERS,
+    POLL_TIER_NORMAL,
+    INPUT_REGISTERS,
+    HOLDING_REGISTERS,
+    SELECT_REGISTERS,
+    DISCRETE_INPUT_SENSORS,
+    COIL_SENSORS,
+    BINARY_SENSORS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Wert für "nicht unterstützt / kein Fehler" – solche Register werden übersprungen
+UNSUPPORTED_VALUE = 32766
+
+FUNCTION_INPUT = "input"
+FUNCTION_DISCRETE_INPUT = "discrete_input"
+FUNCTION_COIL = "coil"
+FUNCTION_HOLDING = "holding"
+
+# pymodbus Client-Methode pro Function Code
+READ_METHODS = {
+    FUNCTION_INPUT: "read_input_registers",
+    FUNCTION_DISCRETE_INPUT: "read_discrete_inputs",
+    FUNCTION_COIL: "read_coils",
+    FUNCTION_HOLDING: "read_holding_registers",
+}
+
+
+def _combine_registers(dtype, registers):
+    """Combine the registers of a multi-register value (big-endian word order)."""
+    if dtype == "string":
+        raw = b"".join(register.to_bytes(2, "big") for register in registers)
+        return raw.decode("ascii", errors="ignore").strip("\x00 ")
+    value = 0
+    for register in registers:
+        value = (value << 16) | register
+    if dtype.startswith("int") and value >= 1 << (16 * len(registers) - 1):
+        value -= 1 << (16 * len(registers))
+    return value
+
+
+@dataclass(frozen=True, slots=True)
+class ValueSpec:
+    """How a raw register value becomes the native value of its entity."""
+
+    dtype: str
+    signed: bool
+    scale: float
+    enum_map: dict | None
+    enum_raw: bool  # Number-Entitäten geben Enum-Rohwerte unverändert zurück
+    digits: int | None
+
+
+def _sensor_spec(item):
+    """Value spec of an input register sensor: enum label, else scaled value."""
+    dtype = item.get("dtype", "uint16")
+    return ValueSpec(
+        dtype=dtype,
+        signed=dtype == "int16",
+        scale=item.get("scale", 1),
+        enum_map=item.get("enum_map"),
+        enum_raw=False,
+        # Auf 2 Nachkommastellen runden bei °C Sensoren
+        digits=2 if item.get("unit") == "°C" else None,
+    )
+
+
+def _number_spec(item):
+    """Value spec of a holding register number: enum raw value, else scaled value."""
+    dtype = item.get("dtype", "uint16")
+    return ValueSpec(
+        dtype=dtype,
+        signed=dtype == "int16",
+        scale=item.get("scale", 1),
+        enum_map=item.get("enum_map"),
+        enum_raw=True,
+        digits=None,
+    )
+
+
+def _build_value_specs():
+    """Value specs per unique_id; registers without spec keep their raw value."""
+    specs = {}
+    for item in INPUT_REGISTERS:
+        specs[item.get("unique_id", f"{DOMAIN}_input_{item['address']}")] = _sensor_spec(item)
+    for item in HOLDING_REGISTERS:
+        specs[item.get("unique_id", f"{DOMAIN}_holding_{item['address']}")] = _number_spec(item)
+    return specs
+
+
+VALUE_SPECS = _build_value_specs()
+
+
+def native_value(unique_id, raw_value):
+    """Convert one raw value into the native value of its entity."""
+    spec = VALUE_SPECS.get(unique_id)
+    if spec is None:
+        return raw_value
+    if isinstance(raw_value, list):
+        return _combine_registers(spec.dtype, raw_value)
+    value = raw_value
+    if spec.signed and value > 32767:
+        value -= 65536
+    if spec.enum_map and value in spec.enum_map:
+        return value if spec.enum_raw else spec.enum_map[value]
+    value = value * spec.scale
+    if spec.digits is not None:
+        value = round(value, spec.digits)
+    return value
+
+
+def _decode_register(values, offset, count):
+    """Decode a single 16-bit register, None for unsupported registers."""
+    raw_value = values[offset]
+    if raw_value == UNSUPPORTED_VALUE:
+        return None
+    return raw_value
+
+
+def _decode_registers(values, offset, count):
+    """Decode a multi-register value as list of raw registers."""
+    raw_value = values[offset : offset + count]
+    if raw_value and raw_value[0] == UNSUPPORTED_VALUE:
+        return None
+    return raw_value
+
+
+def _decode_bit(values, offset, count):
+    """Decode a single discrete input or coil bit as 0/1."""
+    return 1 if values[offset] else 0
+
+
+@dataclass(frozen=True, slots=True)
+class RegisterSlot:
+    """One value inside a read block."""
+
+    unique_id: str
+    address: int  # 1-basierte Adresse aus const.py
+    offset: int  # Index im gelesenen Block
+    count: int
+    stop: int  # offset + count
+    input_type: str
+    decode: Callable
+
+
+class RegisterColumns:
+    """Precompiled column layout of the single-register slots of a block."""
+
+    __slots__ = ("unique_ids", "indexes", "is_bit", "stop", "take", "signed", "enums", "scaled", "rounded")
+
+    def __init__(self, slots, is_bit=False):
+        self.unique_ids = tuple(slot.unique_id for slot in slots)
+        # Feste Snapshot-Slots, siehe SLOT_INDEX
+        self.indexes = tuple(SLOT_INDEX[slot.unique_id] for slot in slots)
+        self.is_bit = is_bit
+        self.stop = max((slot.stop for slot in slots), default=0)
+        offsets = [slot.offset for slot in slots]
+        if len(offsets) == 1:
+            offset = offsets[0]
+            self.take = lambda values: (values[offset],)
+        else:
+            self.take = itemgetter(*offsets) if offsets else (lambda values: ())
+
+        specs = [VALUE_SPECS.get(slot.unique_id) for slot in slots]
+        self.signed = tuple(index for index, spec in enumerate(specs) if spec and spec.signed)
+        self.enums = tuple(
+            (index, spec.enum_map, spec.enum_raw) for index, spec in enumerate(specs) if spec and spec.enum_map
+        )
+        self.scaled = tuple((index, spec.scale) for index, spec in enumerate(specs) if spec and spec.scale != 1)
+        self.rounded = tuple(
+            (index, spec.digits) for index, spec in enumerate(specs) if spec and spec.digits is not None
+        )
+
+    def native_values(self, values, raw):
+        """Apply sign, enum mapping, scale and rounding column by column."""
+        native = list(raw)
+        if self.signed:
+            signed_values = self.take(array("h", array("H", values).tobytes()))
+            for index in self.signed:
+                native[index] = signed_values[index]
+        mapped = set()
+        for index, enum_map, enum_raw in self.enums:
+            value = native[index]
+            if value in enum_map:
+                mapped.add(index)
+                if not enum_raw:
+                    native[index] = enum_map[value]
+        for index, scale in self.scaled:
+            if index not in mapped:
+                native[index] = native[index] * scale
+        for index, digits in self.rounded:
+            if index not in mapped:
+                native[index] = round(native[index], digits)
+        return native
+
+
+@dataclass(frozen=True, slots=True)
+class ReadBlock:
+    """One Modbus read request and the slots decoded from its response."""
+
+    function: str
+    start: int  # 0-basierte Protokolladresse
+    count: int
+    is_bit: bool
+    slots: tuple
+    # Spaltenlayout der Einzelregister, wird beim Erstellen kompiliert
+    columns: RegisterColumns = field(default=None, compare=False, repr=False)
+    # Snapshot-Slots aller Werte des Blocks, auch der Mehrregister-Werte
+    slot_indexes: tuple = field(default=None, compare=False, repr=False)
+
+    def __post_init__(self):
+        if self.columns is None:
+            object.__setattr__(
+                self, "columns", RegisterColumns([slot for slot in self.slots if slot.count == 1], self.is_bit)
+            )
+        if self.slot_indexes is None:
+            object.__setattr__(self, "slot_indexes", tuple(SLOT_INDEX[slot.unique_id] for slot in self.slots))
+
+    @property
+    def end(self):
+        """Last 0-based protocol address covered by this block."""
+        return self.start + self.count - 1
+
+
+class ReadPlan:
+    """All read blocks for one poll cycle, grouped by function code."""
+
+    def __init__(self, blocks):
+        self.blocks = tuple(blocks)
+        self.input_blocks = self._blocks_for(FUNCTION_INPUT)
+        self.discrete_blocks = self._blocks_for(FUNCTION_DISCRETE_INPUT)
+        self.coil_blocks = self._blocks_for(FUNCTION_COIL)
+        self.holding_blocks = self._blocks_for(FUNCTION_HOLDING)
+
+    def _blocks_for(self, function):
+        return tuple(block for block in self.blocks if block.function == function)
+
+
+def _collect_slots(items, input_type, default_prefix, tiers=POLL_TIERS):
+    """Normalize register dicts into (unique_id, address, count, input_type) tuples.
+
+    Only entries whose ``poll_tier`` is in ``tiers`` are collected.
+
+    Later entries win on duplicate unique_ids, matching the old behaviour
+    where HOLDING_REGISTERS and SELECT_REGISTERS were concatenated into the
+    same data dict.
+    """
+    collected = {}
+    for item in items:
+        if item.get("poll_tier", POLL_TIER_NORMAL) not in tiers:
+            continue
+        address = item["address"]
+        unique_id = item.get("unique_id", f"{DOMAIN}_{default_prefix}_{address}")
+        collected[unique_id] = (
+            unique_id,
+            address,
+            item.get("count", 1),
+            item.get("input_type", input_type),
+        )
+    return list(collected.values())
+
+
+def plan_blocks(spans, max_gap, max_count):
+    """Coalesce (start, count) spans into the minimal list of read ranges.
+
+    Neighbouring spans are merged when the dead gap between them is at most
+    ``max_gap`` addresses and the merged range stays within ``max_count``
+    (the PDU limit of the function code). Spans are 0-based protocol
+    addresses; the result is a list of (start, count) tuples.
+    """
+    ranges = []
+    for start, count in sorted(spans):
+        if count > max_count:
+            raise ValueError(f"Register {start + 1} mit {count} Werten überschreitet das PDU-Limit von {max_count}")
+        end = start + count - 1
+        if ranges:
+            range_start, range_end = ranges[-1]
+            if start - range_end - 1 <= max_gap and max(end, range_end) - range_start + 1 <= max_count:
+                ranges[-1] = (range_start, max(end, range_end))
+                continue
+        ranges.append((start, end))
+    return [(start, end - start + 1) for start, end in ranges]
+
+
+def _build_blocks(function, entries, max_gap, max_count):
+    """Build the read blocks for all entries of a function code."""
+    is_bit = function in (FUNCTION_DISCRETE_INPUT, FUNCTION_COIL)
+    ranges = plan_blocks(((address - 1, count) for _, address, count, _ in entries), max_gap, max_count)
+    blocks = []
+    for start, block_count in ranges:
+        slots = []
+        for unique_id, address, count, input_type in entries:
+            offset = address - 1 - start
+            if offset < 0 or offset + count > block_count:
+                continue
+            if is_bit:
+                decode = _decode_bit
+            elif count == 1:
+                decode = _decode_register
+            else:
+                decode = _decode_registers
+            slots.append(
+                RegisterSlot(
+                    unique_id=unique_id,
+                    address=address,
+                    offset=offset,
+                    count=count,
+                    stop=offset + count,
+                    input_type=input_type,
+                    decode=decode,
+                )
+            )
+        blocks.append(ReadBlock(function=function, start=start, count=block_count, is_bit=is_bit, slots=tuple(slots)))
+    return blocks
+
+
+def _plan_entries(tiers=POLL_TIERS):
+    """Collect the (function, entries) pairs of all register tables for ``tiers``."""
+    input_entries = _collect_slots(INPUT_REGISTERS, FUNCTION_INPUT, "input", tiers)
+    # BINARY_SENSORS liegen im Input-Register-Bereich und überschreiben keine INPUT_REGISTERS
+    known_input_ids = {entry[0] for entry in input_entries}
+    input_entries.extend(
+        entry
+        for entry in _collect_slots(BINARY_SENSORS, FUNCTION_INPUT, "binary", tiers)
+        if entry[0] not in known_input_ids
+    )
+    return [
+        (FUNCTION_INPUT, input_entries),
+        (FUNCTION_DISCRETE_INPUT, _collect_slots(DISCRETE_INPUT_SENSORS, FUNCTION_DISCRETE_INPUT, "discrete", tiers)),
+        (FUNCTION_COIL, _collect_slots(COIL_SENSORS, FUNCTION_COIL, "coil", tiers)),
+        (
+            FUNCTION_HOLDING,
+            _collect_slots(list(HOLDING_REGISTERS) + list(SELECT_REGISTERS), FUNCTION_HOLDING, "holding", tiers),
+        ),
+    ]
+
+
+def build_read_plan(tiers=POLL_TIERS, max_register_gap=DEFAULT_MAX_REGISTER_GAP, max_bit_gap=DEFAULT_MAX_BIT_GAP):
+    """Compile the register tables from const.py into a read plan.
+
+    ``tiers`` selects the poll tiers whose registers are read.
+    ``max_register_gap`` and ``max_bit_gap`` trade wasted addresses against
+    additional round trips: a larger gap reads more unused addresses but
+    issues fewer requests.
+    """
+    blocks = []
+    for function, entries in _plan_entries(tiers):
+        blocks += _function_blocks(function, entries, max_register_gap, max_bit_gap)
+    return ReadPlan(blocks)
+
+
+def _function_blocks(function, entries, max_register_gap, max_bit_gap):
+    """Build the read blocks of one function code with its gap and PDU limit."""
+    if function in (FUNCTION_DISCRETE_INPUT, FUNCTION_COIL):
+        return _build_blocks(function, entries, max_bit_gap, MODBUS_MAX_READ_BITS)
+    return _build_blocks(function, entries, max_register_gap, MODBUS_MAX_READ_REGISTERS)
+
+
+@lru_cache(maxsize=64)
+def coalesce_blocks(blocks, max_register_gap=DEFAULT_MAX_REGISTER_GAP, max_bit_gap=DEFAULT_MAX_BIT_GAP):
+    """Plan the slots of several blocks again, e.g. a tier plan plus retried blocks.
+
+    Blocks from different plans can overlap or lie within the gap limit of
+    each other; the result reads every address at most once per poll. The
+    result is cached, the combinations of plans and failed blocks are few.
+    """
+    entries_by_function = {}
+    for block in blocks:
+        entries = entries_by_function.setdefault(block.function, {})
+        for slot in block.slots:
+            entries[slot.unique_id] = (slot.unique_id, slot.address, slot.count, slot.input_type)
+    coalesced = []
+    for function, entries in entries_by_function.items():
+        coalesced += _function_blocks(function, list(entries.values()), max_register_gap, max_bit_gap)
+    return tuple(coalesced)
+
+
+def _build_slot_index():
+    """Assign every unique_id of the full plan a fixed snapshot slot."""
+    slots = {}
+    for _, entries in _plan_entries():
+        for unique_id, address, _, input_type in entries:
+            slots.setdefault(unique_id, (input_type, address))
+    return (
+        {unique_id: index for index, unique_id in enumerate(slots)},
+        tuple(input_type for input_type, _ in slots.values()),
+        tuple(address for _, address in slots.values()),
+    )
+
+
+# unique_id -> Slot im Snapshot, dazu input_type und Adresse pro Slot
+SLOT_INDEX, SLOT_INPUT_TYPES, SLOT_ADDRESSES = _build_slot_index()
+SLOT_IDS = tuple(SLOT_INDEX)
+
+
+def _decode_slots(block, slots, values, snapshot):
+    """Decode slot by slot, used for multi-register values and short responses."""
+    available = len(values)
+    for slot in slots:
+        if slot.stop > available:
+            _LOGGER.warning(f"{block.function} {slot.address} nicht im gelesenen Bereich ({available} Werte)")
+            continue
+        raw_value = slot.decode(values, slot.offset, slot.count)
+        if raw_value is None:
+            # Wert aus einem früheren Poll entfernen (Snapshot wird stufenweise fortgeschrieben)
+            snapshot.discard(slot.unique_id)
+            continue
+        snapshot.store(slot.unique_id, raw_value)
+
+
+def decode_block(block, values, snapshot):
+    """Decode one block response into a RegisterSnapshot."""
+    columns = block.columns
+    if columns.stop > len(values):
+        _decode_slots(block, block.slots, values, snapshot)
+        return
+
+    raw = columns.take(values)
+    if columns.is_bit:
+        # Bits als 0/1, ohne Umrechnung
+        raw = native = tuple(map(int, raw))
+    else:
+        native = columns.native_values(values, raw)
+    snapshot.store_columns(columns.indexes, raw, native)
+    if len(columns.unique_ids) != len(block.slots):
+        _decode_slots(block, [slot for slot in block.slots if slot.count > 1], values, snapshot)
+
+
+READ_PLAN = build_read_plan()
+
+
+def build_readback_blocks(plan):
+    """Build one single-register read block per (function, address) of a plan.
+
+    Used to read back just the register that was written instead of
+    refreshing every block. Keys use the 1-based address from const.py.
+    """
+    slots_by_address = {}
+    for block in plan.blocks:
+        for slot in block.slots:
+            slots_by_address.setdefault((block.function, slot.address), []).append((block, slot))
+
+    readback_blocks = {}
+    for key, entries in slots_by_address.items():
+        block, first_slot = entries[0]
+        count = max(slot.count for _, slot in entries)
+        readback_blocks[key] = ReadBlock(
+            function=block.function,
+            start=block.start + first_slot.offset,
+            count=count,
+            is_bit=block.is_bit,
+            slots=tuple(replace(slot, offset=0, stop=slot.count) for _, slot in entries),
+        )
+    return readback_blocks
+
+
+READBACK_BLOCKS = build_readback_blocks(READ_PLAN)
+
+
+def merge_readback_blocks(blocks):
+    """Merge readback blocks of one function code into a single covering block."""
+    start = min(block.start for block in blocks)
+    end = max(block.end for block in blocks)
+    slots = tuple(
+        replace(slot, offset=block.start - start + slot.offset, stop=block.start - start + slot.stop)
+        for block in blocks
+        for slot in block.slots
+    )
+    return ReadBlock(function=blocks[0].function, start=start, count=end - start + 1, is_bit=blocks[0].is_bit, slots=slots)
+
+# Ein Leseplan pro Kombination fälliger Stufen, damit gleichzeitig fällige
+# Stufen in gemeinsame Blöcke zusammengefasst werden
+READ_PLANS = {
+    frozenset(tiers): build_read_plan(tiers)
+    for tiers in (
+        combination
+        for size in range(1, len(POLL_TIERS) + 1)
+        for combination in combinations(POLL_TIERS, size)
+    )
+}
@@ -0,0 +1,71 @@
+"""Adaptive scan interval driven by the operating state of the heat pump.
+
+While the compressor runs, a defrost or DHW cycle is active or a value was
+written recently, the coordinator ticks at the base (fast tier) interval.
+When the heat pump is idle and no state, setpoint or mode changed, the
+interval doubles on every poll up to the idle ceiling. Any state change
+returns to the base interval right away.
+"""
+import time
+
+from .const import (
+    DISCRETE_INPUT_SENSORS,
+    COIL_SENSORS,
+    HOLDING_REGISTERS,
+    SELECT_REGISTERS,
+    BINARY_SENSORS,
+    ADAPTIVE_ACTIVE_DISCRETE_ADDRESSES,
+    ADAPTIVE_WRITE_HOLD,
+)
+from .read_plan import SLOT_INDEX
+
+# Zustände, Sollwerte und Modi; Messwerte (Temperaturen, Durchfluss) zählen nicht als Änderung
+STATE_KEYS = frozenset(
+    item["unique_id"]
+    for item in DISCRETE_INPUT_SENSORS + COIL_SENSORS + HOLDING_REGISTERS + SELECT_REGISTERS + BINARY_SENSORS
+    if "unique_id" in item
+)
+
+
+class AdaptiveScanInterval:
+    """Choose the coordinator tick between a base interval and an idle ceiling."""
+
+    def __init__(self, base, ceiling):
+        self.base = base
+        # Obergrenze 0 oder kleiner als die Basis: festes Intervall
+        self.ceiling = max(base, ceiling)
+        self.interval = base
+        self._active_indexes = tuple(
+            SLOT_INDEX[item["unique_id"]]
+            for item in DISCRETE_INPUT_SENSORS
+            if item["address"] in ADAPTIVE_ACTIVE_DISCRETE_ADDRESSES and item.get("unique_id") in SLOT_INDEX
+        )
+        self._active_on = (1,) * len(self._active_indexes)
+        self._last_write = None
+
+    def note_write(self):
+        """Remember a write; the base interval is kept for ADAPTIVE_WRITE_HOLD seconds."""
+        self._last_write = time.monotonic()
+
+    def is_active(self, snapshot):
+        """Return True if compressor, defrost, DHW or a recent write is active."""
+        if self._last_write is not None and time.monotonic() - self._last_write < ADAPTIVE_WRITE_HOLD:
+            return True
+        return bool(snapshot.pack_bits(self._active_indexes, self._active_on))
+
+    def update(self, snapshot, changed):
+        """Return the interval for the next poll.
+
+        ``changed`` are the data keys changed by the last poll, None if
+        unknown (first poll).
+        """
+        if changed is None or self.is_active(snapshot) or not STATE_KEYS.isdisjoint(changed):
+            self.interval = self.base
+        else:
+            self.interval = min(self.ceiling, self.interval * 2)
+        return self.interval
+
+    def reset(self):
+        """Return to the base interval."""
+        self.interval = self.base
+        return self.interval
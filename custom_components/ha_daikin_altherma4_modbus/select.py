@@ -34,18 +34,24 @@ class DaikinSelect(CoordinatorEntity, SelectEntity):
     _attr_has_entity_name = True
 
     def __init__(self, coordinator, entry, address, unique_id, enum_map, entity_category=None, translation_key=None):
-        super().__init__(coordinator)
+        unique_id = unique_id or f"{DOMAIN}_{address}"
+        super().__init__(coordinator, context=frozenset((unique_id,)))
 
         self._entry = entry
         self._address = address
         self._enum_map = enum_map
 
-        self._attr_unique_id = unique_id or f"{DOMAIN}_{address}"
+        self._attr_unique_id = unique_id
         self._attr_device_info = HOLDING_DEVICE_INFO
         self._attr_entity_category = entity_category
         self._attr_options = list(enum_map.values())
         self._attr_translation_key = translation_key
 
+    @property
+    def available(self):
+        """Unavailable once a register failed to read for longer than the max value age."""
+        return super().available and self.coordinator.keys_available(self.coordinator_context)
+
     @property
     def current_option(self):
         """Return current selected option."""
@@ -71,6 +77,5 @@ class DaikinSelect(CoordinatorEntity, SelectEntity):
         # Find the key for the selected option
         for key, value in self._enum_map.items():
             if value == option:
-                await self.coordinator.client.write_register(self._address, key)
-                await self.coordinator.async_request_refresh()
+                await self.coordinator.async_write_register(self._address, key)
                 break
@@ -6,9 +6,15 @@ from .const import (
     DOMAIN,
     INPUT_DEVICE_INFO,
     CALCULATED_DEVICE_INFO,
+    LINK_DEVICE_INFO,
     INPUT_REGISTERS,
     CALCULATED_SENSORS,
+    LINK_SENSORS,
+    ENERGY_SENSORS,
+    COP_WINDOWS,
+    EXTERNAL_ELECTRIC_POWER_KEY,
 )
+from .calculated import CALCULATIONS
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -21,11 +27,8 @@ async def async_setup_entry(hass, entry, async_add_entities):
     for item in INPUT_REGISTERS:
         address = item["address"]
         unit = item.get("unit", "")
-        dtype = item.get("dtype", "uint16")
-        scale = item.get("scale", 1)
         count = item.get("count", 1)
         icon = item.get("icon", "mdi:information")
-        enum_map = item.get("enum_map")
         entity_category = item.get("entity_category")
         unique_id = item.get("unique_id", f"{DOMAIN}_input_{address}")
         translation_key = item.get("translation_key")
@@ -36,11 +39,8 @@ async def async_setup_entry(hass, entry, async_add_entities):
                 entry=entry,
                 address=address,
                 unit=unit,
-                dtype=dtype,
-                scale=scale,
                 count=count,
                 icon=icon,
-                enum_map=enum_map,
                 entity_category=entity_category,
                 unique_id=unique_id,
                 translation_key=translation_key,
@@ -64,36 +64,32 @@ async def async_setup_entry(hass, entry, async_add_entities):
         )
     )
 
+    # Aktuelles (adaptives) Abfrageintervall
+    entities.append(ScanIntervalSensor(coordinator, entry))
+
+    # Diagnose-Sensoren der Modbus-Verbindung
+    for link in LINK_SENSORS:
+        if link["type"] == "counter":
+            entities.append(LinkCounterSensor(coordinator, entry, link))
+        else:
+            entities.append(LinkLatencySensor(coordinator, entry, link))
+
+    # Energiezähler für das Energie-Dashboard
+    for energy in ENERGY_SENSORS:
+        entities.append(EnergySensor(coordinator, entry, energy))
+
+    # Gleitende und Saison-Leistungszahl
+    for window in COP_WINDOWS:
+        entities.append(CopWindowSensor(coordinator, entry, window))
+
     # Berechnete Sensoren
     _LOGGER.debug(f"Processing {len(CALCULATED_SENSORS)} calculated sensors")
     for calc in CALCULATED_SENSORS:
         _LOGGER.debug(f"Processing calculated sensor: {calc['name']} (type: {calc['type']})")
-        if calc["type"] == "heat_power":
-            entities.append(
-                CalculatedHeatPowerSensor(
-                    coordinator=coordinator,
-                    entry=entry,
-                    unique_id=calc["unique_id"],
-                    unit=calc["unit"],
-                    device_class=calc["device_class"],
-                    entity_category=calc["entity_category"],
-                    device_info=CALCULATED_DEVICE_INFO,
-                    translation_key=calc.get("translation_key")
-                )
-            )
-        elif calc["type"] == "cop":
-            entities.append(
-                CalculatedCoPSensor(
-                    coordinator=coordinator,
-                    entry=entry,
-                    unique_id=calc["unique_id"],
-                    unit=calc["unit"],
-                    device_class=calc["device_class"],
-                    entity_category=calc["entity_category"],
-                    device_info=CALCULATED_DEVICE_INFO,
-                    translation_key=calc.get("translation_key")
-                )
-            )
+        if calc["type"] == "formula":
+            # Zwischenwerte ohne eigene Entität
+            if calc.get("entity", True):
+                entities.append(CalculatedSensor(coordinator, entry, calc))
         elif calc["type"] == "last_defrost_restart":
             entities.append(
                 CalculatedLastDefrostRestartSensor(
@@ -136,18 +132,6 @@ async def async_setup_entry(hass, entry, async_add_entities):
                     translation_key=calc.get("translation_key")
                 )
             )
-        elif calc["type"] == "delta_t":
-            entities.append(
-                DeltaTSensor(
-                    coordinator=coordinator,
-                    entry=entry,
-                    unique_id=calc["unique_id"],
-                    unit=calc["unit"],
-                    device_class=calc["device_class"],
-                    device_info=CALCULATED_DEVICE_INFO,
-                    translation_key=calc.get("translation_key")
-                )
-            )
 
     async_add_entities(entities)
 
@@ -157,166 +141,64 @@ class DaikinInputSensor(CoordinatorEntity, SensorEntity):
     
     _attr_has_entity_name = True
 
-    def __init__(self, coordinator, entry, address, unit, dtype, scale, count, icon, enum_map, entity_category=None, unique_id=None, device_info=None, translation_key=None):
-        super().__init__(coordinator)
+    def __init__(self, coordinator, entry, address, unit, count, icon, entity_category=None, unique_id=None, device_info=None, translation_key=None):
+        super().__init__(coordinator, context=frozenset((unique_id,)))
         self._entry = entry
         self._address = address
-        self._dtype = dtype
-        self._scale = scale
         self._count = count
         self._icon = icon
-        self._enum_map = enum_map
         self._attr_unique_id = unique_id
         self._attr_native_unit_of_measurement = unit
         self._attr_entity_category = entity_category
         self._attr_device_info = device_info
         self._attr_translation_key = translation_key
 
+    @property
+    def available(self):
+        """Unavailable once a register failed to read for longer than the max value age."""
+        return super().available and self.coordinator.keys_available(self.coordinator_context)
+
     @property
     def native_value(self):
         """Return the state of the sensor."""
         data = self.coordinator.data.get(self._attr_unique_id)
         if data is None:
             return None
-        val = data.get("value")
-        if val is None:
-            return None
-        
-        # Handle signed 16-bit integers
-        if val > 32767:  # If value is negative (2's complement)
-            val = val - 65536
-            
-        # ENUM Mapping
-        if self._enum_map:
-            val = self._enum_map.get(val, val)
-
-        # Skalierung anwenden
-        scaled_value = val * self._scale
-        
-        # Auf 2 Nachkommastellen runden bei °C Sensoren
-        if self._attr_native_unit_of_measurement == "°C":
-            return round(scaled_value, 2)
-        
-        return scaled_value
+        # Vorzeichen, Enum-Mapping, Skalierung und Rundung erledigt der Koordinator beim Dekodieren
+        return data.get("native_value")
 
 
-class CalculatedHeatPowerSensor(CoordinatorEntity, SensorEntity):
-    """Berechneter Sensor für Wärmepumpenleistung."""
-    
-    _attr_has_entity_name = True
+class CalculatedSensor(CoordinatorEntity, SensorEntity):
+    """Sensor for a value of the calculation graph (ΔT, heat power, CoP, ...).
 
-    def __init__(self, coordinator, entry, unique_id, unit, device_class, entity_category=None, device_info=None, translation_key=None):
-        super().__init__(coordinator)
-        self._entry = entry
-        self._attr_unique_id = unique_id
-        self._attr_native_unit_of_measurement = unit
-        self._attr_device_class = device_class
-        self._attr_icon = "mdi:fire"
-        self._attr_device_info = device_info or CALCULATED_DEVICE_INFO
-        self._attr_entity_category = entity_category
-        self._attr_translation_key = translation_key
+    The coordinator computes the value once per poll when one of its inputs
+    changed; the entity only reads the result.
+    """
 
-    def _calculate_heat_power(self):
-        """Berechnet die Wärmeleistung in W."""
-        # Flow, Vorlauf- und Rücklauftemperatur aus den Input-Sensoren
-        flow_data = self.coordinator.data.get(f"{DOMAIN}_input_49", {})
-        flow_raw = flow_data.get("value", 0)  # Flow rate (roh)
-        temp_vl_data = self.coordinator.data.get(f"{DOMAIN}_input_40", {})
-        temp_vl_raw = temp_vl_data.get("value", 0)  # Leaving water temperature PHE (roh)
-        temp_rl_data = self.coordinator.data.get(f"{DOMAIN}_input_42", {})
-        temp_rl_raw = temp_rl_data.get("value", 0)  # Return water temperature (roh)
-
-        flow = flow_raw * 0.01  # L/min (korrekte Skalierung)
-        temp_vl = temp_vl_raw * 0.01  # °C (korrekte Skalierung)
-        temp_rl = temp_rl_raw * 0.01  # °C (korrekte Skalierung)
-
-        delta_t = temp_vl - temp_rl
-        heat_power = flow * delta_t * 70  # Berechnung Wärmeleistung in W
-        _LOGGER.debug(f"flow: {flow} L/min")
-        _LOGGER.debug(f"delta_t: {delta_t} K")
-        _LOGGER.debug(f"heat_power: {heat_power} W")
-        return round(heat_power, 2)
-
-    @property
-    def native_value(self):
-        """Berechnet die Wärmeleistung in W."""
-        return self._calculate_heat_power()
-
-
-class CalculatedCoPSensor(CoordinatorEntity, SensorEntity):
-    """Berechneter Sensor für Coefficient of Performance (CoP)."""
-    
     _attr_has_entity_name = True
 
-    def __init__(self, coordinator, entry, unique_id, unit, device_class, entity_category=None, device_info=None, translation_key=None):
-        super().__init__(coordinator)
+    def __init__(self, coordinator, entry, calc):
+        super().__init__(coordinator, context=frozenset((calc["unique_id"],)))
         self._entry = entry
-        self._attr_unique_id = unique_id
-        self._attr_native_unit_of_measurement = unit
-        self._attr_device_class = device_class
-        self._attr_state_class = "measurement"
-        self._attr_icon = "mdi:gauge"
-        self._attr_device_info = device_info or CALCULATED_DEVICE_INFO
-        self._attr_entity_category = entity_category
-        self._attr_translation_key = translation_key
-
-    def _calculate_heat_power(self):
-        """Berechnet die Wärmeleistung in W."""
-        # Flow, Vorlauf- und Rücklauftemperatur aus den Input-Sensoren
-        flow_data = self.coordinator.data.get(f"{DOMAIN}_input_49", {})
-        flow_raw = flow_data.get("value", 0)  # Flow rate (roh)
-        temp_vl_data = self.coordinator.data.get(f"{DOMAIN}_input_40", {})
-        temp_vl_raw = temp_vl_data.get("value", 0)  # Leaving water temperature PHE (roh)
-        temp_rl_data = self.coordinator.data.get(f"{DOMAIN}_input_42", {})
-        temp_rl_raw = temp_rl_data.get("value", 0)  # Return water temperature (roh)
+        self._attr_unique_id = calc["unique_id"]
+        self._attr_native_unit_of_measurement = calc.get("unit")
+        self._attr_device_class = calc.get("device_class")
+        self._attr_state_class = calc.get("state_class")
+        self._attr_icon = calc.get("icon")
+        self._attr_device_info = CALCULATED_DEVICE_INFO
+        self._attr_entity_category = calc.get("entity_category")
+        self._attr_translation_key = calc.get("translation_key")
+        self._register_keys = CALCULATIONS.register_keys[calc["unique_id"]]
 
-        flow = flow_raw * 0.01  # L/min (korrekte Skalierung)
-        temp_vl = temp_vl_raw * 0.01  # °C (korrekte Skalierung)
-        temp_rl = temp_rl_raw * 0.01  # °C (korrekte Skalierung)
-
-        delta_t = temp_vl - temp_rl
-        heat_power = flow * delta_t * 70  # Berechnung Wärmeleistung in W
-        return round(heat_power, 2)
+    @property
+    def available(self):
+        """Unavailable once an input register failed to read for longer than the max value age."""
+        return super().available and self.coordinator.keys_available(self._register_keys)
 
     @property
     def native_value(self):
-        """Berechnet den CoP als Verhältnis von Heizleistung zu elektrischer Leistung."""
-        # Heizleistung aus der gleichen Berechnung wie CalculatedHeatPowerSensor
-        heat_power = self._calculate_heat_power()  # in W
-        _LOGGER.debug(f"Wärmeleistung: {heat_power} W")
-
-        # Elektrische Leistung
-        electric_power_sensor = self._entry.data.get("electric_power_sensor")
-        _LOGGER.debug(f"electric_power_sensor: {electric_power_sensor}")
-        if electric_power_sensor:
-            # Externer Sensor
-            state = self.coordinator.hass.states.get(electric_power_sensor)
-            if state and state.state not in [None, "unknown", "unavailable"]:
-                try:
-                    electric_power = float(state.state)
-                except ValueError:
-                    electric_power = None
-            else:
-                electric_power = None
-        else:
-            electric_power = None
-        
-        if electric_power is None:
-            # Modbus
-            power_data = self.coordinator.data.get(f"{DOMAIN}_input_51", {})
-            _LOGGER.debug(f"power_data: {power_data}")
-            electric_power_raw = power_data.get("value", 0)  # Heat pump power consumption (roh)
-            electric_power = electric_power_raw * power_data.get("scale", 10)  # in W
-
-        _LOGGER.debug(f"electric_power: {electric_power}")
-        if electric_power and electric_power > 0 and heat_power > 0:
-            # Beide Leistungen in W, direkte Berechnung
-            cop = heat_power / electric_power
-            _LOGGER.debug(f"cop: {cop}")
-            return round(cop, 2)
-        else:
-            _LOGGER.debug(f"cop: None")
-            return None
+        """Return the value computed in the last poll."""
+        return self.coordinator.data.get(self._attr_unique_id)
 
 
 class LastTriggeredSensor(CoordinatorEntity, SensorEntity):
@@ -325,7 +207,7 @@ class LastTriggeredSensor(CoordinatorEntity, SensorEntity):
     _attr_has_entity_name = True
 
     def __init__(self, coordinator, entry, unique_id, unit, device_class, trigger_address, entity_category=None, device_info=None, translation_key=None):
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=frozenset((f"last_triggered_{trigger_address}",)))
         self._entry = entry
         self._trigger_address = trigger_address
         self._attr_unique_id = unique_id
@@ -346,7 +228,8 @@ class ExternalElectricPowerSensor(CoordinatorEntity, SensorEntity):
     _attr_has_entity_name = True
 
     def __init__(self, coordinator, entry, unique_id, unit, device_class, entity_category=None, device_info=None, translation_key=None):
-        super().__init__(coordinator)
+        # Aktualisiert bei jeder Meldung des externen Sensors und mit dem Wert zum Lesezeitpunkt jedes Polls
+        super().__init__(coordinator, context=frozenset((EXTERNAL_ELECTRIC_POWER_KEY,)))
         self._entry = entry
         self._attr_unique_id = unique_id
         self._attr_native_unit_of_measurement = unit
@@ -359,65 +242,172 @@ class ExternalElectricPowerSensor(CoordinatorEntity, SensorEntity):
 
     @property
     def available(self) -> bool:
-        """Return True if entity is available."""
-        # Check if electric_power_sensor is configured
-        electric_power_sensor = self._entry.data.get("electric_power_sensor")
-        _LOGGER.debug(f"ExternalElectricPowerSensor available check: electric_power_sensor = {electric_power_sensor}")
-        
-        if not electric_power_sensor:
-            _LOGGER.debug("ExternalElectricPowerSensor: Not available - no electric_power_sensor configured")
-            return False
-        
-        # Check if the referenced sensor exists and is available
-        state = self.coordinator.hass.states.get(electric_power_sensor)
-        is_available = state is not None and state.state not in [None, "unknown", "unavailable"]
-        _LOGGER.debug(f"ExternalElectricPowerSensor: Referenced sensor available = {is_available}")
-        return is_available
+        """Available while a sensor is configured and reports a number."""
+        return self.coordinator.external_power is not None and self.native_value is not None
 
     @property
     def native_value(self):
         """Gibt den Wert des externen elektrischen Leistungssensors zurück."""
-        electric_power_sensor = self._entry.data.get("electric_power_sensor")
-        if electric_power_sensor:
-            state = self.coordinator.hass.states.get(electric_power_sensor)
-            if state and state.state not in [None, "unknown", "unavailable"]:
-                try:
-                    return float(state.state)
-                except ValueError:
-                    _LOGGER.error(f"ExternalElectricPowerSensor: Cannot convert {state.state} to float")
-                    return None
-        return None
-
-
-class DeltaTSensor(CoordinatorEntity, SensorEntity):
-    """Calculated sensor for temperature difference (Delta-T)."""
-    
+        return self.coordinator.data.get(EXTERNAL_ELECTRIC_POWER_KEY)
+
+
+class ScanIntervalSensor(CoordinatorEntity, SensorEntity):
+    """Diagnostic sensor for the effective (adaptive) scan interval."""
+
     _attr_has_entity_name = True
-    
-    def __init__(self, coordinator, entry, unique_id, unit, device_class, device_info=None, translation_key=None):
-        super().__init__(coordinator)
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_translation_key = "effective_scan_interval"
+    _attr_device_class = "duration"
+    _attr_native_unit_of_measurement = "s"
+    _attr_state_class = "measurement"
+    _attr_icon = "mdi:timer-sync-outline"
+
+    def __init__(self, coordinator, entry):
+        super().__init__(coordinator, context=frozenset(("scan_interval",)))
         self._entry = entry
-        self._attr_unique_id = unique_id
-        self._attr_native_unit_of_measurement = unit
-        self._attr_device_class = device_class
-        self._attr_state_class = "measurement"
-        self._attr_icon = "mdi:thermometer-lines"
-        self._attr_device_info = device_info or CALCULATED_DEVICE_INFO
-        self._attr_translation_key = translation_key
+        self._attr_unique_id = f"{DOMAIN}_effective_scan_interval"
+        self._attr_device_info = CALCULATED_DEVICE_INFO
 
     @property
     def native_value(self):
-        """Calculate the temperature difference between flow and return."""
-        # Vorlauftemperatur (Leaving water temperature PHE)
-        flow_temp_data = self.coordinator.data.get(f"{DOMAIN}_input_40", {})
-        flow_temp_raw = flow_temp_data.get("value", 0)
-        flow_temp = flow_temp_raw * flow_temp_data.get("scale", 0.01)  # °C
-        
-        # Rücklauftemperatur (Return water temperature)
-        return_temp_data = self.coordinator.data.get(f"{DOMAIN}_input_42", {})
-        return_temp_raw = return_temp_data.get("value", 0)
-        return_temp = return_temp_raw * return_temp_data.get("scale", 0.01)  # °C
-        
-        # Delta-T berechnen und auf 2 Nachkommastellen runden
-        delta_t = flow_temp - return_temp
-        return round(delta_t, 2)
+        """Return the current coordinator interval in seconds."""
+        return self.coordinator.update_interval.total_seconds()
+
+
+class LinkLatencySensor(CoordinatorEntity, SensorEntity):
+    """Diagnostic sensor for the p50 round-trip time of one function code or the whole poll.
+
+    p95, max and the per-block latencies are exposed as attributes.
+    """
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_device_class = "duration"
+    _attr_native_unit_of_measurement = "ms"
+    _attr_state_class = "measurement"
+    _attr_icon = "mdi:timer-outline"
+
+    def __init__(self, coordinator, entry, link):
+        super().__init__(coordinator, context=frozenset((link["unique_id"],)))
+        self._entry = entry
+        self._function = link.get("function")
+        self._attr_unique_id = link["unique_id"]
+        self._attr_translation_key = link.get("translation_key")
+        self._attr_device_info = LINK_DEVICE_INFO
+
+    @property
+    def available(self):
+        """Link metrics stay available while polls fail."""
+        return True
+
+    def _summary(self):
+        metrics = self.coordinator.link_metrics
+        if self._function is None:
+            return metrics.poll_duration.summary()
+        return metrics.latency(self._function)
+
+    @property
+    def native_value(self):
+        """Return the median round-trip time in milliseconds."""
+        summary = self._summary()
+        return summary["p50"] if summary else None
+
+    @property
+    def extra_state_attributes(self):
+        """Return p95, max and the latencies per block."""
+        summary = self._summary()
+        if not summary:
+            return None
+        attributes = {"p95": summary["p95"], "max": summary["max"]}
+        if self._function is not None:
+            attributes["blocks"] = self.coordinator.link_metrics.block_latencies(self._function)
+        return attributes
+
+
+class LinkCounterSensor(CoordinatorEntity, SensorEntity):
+    """Diagnostic counter of the Modbus link (requests, errors, timeouts, reconnects, overruns)."""
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_state_class = "total_increasing"
+
+    def __init__(self, coordinator, entry, link):
+        super().__init__(coordinator, context=frozenset((link["unique_id"],)))
+        self._entry = entry
+        self._metric = link["metric"]
+        self._attr_unique_id = link["unique_id"]
+        self._attr_translation_key = link.get("translation_key")
+        self._attr_icon = link.get("icon")
+        self._attr_device_info = LINK_DEVICE_INFO
+
+    @property
+    def available(self):
+        """Link metrics stay available while polls fail."""
+        return True
+
+    @property
+    def native_value(self):
+        """Return the counter since the integration was loaded."""
+        return getattr(self.coordinator.link_metrics, self._metric)
+
+
+class EnergySensor(CoordinatorEntity, SensorEntity):
+    """Heat or electric energy in kWh, integrated by the coordinator at every poll."""
+
+    _attr_has_entity_name = True
+    _attr_device_class = "energy"
+    _attr_native_unit_of_measurement = "kWh"
+    _attr_state_class = "total_increasing"
+
+    def __init__(self, coordinator, entry, energy):
+        super().__init__(coordinator, context=frozenset((energy["unique_id"],)))
+        self._entry = entry
+        self._attr_unique_id = energy["unique_id"]
+        self._attr_translation_key = energy.get("translation_key")
+        self._attr_icon = energy.get("icon")
+        self._attr_device_info = CALCULATED_DEVICE_INFO
+
+    @property
+    def available(self):
+        """The counters stay valid while polls fail."""
+        return True
+
+    @property
+    def native_value(self):
+        """Return the energy counted since the integration was set up."""
+        return self.coordinator.energy.totals[self._attr_unique_id]
+
+
+class CopWindowSensor(CoordinatorEntity, SensorEntity):
+    """Rolling or seasonal COP, without defrost and idle periods.
+
+    The heat and electric energy of the window are exposed as attributes.
+    """
+
+    _attr_has_entity_name = True
+    _attr_native_unit_of_measurement = "CoP"
+    _attr_state_class = "measurement"
+    _attr_icon = "mdi:gauge"
+
+    def __init__(self, coordinator, entry, window):
+        super().__init__(coordinator, context=frozenset((window["unique_id"],)))
+        self._entry = entry
+        self._attr_unique_id = window["unique_id"]
+        self._attr_translation_key = window.get("translation_key")
+        self._attr_device_info = CALCULATED_DEVICE_INFO
+
+    @property
+    def available(self):
+        """The windows stay valid while polls fail."""
+        return True
+
+    @property
+    def native_value(self):
+        """Return heat / electric energy of the window."""
+        return self.coordinator.cop_windows.current[self._attr_unique_id][0]
+
+    @property
+    def extra_state_attributes(self):
+        """Return the energies of the window in kWh."""
+        _, heat, electric = self.coordinator.cop_windows.current[self._attr_unique_id]
+        return {"heat_energy": heat, "electric_energy": electric}
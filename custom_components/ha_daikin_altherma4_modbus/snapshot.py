@@ -0,0 +1,226 @@
+"""Array-backed register snapshot of one poll.
+
+The coordinator used to build a fresh dict per register on every poll and
+copy the whole dict of dicts into ``previous_data`` afterwards. A
+``RegisterSnapshot`` instead keeps the raw registers in a preallocated
+``array('H')``, the presence flags in a ``bytearray`` and the native values
+in a fixed-size list, all indexed by the static slot index of the read
+plan. The coordinator owns two snapshots and swaps them after every poll.
+
+For the entities a snapshot is a read-only ``Mapping`` from unique_id to a
+``{"value", "native_value", "input_type", "address"}`` view, so
+``coordinator.data.get(unique_id)`` keeps working unchanged. Keys that are
+not register slots (``last_triggered_*``) are kept in a small dict.
+"""
+from array import array
+from collections.abc import Mapping
+
+from .read_plan import (
+    SLOT_INDEX,
+    SLOT_IDS,
+    SLOT_INPUT_TYPES,
+    SLOT_ADDRESSES,
+    UNSUPPORTED_VALUE,
+    native_value,
+)
+
+_ENTRY_KEYS = ("value", "native_value", "input_type", "address")
+
+
+class RegisterView(Mapping):
+    """Read-only entry view of one snapshot slot."""
+
+    __slots__ = ("_snapshot", "_index")
+
+    def __init__(self, snapshot, index):
+        self._snapshot = snapshot
+        self._index = index
+
+    def __getitem__(self, key):
+        snapshot = self._snapshot
+        index = self._index
+        if key == "value":
+            wide = snapshot._wide
+            return wide[index] if index in wide else snapshot._raw[index]
+        if key == "native_value":
+            return snapshot._native[index]
+        if key == "input_type":
+            return SLOT_INPUT_TYPES[index]
+        if key == "address":
+            return SLOT_ADDRESSES[index]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        if key in _ENTRY_KEYS:
+            return self[key]
+        return default
+
+    def __iter__(self):
+        return iter(_ENTRY_KEYS)
+
+    def __len__(self):
+        return len(_ENTRY_KEYS)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class RegisterSnapshot(Mapping):
+    """Register image of one poll in preallocated buffers."""
+
+    __slots__ = ("_raw", "_present", "_native", "_wide", "_extras", "_views")
+
+    def __init__(self):
+        size = len(SLOT_IDS)
+        self._raw = array("H", bytes(2 * size))
+        self._present = bytearray(size)
+        self._native = [None] * size
+        # Mehrregister-Werte (Strings, 32 Bit) als Liste der Rohregister
+        self._wide = {}
+        # Zusätzliche Keys wie last_triggered_*
+        self._extras = {}
+        self._views = tuple(RegisterView(self, index) for index in range(size))
+
+    def __getitem__(self, key):
+        index = SLOT_INDEX.get(key)
+        if index is None:
+            return self._extras[key]
+        if not self._present[index]:
+            raise KeyError(key)
+        return self._views[index]
+
+    def get(self, key, default=None):
+        index = SLOT_INDEX.get(key)
+        if index is None:
+            return self._extras.get(key, default)
+        return self._views[index] if self._present[index] else default
+
+    def __contains__(self, key):
+        index = SLOT_INDEX.get(key)
+        if index is None:
+            return key in self._extras
+        return bool(self._present[index])
+
+    def __iter__(self):
+        present = self._present
+        for index, unique_id in enumerate(SLOT_IDS):
+            if present[index]:
+                yield unique_id
+        yield from self._extras
+
+    def __len__(self):
+        return self._present.count(1) + len(self._extras)
+
+    def __setitem__(self, key, value):
+        """Set an extra key, or a register slot from a data dict entry."""
+        if key in SLOT_INDEX:
+            self.store(key, value["value"])
+        else:
+            self._extras[key] = value
+
+    def store(self, unique_id, raw_value):
+        """Store one raw value and its native value."""
+        index = SLOT_INDEX[unique_id]
+        if isinstance(raw_value, list):
+            self._wide[index] = raw_value
+            self._raw[index] = raw_value[0] if raw_value else 0
+        else:
+            self._wide.pop(index, None)
+            self._raw[index] = raw_value & 0xFFFF
+        self._native[index] = native_value(unique_id, raw_value)
+        self._present[index] = 1
+
+    def store_columns(self, indexes, raw, native):
+        """Store decoded columns of one block, dropping unsupported registers."""
+        raw_buffer = self._raw
+        present = self._present
+        native_buffer = self._native
+        for index, raw_value, value in zip(indexes, raw, native):
+            if raw_value == UNSUPPORTED_VALUE:
+                raw_buffer[index] = 0
+                native_buffer[index] = None
+                present[index] = 0
+                continue
+            raw_buffer[index] = raw_value
+            native_buffer[index] = value
+            present[index] = 1
+
+    def discard(self, unique_id):
+        """Remove a register slot."""
+        index = SLOT_INDEX[unique_id]
+        self._wide.pop(index, None)
+        self._raw[index] = 0
+        self._native[index] = None
+        self._present[index] = 0
+
+    def raw_values(self):
+        """Return {unique_id: raw value} of all present slots, e.g. for storage."""
+        raw = self._raw
+        wide = self._wide
+        return {
+            unique_id: list(wide[index]) if index in wide else raw[index]
+            for index, unique_id in enumerate(SLOT_IDS)
+            if self._present[index]
+        }
+
+    def load_raw_values(self, values):
+        """Store raw values from ``raw_values()``, ignoring unknown keys."""
+        for unique_id, raw_value in values.items():
+            if unique_id in SLOT_INDEX:
+                self.store(unique_id, raw_value)
+
+    def pack_bits(self, indexes, on_values):
+        """Pack ``raw == on_value`` of the given slots into an int, bit i for slot i."""
+        raw = self._raw
+        present = self._present
+        bits = 0
+        for bit, (index, on_value) in enumerate(zip(indexes, on_values)):
+            if present[index] and raw[index] == on_value:
+                bits |= 1 << bit
+        return bits
+
+    def copy_from(self, other):
+        """Overwrite this snapshot with another one, reusing the buffers."""
+        self._raw[:] = other._raw
+        self._present[:] = other._present
+        self._native[:] = other._native
+        if self._wide or other._wide:
+            self._wide = dict(other._wide)
+        self._extras.clear()
+        self._extras.update(other._extras)
+
+    def copy_slot(self, other, unique_id):
+        """Copy one register slot from another snapshot."""
+        index = SLOT_INDEX[unique_id]
+        self._raw[index] = other._raw[index]
+        self._present[index] = other._present[index]
+        self._native[index] = other._native[index]
+        if index in other._wide:
+            self._wide[index] = other._wide[index]
+        else:
+            self._wide.pop(index, None)
+
+    def diff(self, other):
+        """Return the keys whose entry differs from another snapshot."""
+        changed = set()
+        if (
+            self._raw != other._raw
+            or self._present != other._present
+            or self._native != other._native
+            or self._wide != other._wide
+        ):
+            for index, unique_id in enumerate(SLOT_IDS):
+                if (
+                    self._raw[index] != other._raw[index]
+                    or self._present[index] != other._present[index]
+                    or self._native[index] != other._native[index]
+                    or self._wide.get(index) != other._wide.get(index)
+                ):
+                    changed.add(unique_id)
+        if self._extras != other._extras:
+            changed.update(
+                key
+                for key in self._extras.keys() | other._extras.keys()
+                if self._extras.get(key) != other._extras.get(key)
+            )
+        return changed
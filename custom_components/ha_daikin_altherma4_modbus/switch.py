@@ -34,14 +34,20 @@ class DaikinCoilSwitch(CoordinatorEntity, SwitchEntity):
     _attr_has_entity_name = True
 
     def __init__(self, coordinator, entry, name, address, unique_id=None, translation_key=None):
-        super().__init__(coordinator)
+        unique_id = unique_id or f"{DOMAIN}_coil_{address}"
+        super().__init__(coordinator, context=frozenset((unique_id,)))
         self._entry = entry
         self._address = address
-        self._attr_unique_id = unique_id or f"{DOMAIN}_coil_{address}"
+        self._attr_unique_id = unique_id
         self._attr_device_info = COIL_DEVICE_INFO
         self._attr_icon = "mdi:power"
         self._attr_translation_key = translation_key
 
+    @property
+    def available(self):
+        """Unavailable once a register failed to read for longer than the max value age."""
+        return super().available and self.coordinator.keys_available(self.coordinator_context)
+
     @property
     def is_on(self):
         """Gibt True zurück, wenn der Wert 1 ist."""
@@ -54,23 +60,21 @@ class DaikinCoilSwitch(CoordinatorEntity, SwitchEntity):
     async def async_turn_on(self, **kwargs):
         """Schaltet das Coil ein."""
         try:
-            result = await self.coordinator.client.write_coil(self._address, True)
+            result = await self.coordinator.async_write_coil(self._address, True)
             if result.isError():
                 _LOGGER.error(f"Failed to turn on coil {self._address}: {result}")
             else:
                 _LOGGER.debug(f"Successfully turned on coil {self._address}")
-                await self.coordinator.async_request_refresh()
         except Exception as e:
             _LOGGER.error(f"Error turning on coil {self._address}: {e}")
 
     async def async_turn_off(self, **kwargs):
         """Schaltet das Coil aus."""
         try:
-            result = await self.coordinator.client.write_coil(self._address, False)
+            result = await self.coordinator.async_write_coil(self._address, False)
             if result.isError():
                 _LOGGER.error(f"Failed to turn off coil {self._address}: {result}")
             else:
                 _LOGGER.debug(f"Successfully turned off coil {self._address}")
-                await self.coordinator.async_request_refresh()
         except Exception as e:
             _LOGGER.error(f"Error turning off coil {self._address}: {e}")
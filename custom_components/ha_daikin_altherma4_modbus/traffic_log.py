@@ -0,0 +1,374 @@
+"""Modbus traffic recorder and offline replay.
+
+The recorder appends every request and response PDU of a coordinator to a
+compact binary log. The file starts with ``TRAFFIC_LOG_MAGIC``, followed by
+records of a fixed header ``<dBHH`` and a payload:
+
+- timestamp: seconds since the start of the recording (time.monotonic)
+- kind: poll start, request, response or failed request
+- exchange: id pairing a response with its request (pipelined reads
+  answer out of order)
+- length of the payload: the PDU including the function code, the error
+  text for a failed request, empty for a poll start
+
+Records are collected in memory and appended by the executor after each
+poll, so recording never blocks the event loop.
+
+``ReplayConnection`` stands in for the connection manager and answers the
+coordinator from such a log: a request is matched with the exchange of the
+same request PDU recorded in the current poll and answered after the
+recorded round-trip time. ``async_replay`` triggers the polls at the
+recorded poll times, in real time or accelerated, and pins the poll tiers
+to the ones read in the recorded poll, so the replay does not depend on
+the replay speed. The replay decodes responses with classes of pymodbus 3.5
+and 3.6; with other versions only recording is available.
+"""
+import asyncio
+import logging
+import os
+import struct
+import time
+from collections import deque
+
+from pymodbus.exceptions import ConnectionException, ModbusIOException
+
+try:
+    # Nur für den Replay nötig und nur in pymodbus bis 3.6 vorhanden: ohne sie
+    # funktioniert der Mitschnitt weiter, nur das Abspielen nicht
+    from pymodbus.bit_read_message import ReadCoilsResponse, ReadDiscreteInputsResponse
+    from pymodbus.factory import ClientDecoder
+    from pymodbus.register_read_message import ReadHoldingRegistersResponse, ReadInputRegistersResponse
+except ImportError:
+    ClientDecoder = None
+
+from .connection import ConnectionManager
+from .const import TRAFFIC_LOG_MAX_BYTES
+from .pipeline import _REQUESTS
+from .read_plan import READ_METHODS
+
+_LOGGER = logging.getLogger(__name__)
+
+TRAFFIC_LOG_MAGIC = b"DAKMBTR1"
+RECORD = struct.Struct("<dBHH")
+
+KIND_POLL = 0
+KIND_REQUEST = 1
+KIND_RESPONSE = 2
+KIND_FAILURE = 3
+
+REPLAY_SUPPORTED = ClientDecoder is not None
+
+# Lese-Function-Codes, die der Replay aus seinem Register-Abbild beantworten kann
+READ_RESPONSES = {
+    1: ReadCoilsResponse,
+    2: ReadDiscreteInputsResponse,
+    3: ReadHoldingRegistersResponse,
+    4: ReadInputRegistersResponse,
+} if REPLAY_SUPPORTED else {}
+BIT_FUNCTION_CODES = (1, 2)
+
+
+def request_pdu(method, **kwargs):
+    """Build the request PDU a pymodbus client method would send."""
+    request = getattr(_REQUESTS, method)(**kwargs)
+    return bytes((request.function_code,)) + request.encode()
+
+
+def response_pdu(response):
+    """Encode a pymodbus response (or exception response) as PDU."""
+    return bytes((response.function_code,)) + response.encode()
+
+
+class TrafficRecorder:
+    """Append the Modbus traffic of one coordinator to a binary log file."""
+
+    def __init__(self, hass, path, max_bytes=TRAFFIC_LOG_MAX_BYTES):
+        self.hass = hass
+        self.path = path
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._buffer = bytearray()
+        self._started = time.monotonic()
+        self._next_exchange = 0
+        self._flush_task = None
+        self.full = False
+
+    def _append(self, kind, exchange, payload=b"", at=None):
+        if self.full:
+            return
+        if at is None:
+            at = time.monotonic()
+        self._buffer += RECORD.pack(at - self._started, kind, exchange, len(payload))
+        self._buffer += payload
+
+    def mark_poll(self):
+        """Record the start of a coordinator poll."""
+        self._append(KIND_POLL, 0)
+
+    def record_request(self, method, **kwargs):
+        """Record a request PDU and return its exchange id."""
+        exchange = self._next_exchange
+        self._next_exchange = (exchange + 1) & 0xFFFF
+        self._append(KIND_REQUEST, exchange, request_pdu(method, **kwargs))
+        return exchange
+
+    def record_response(self, exchange, response):
+        """Record the response PDU of an exchange."""
+        self._append(KIND_RESPONSE, exchange, response_pdu(response))
+
+    def record_failure(self, exchange, err):
+        """Record a request that got no response."""
+        self._append(KIND_FAILURE, exchange, str(err).encode()[:0xFFFF])
+
+    async def async_exchange(self, request, method, **kwargs):
+        """Await a request coroutine of the client and record it with its response."""
+        exchange = self.record_request(method, **kwargs)
+        try:
+            response = await request
+        except Exception as err:
+            self.record_failure(exchange, err)
+            raise
+        self.record_response(exchange, response)
+        return response
+
+    def schedule_flush(self):
+        """Append the collected records in the background."""
+        if self._buffer and self._flush_task is None:
+            self._flush_task = self.hass.async_create_background_task(
+                self._async_background_flush(), "daikin modbus traffic log"
+            )
+
+    async def _async_background_flush(self):
+        try:
+            await self._async_write_buffer()
+        finally:
+            self._flush_task = None
+
+    async def async_flush(self):
+        """Append all collected records, waiting for a running background flush."""
+        if self._flush_task is not None:
+            await self._flush_task
+        await self._async_write_buffer()
+
+    async def _async_write_buffer(self):
+        try:
+            while self._buffer:
+                data = bytes(self._buffer)
+                self._buffer.clear()
+                await self.hass.async_add_executor_job(self._write, data)
+        except OSError as err:
+            _LOGGER.error(f"Modbus-Mitschnitt {self.path} konnte nicht geschrieben werden: {err}")
+            self.full = True
+
+    def _write(self, data):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "ab") as log_file:
+            if log_file.tell() == 0:
+                log_file.write(TRAFFIC_LOG_MAGIC)
+            log_file.write(data)
+            self.size = log_file.tell()
+        if self.size >= self.max_bytes:
+            _LOGGER.warning(f"Modbus-Mitschnitt {self.path} hat {self.max_bytes} Bytes erreicht, Aufzeichnung beendet")
+            self.full = True
+
+
+def read_traffic_log(path):
+    """Return the records of a log file as (timestamp, kind, exchange, payload) tuples."""
+    with open(path, "rb") as log_file:
+        data = log_file.read()
+    if not data.startswith(TRAFFIC_LOG_MAGIC):
+        raise ValueError(f"{path} ist kein Modbus-Mitschnitt")
+    records = []
+    offset = len(TRAFFIC_LOG_MAGIC)
+    while offset + RECORD.size <= len(data):
+        at, kind, exchange, length = RECORD.unpack_from(data, offset)
+        offset += RECORD.size
+        records.append((at, kind, exchange, data[offset : offset + length]))
+        offset += length
+    return records
+
+
+class RecordedExchange:
+    """One request of the log with its answer."""
+
+    __slots__ = ("poll", "request", "requested_at", "answered_at", "response", "error")
+
+    def __init__(self, poll, request, requested_at):
+        self.poll = poll
+        self.request = request
+        self.requested_at = requested_at
+        self.answered_at = requested_at
+        self.response = None
+        self.error = "keine Antwort im Mitschnitt"
+
+
+class ReplayClient:
+    """Stand-in for AsyncModbusTcpClient that answers from a traffic log.
+
+    ``speed`` scales the recorded round-trip times: 1 replays in real time,
+    10 ten times faster, 0 without any delay. ``poll`` is the index of the
+    recorded poll being replayed. A read that was not sent in that poll
+    (a tier that was not due, other block boundaries) is answered from the
+    register image of all responses recorded up to that poll.
+    """
+
+    def __init__(self, records, speed=1.0):
+        if not REPLAY_SUPPORTED:
+            raise RuntimeError("Replay von Modbus-Mitschnitten benötigt pymodbus 3.5 oder 3.6")
+        self.speed = speed
+        self.connected = False
+        self._decoder = ClientDecoder()
+        self._exchanges = []
+        self._pending = {}
+        # Function Code -> {Adresse: Wert} aus den bisher abgespielten Antworten
+        self._image = {function_code: {} for function_code in READ_RESPONSES}
+        self._applied = 0
+        self.poll_times = []
+        # Request-PDUs pro aufgezeichnetem Poll
+        self.poll_requests = []
+        self.poll = 0
+        self.requests = 0
+        self.from_image = 0
+        open_exchanges = {}
+        for at, kind, exchange, payload in records:
+            if kind == KIND_POLL:
+                self.poll_times.append(at)
+                self.poll_requests.append(set())
+            elif kind == KIND_REQUEST:
+                if self.poll_requests:
+                    self.poll_requests[-1].add(payload)
+                recorded = open_exchanges[exchange] = RecordedExchange(len(self.poll_times) - 1, payload, at)
+                self._exchanges.append(recorded)
+                self._pending.setdefault(payload, deque()).append(recorded)
+            elif exchange in open_exchanges:
+                recorded = open_exchanges.pop(exchange)
+                recorded.answered_at = at
+                if kind == KIND_RESPONSE:
+                    recorded.response = payload
+                else:
+                    recorded.error = payload.decode(errors="replace")
+
+    async def connect(self):
+        self.connected = True
+        return True
+
+    def close(self, reconnect=False):
+        self.connected = False
+
+    def _advance(self):
+        """Apply all read responses recorded up to the current poll to the register image."""
+        exchanges = self._exchanges
+        while self._applied < len(exchanges) and exchanges[self._applied].poll <= self.poll:
+            recorded = exchanges[self._applied]
+            self._applied += 1
+            function_code = recorded.request[0]
+            if recorded.response is None or function_code not in self._image:
+                continue
+            response = self._decoder.decode(recorded.response)
+            if response.isError():
+                continue
+            address, count = struct.unpack_from(">HH", recorded.request, 1)
+            values = response.bits[:count] if function_code in BIT_FUNCTION_CODES else response.registers
+            self._image[function_code].update(zip(range(address, address + count), values))
+
+    def _from_image(self, function_code, address, count):
+        image = self._image.get(function_code)
+        if image is None or any(offset not in image for offset in range(address, address + count)):
+            return None
+        self.from_image += 1
+        return READ_RESPONSES[function_code]([image[offset] for offset in range(address, address + count)])
+
+    async def _answer(self, method, **kwargs):
+        if not self.connected:
+            raise ConnectionException("Replay nicht verbunden")
+        self.requests += 1
+        self._advance()
+        pdu = request_pdu(method, **kwargs)
+        pending = self._pending.get(pdu, ())
+        # Antworten früherer Polls (z.B. der schnellen Spur) überspringen
+        while pending and pending[0].poll < self.poll:
+            pending.popleft()
+        if not pending or pending[0].poll != self.poll:
+            response = self._from_image(pdu[0], kwargs.get("address"), kwargs.get("count", 1))
+            if response is None:
+                raise ModbusIOException(f"{method} {kwargs} nicht im Mitschnitt")
+            return response
+
+        recorded = pending.popleft()
+        if self.speed > 0:
+            await asyncio.sleep((recorded.answered_at - recorded.requested_at) / self.speed)
+        if recorded.response is None:
+            raise ModbusIOException(recorded.error)
+        return self._decoder.decode(recorded.response)
+
+    async def read_coils(self, address, count=1, **kwargs):
+        return await self._answer("read_coils", address=address, count=count)
+
+    async def read_discrete_inputs(self, address, count=1, **kwargs):
+        return await self._answer("read_discrete_inputs", address=address, count=count)
+
+    async def read_holding_registers(self, address, count=1, **kwargs):
+        return await self._answer("read_holding_registers", address=address, count=count)
+
+    async def read_input_registers(self, address, count=1, **kwargs):
+        return await self._answer("read_input_registers", address=address, count=count)
+
+    async def write_coil(self, address, value, **kwargs):
+        return await self._answer("write_coil", address=address, value=value)
+
+    async def write_coils(self, address, values, **kwargs):
+        return await self._answer("write_coils", address=address, values=values)
+
+    async def write_register(self, address, value, **kwargs):
+        return await self._answer("write_register", address=address, value=value)
+
+    async def write_registers(self, address, values, **kwargs):
+        return await self._answer("write_registers", address=address, values=values)
+
+
+class ReplayConnection(ConnectionManager):
+    """Connection manager whose client answers from a traffic log."""
+
+    def __init__(self, path, speed=1.0, max_in_flight=1):
+        super().__init__("replay", 0, max_in_flight=max_in_flight)
+        self.key = ("replay", path, False)
+        self.client = ReplayClient(read_traffic_log(path), speed)
+
+
+def _recorded_tiers(coordinator, requests):
+    """Return the poll tiers whose read plan was sent in a recorded poll.
+
+    Picks the largest plan whose requests all appear in the poll; if none
+    does (trace of a different register map), all tiers are read and
+    answered from the register image.
+    """
+    best, best_count = None, -1
+    for tiers, plan in coordinator.read_plans.items():
+        pdus = {
+            request_pdu(READ_METHODS[block.function], address=block.start, count=block.count)
+            for block in plan.blocks
+        }
+        if pdus <= requests and len(pdus) > best_count:
+            best, best_count = tiers, len(pdus)
+    return best if best is not None else max(coordinator.read_plans, key=len)
+
+
+async def async_replay(coordinator, speed=1.0):
+    """Run one coordinator poll per recorded poll, at the recorded poll times.
+
+    ``speed`` 0 polls back to back. Returns the number of polls.
+    """
+    client = coordinator.connection.client
+    started = time.monotonic()
+    try:
+        for poll, poll_at in enumerate(client.poll_times):
+            if speed > 0:
+                delay = poll_at / speed - (time.monotonic() - started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            client.poll = poll
+            coordinator.pinned_tiers = _recorded_tiers(coordinator, client.poll_requests[poll])
+            await coordinator.async_refresh()
+    finally:
+        coordinator.pinned_tiers = None
+    return len(client.poll_times)
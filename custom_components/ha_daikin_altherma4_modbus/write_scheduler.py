@@ -0,0 +1,165 @@
+"""Write scheduler for the Daikin Altherma 4 coordinator.
+
+Dragging a slider produces a burst of writes to the same register. The
+scheduler waits until no write was queued for the debounce time (at most
+``WRITE_DEBOUNCE_MAX_DELAY`` after the first one), keeps only the last
+value per address, drops values the device already has according to a
+recent read and sends adjacent
+addresses as one FC16 (holding registers) or FC15 (coils) request. The
+Altherma's change-based algorithm and its EEPROM both benefit from fewer,
+larger writes. Flushes run one after another, so two batches for the same
+register reach the device in the order they were queued.
+"""
+import asyncio
+import logging
+
+from .const import MODBUS_MAX_WRITE_REGISTERS, MODBUS_MAX_WRITE_BITS, WRITE_DEBOUNCE_MAX_DELAY
+from .read_plan import FUNCTION_COIL, FUNCTION_HOLDING
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SkippedWrite:
+    """Result of a write that was dropped because the value is already set."""
+
+    def isError(self):
+        return False
+
+    def __repr__(self):
+        return "SkippedWrite"
+
+
+def group_adjacent(addresses, max_count):
+    """Split sorted addresses into runs of consecutive addresses of at most max_count."""
+    runs = []
+    for address in sorted(addresses):
+        if runs and address == runs[-1][-1] + 1 and len(runs[-1]) < max_count:
+            runs[-1].append(address)
+        else:
+            runs.append([address])
+    return runs
+
+
+class WriteScheduler:
+    """Debounce, deduplicate and batch writes to holding registers and coils."""
+
+    def __init__(self, coordinator, debounce, max_cache_age):
+        self._coordinator = coordinator
+        self._debounce = debounce
+        # Nur ein so junger Lesewert belegt, dass das Gerät den Wert schon hat
+        self._max_cache_age = max_cache_age
+        # function -> {address: (value, [futures])}
+        self._pending = {FUNCTION_HOLDING: {}, FUNCTION_COIL: {}}
+        # function -> Adressen des gerade gesendeten Batches
+        self._sending = {FUNCTION_HOLDING: set(), FUNCTION_COIL: set()}
+        self._timer = None
+        # Loop-Zeit, zu der spätestens geschrieben wird
+        self._deadline = None
+        self._lock = asyncio.Lock()
+
+    async def async_write(self, function, address, value):
+        """Queue a write and wait for the result of the request that carried it."""
+        pending = self._pending[function]
+        # Während ein Batch die Adresse schreibt, ist der Snapshot-Wert schon überholt
+        if (
+            address not in pending
+            and address not in self._sending[function]
+            and self._already_set(function, address, value)
+        ):
+            _LOGGER.debug(f"Schreiben {function} {address} übersprungen, Wert {value} bereits gesetzt")
+            return SkippedWrite()
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        futures = pending[address][1] if address in pending else []
+        futures.append(future)
+        # Nur der letzte Wert bis zum Schreiben wird gesendet
+        pending[address] = (value, futures)
+        # Jeder neue Wert startet die Ruhezeit neu, höchstens bis zur Frist ab dem ersten
+        if self._timer is None:
+            self._deadline = loop.time() + max(self._debounce, WRITE_DEBOUNCE_MAX_DELAY)
+        else:
+            self._timer.cancel()
+        self._timer = loop.call_at(min(loop.time() + self._debounce, self._deadline), self._start_flush)
+        return await future
+
+    def _already_set(self, function, address, value):
+        """Return True if a recent read shows the device already has the value."""
+        # Ältere Werte können inzwischen am Bedienteil geändert worden sein
+        return self._coordinator.cached_value(function, address, self._max_cache_age) == value
+
+    def _start_flush(self):
+        self._timer = None
+        self._coordinator.hass.async_create_task(self.async_flush())
+
+    async def async_flush(self):
+        """Send all pending writes now, after a flush that is still sending."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        async with self._lock:
+            for function, pending in self._pending.items():
+                if not pending:
+                    continue
+                batch = dict(pending)
+                pending.clear()
+                self._sending[function] = set(batch)
+                try:
+                    await self._send_batch(function, batch)
+                finally:
+                    self._sending[function] = set()
+
+    async def _send_batch(self, function, batch):
+        """Send the writes of one function, adjacent addresses in one request."""
+        # Werte, die das Gerät inzwischen schon hat, nicht erneut schreiben
+        for address, (value, futures) in list(batch.items()):
+            if self._already_set(function, address, value):
+                del batch[address]
+                _resolve(futures, SkippedWrite())
+
+        max_count = MODBUS_MAX_WRITE_REGISTERS if function == FUNCTION_HOLDING else MODBUS_MAX_WRITE_BITS
+        for run in group_adjacent(batch, max_count):
+            values = [batch[address][0] for address in run]
+            futures = [future for address in run for future in batch[address][1]]
+            try:
+                result = await self._send(function, run[0], values)
+            except Exception as err:
+                _LOGGER.debug(f"Schreiben {function} {run[0]}-{run[-1]} fehlgeschlagen: {err}")
+                _reject(futures, err)
+                continue
+            if not result.isError():
+                self._coordinator.apply_writes(function, dict(zip(run, values)))
+            _resolve(futures, result)
+
+    async def _send(self, function, address, values):
+        """Issue one single or multi write request."""
+        client = await self._coordinator.connection.async_get_client()
+        if function == FUNCTION_HOLDING:
+            if len(values) == 1:
+                method, kwargs = "write_register", {"address": address, "value": values[0]}
+            else:
+                _LOGGER.debug(f"FC16: {len(values)} Holding-Register ab {address} in einer Anfrage")
+                method, kwargs = "write_registers", {"address": address, "values": values}
+        elif len(values) == 1:
+            method, kwargs = "write_coil", {"address": address, "value": bool(values[0])}
+        else:
+            _LOGGER.debug(f"FC15: {len(values)} Coils ab {address} in einer Anfrage")
+            method, kwargs = "write_coils", {"address": address, "values": [bool(value) for value in values]}
+
+        request = getattr(client, method)(**kwargs)
+        recorder = self._coordinator.recorder
+        if recorder is not None:
+            request = recorder.async_exchange(request, method, **kwargs)
+        return await request
+
+
+def _resolve(futures, result):
+    for future in futures:
+        if not future.done():
+            future.set_result(result)
+
+
+def _reject(futures, err):
+    for future in futures:
+        if not future.done():
+            future.set_exception(err)
@@ -0,0 +1,5 @@
+"""Make the integration importable as ``custom_components.ha_daikin_altherma4_modbus``."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,32 @@
+"""Tests for the validation of the poll settings in the config and options flow."""
+import pytest
+import voluptuous as vol
+
+from custom_components.ha_daikin_altherma4_modbus.config_flow import POSITIVE_INT, _validate_intervals
+
+
+def test_default_intervals_are_valid():
+    assert _validate_intervals({"scan_interval": 10}) == {}
+
+
+@pytest.mark.parametrize(
+    ("user_input", "error"),
+    [
+        ({"scan_interval": 10, "fast_scan_interval": 11}, "fast_scan_interval"),
+        ({"scan_interval": 10, "slow_scan_interval": 9}, "slow_scan_interval"),
+        ({"scan_interval": 10, "max_in_flight": 0}, "max_in_flight"),
+        ({"scan_interval": 30, "idle_scan_interval": 20}, "idle_scan_interval"),
+    ],
+)
+def test_intervals_out_of_order(user_input, error):
+    assert list(_validate_intervals(user_input)) == [error]
+
+
+def test_idle_scan_interval_zero_keeps_interval_fixed():
+    assert _validate_intervals({"scan_interval": 30, "idle_scan_interval": 0}) == {}
+
+
+def test_zero_interval_is_rejected():
+    assert POSITIVE_INT(1) == 1
+    with pytest.raises(vol.Invalid):
+        POSITIVE_INT(0)
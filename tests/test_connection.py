@@ -0,0 +1,52 @@
+"""Tests for the shared connection manager."""
+import asyncio
+import logging
+from types import SimpleNamespace
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.ha_daikin_altherma4_modbus.connection import acquire_connection, release_connection
+from custom_components.ha_daikin_altherma4_modbus.coordinator import DaikinAlthermaCoordinator
+
+
+def test_shared_connection_uses_strictest_in_flight_limit(caplog):
+    hass = SimpleNamespace(data={})
+    first, second, third = object(), object(), object()
+    manager = acquire_connection(hass, "192.0.2.1", 502, first, max_in_flight=4)
+    with caplog.at_level(logging.WARNING):
+        assert acquire_connection(hass, "192.0.2.1", 502, second, max_in_flight=2) is manager
+        assert manager.max_in_flight == 2
+        # Ein höheres Limit eines weiteren Eintrags lockert die Grenze nicht
+        acquire_connection(hass, "192.0.2.1", 502, third, max_in_flight=8)
+        assert manager.max_in_flight == 2
+    assert len(caplog.records) == 2
+    for user in (first, second, third):
+        release_connection(hass, manager, user)
+    assert not hass.data["ha_daikin_altherma4_modbus_connections"]
+
+
+def test_coordinator_shutdown_releases_connection_once(tmp_path):
+    async def run():
+        hass = HomeAssistant(str(tmp_path))
+        coordinator = DaikinAlthermaCoordinator(hass, "192.0.2.1", 502, 10, False)
+        other = object()
+        manager = acquire_connection(hass, "192.0.2.1", 502, other)
+        flushes = []
+        flush = coordinator._write_scheduler.async_flush
+
+        async def counted_flush():
+            flushes.append(True)
+            await flush()
+
+        coordinator._write_scheduler.async_flush = counted_flush
+        # Einmal aus dem Setup, einmal über entry.async_on_unload
+        await coordinator.async_shutdown()
+        await coordinator.async_shutdown()
+        result = len(flushes), set(manager.users)
+        release_connection(hass, manager, other)
+        await hass.async_stop(force=True)
+        return result, other
+
+    (flushes, users), other = asyncio.run(run())
+    assert flushes == 1
+    assert users == {other}
@@ -0,0 +1,104 @@
+"""Tests for the rolling and seasonal COP windows."""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from custom_components.ha_daikin_altherma4_modbus.const import ENERGY_MODE_COOLING, ENERGY_MODE_HEATING
+from custom_components.ha_daikin_altherma4_modbus.cop_windows import (
+    CopWindows,
+    RollingWindow,
+    SeasonWindow,
+)
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _window(now, buckets=4):
+    window = RollingWindow(bucket_seconds=60, buckets=buckets)
+    window.advance(now)
+    return window
+
+
+def test_rolling_window_drops_buckets_that_leave_the_window():
+    window = _window(START)
+    window.add(3.0, 1.0)
+    window.advance(START + timedelta(minutes=2))
+    window.add(6.0, 2.0)
+
+    window.advance(START + timedelta(minutes=3))
+    assert (window.heat, window.electric) == (9.0, 3.0)
+    assert window.cop == 3.0
+
+    # Der erste Bucket fällt heraus, der zweite bleibt
+    window.advance(START + timedelta(minutes=4))
+    assert (window.heat, window.electric) == (6.0, 2.0)
+    window.advance(START + timedelta(minutes=6))
+    assert (window.heat, window.electric) == (0.0, 0.0)
+    assert window.cop is None
+
+
+def test_rolling_window_clears_after_gap_longer_than_window():
+    window = _window(START)
+    window.add(3.0, 1.0)
+
+    window.advance(START + timedelta(hours=1))
+    window.add(2.0, 1.0)
+
+    assert (window.heat, window.electric) == (2.0, 1.0)
+
+
+def test_rolling_window_keeps_counting_when_clock_goes_back():
+    window = _window(START + timedelta(minutes=2))
+    window.add(3.0, 1.0)
+
+    window.advance(START)
+    window.add(3.0, 1.0)
+
+    assert (window.heat, window.electric) == (6.0, 2.0)
+
+
+def test_rolling_window_storage_round_trip():
+    window = _window(START)
+    window.add(3.0, 1.0)
+
+    restored = RollingWindow(bucket_seconds=60, buckets=4)
+    restored.load(window.as_dict())
+    assert (restored.heat, restored.electric) == (3.0, 1.0)
+
+    # Geänderte Fenstergröße: gespeicherte Buckets verwerfen
+    resized = RollingWindow(bucket_seconds=60, buckets=8)
+    resized.load(window.as_dict())
+    assert (resized.heat, resized.electric) == (0.0, 0.0)
+
+
+def test_season_window_starts_over_in_start_month():
+    window = SeasonWindow()
+    window.advance(datetime(2026, 8, 31, tzinfo=timezone.utc))
+    window.add(3.0, 1.0)
+
+    window.advance(datetime(2026, 9, 1, tzinfo=timezone.utc))
+
+    assert window.season == 2026
+    assert (window.heat, window.electric) == (0.0, 0.0)
+
+
+def test_cop_windows_skip_cooling_intervals():
+    windows = CopWindows()
+
+    changed = windows.update(START, (ENERGY_MODE_HEATING, 0.3, 0.1))
+    windows.update(START, (ENERGY_MODE_COOLING, 0.5, 0.1))
+
+    assert changed == set(windows.windows)
+    for cop, heat, electric in windows.values().values():
+        assert cop == pytest.approx(3.0)
+        assert (heat, electric) == (0.3, 0.1)
+
+
+def test_cop_windows_are_computed_once_per_update():
+    windows = CopWindows()
+    windows.update(START, (ENERGY_MODE_HEATING, 0.3, 0.1))
+    current = windows.current
+
+    assert windows.values() is current
+    windows.update(START, (ENERGY_MODE_HEATING, 0.3, 0.1))
+    assert windows.current is not current
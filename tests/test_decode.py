@@ -0,0 +1,56 @@
+"""Tests for decoding register blocks into native values."""
+from custom_components.ha_daikin_altherma4_modbus.const import DOMAIN
+from custom_components.ha_daikin_altherma4_modbus.read_plan import (
+    READ_PLAN,
+    UNSUPPORTED_VALUE,
+    VALUE_SPECS,
+    decode_block,
+    native_value,
+)
+from custom_components.ha_daikin_altherma4_modbus.snapshot import RegisterSnapshot
+
+SIGNED_ID = f"{DOMAIN}_input_40"
+UNSIGNED_ID = f"{DOMAIN}_input_66"
+
+
+def _block_with(unique_id):
+    return next(block for block in READ_PLAN.blocks if any(slot.unique_id == unique_id for slot in block.slots))
+
+
+def _decode(block, **values_by_id):
+    values = [0] * block.count
+    for slot in block.slots:
+        if slot.unique_id in values_by_id:
+            values[slot.offset] = values_by_id[slot.unique_id]
+    snapshot = RegisterSnapshot()
+    decode_block(block, values, snapshot)
+    return snapshot
+
+
+def test_specs_follow_register_dtype():
+    assert VALUE_SPECS[SIGNED_ID].signed
+    assert not VALUE_SPECS[UNSIGNED_ID].signed
+
+
+def test_int16_above_32767_is_negative():
+    block = _block_with(SIGNED_ID)
+    snapshot = _decode(block, **{SIGNED_ID: 65536 - 250})
+
+    assert snapshot[SIGNED_ID]["value"] == 65536 - 250
+    assert snapshot[SIGNED_ID]["native_value"] == -2.5
+    assert native_value(SIGNED_ID, 65536 - 250) == -2.5
+
+
+def test_uint16_above_32767_stays_positive():
+    block = _block_with(UNSIGNED_ID)
+    snapshot = _decode(block, **{UNSIGNED_ID: 40000})
+
+    assert snapshot[UNSIGNED_ID]["native_value"] == 40000
+    assert native_value(UNSIGNED_ID, 40000) == 40000
+
+
+def test_unsupported_value_is_dropped():
+    block = _block_with(SIGNED_ID)
+    snapshot = _decode(block, **{SIGNED_ID: UNSUPPORTED_VALUE})
+
+    assert SIGNED_ID not in snapshot
@@ -0,0 +1,33 @@
+"""Tests for the redaction of the config entry diagnostics."""
+import asyncio
+import json
+from types import SimpleNamespace
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.json import JSONEncoder
+from pymodbus.exceptions import ConnectionException
+
+from custom_components.ha_daikin_altherma4_modbus import diagnostics
+from custom_components.ha_daikin_altherma4_modbus.const import DOMAIN
+from custom_components.ha_daikin_altherma4_modbus.coordinator import DaikinAlthermaCoordinator
+
+HOST = "192.0.2.17"
+
+
+def test_host_is_redacted_everywhere(tmp_path):
+    async def run():
+        hass = HomeAssistant(str(tmp_path))
+        coordinator = DaikinAlthermaCoordinator(hass, HOST, 502, 10, False)
+        # Fehlertext wie von pymodbus, mit der Adresse des Adapters
+        coordinator.connection.record_failure(ConnectionException(f"Failed to connect[ModbusTcpClient {HOST}:502]"))
+        entry = SimpleNamespace(entry_id="test", data={"host": HOST, "port": 502}, options={})
+        hass.data[DOMAIN] = {entry.entry_id: coordinator}
+        result = await diagnostics.async_get_config_entry_diagnostics(hass, entry)
+        await coordinator.async_shutdown()
+        await hass.async_stop(force=True)
+        return result
+
+    result = asyncio.run(run())
+    assert result["connection"]["last_error"]
+    assert HOST not in json.dumps(result, cls=JSONEncoder)
+    assert result["entry"]["data"]["host"] == diagnostics.REDACTED
@@ -0,0 +1,46 @@
+"""Tests for rising-edge detection on packed states."""
+from custom_components.ha_daikin_altherma4_modbus.edge_tracker import (
+    EDGE_GROUP_BINARY,
+    EDGE_GROUP_DISCRETE,
+    EdgeGroup,
+    EdgeTracker,
+)
+from custom_components.ha_daikin_altherma4_modbus.snapshot import RegisterSnapshot
+
+
+def _group():
+    states = EdgeTracker().groups[EDGE_GROUP_BINARY]
+    return EdgeGroup("test", list(zip(states.unique_ids[:3], (101, 102, 103), (1, 1, 1))))
+
+
+def test_feed_reports_only_rising_edges():
+    group = _group()
+
+    assert group.feed(0b101) == [101, 103]
+    # Bleibt an: keine neue Flanke
+    assert group.feed(0b101) == []
+    # 103 fällt ab, 102 steigt
+    assert group.feed(0b011) == [102]
+    assert group.feed(0b000) == []
+    assert group.feed(0b100) == [103]
+
+
+def test_feed_ignores_unknown_unique_ids():
+    states = EdgeTracker().groups[EDGE_GROUP_BINARY]
+    group = EdgeGroup("test", [("unknown", 1, 1), (states.unique_ids[0], 2, 1)])
+
+    assert group.addresses == (2,)
+    assert group.feed(0b1) == [2]
+
+
+def test_tracker_update_uses_on_value_per_state():
+    tracker = EdgeTracker()
+    group = tracker.groups[EDGE_GROUP_DISCRETE]
+    unique_id, address = group.unique_ids[0], group.addresses[0]
+    snapshot = RegisterSnapshot()
+
+    snapshot.store(unique_id, 0)
+    assert tracker.update(snapshot, when="t0") == {}
+    snapshot.store(unique_id, 1)
+    assert tracker.update(snapshot, when="t1") == {address: "t1"}
+    assert tracker.update(snapshot, when="t2") == {}
@@ -0,0 +1,105 @@
+"""Tests for the trapezoidal energy integration per operating mode."""
+import pytest
+
+from custom_components.ha_daikin_altherma4_modbus.const import (
+    DOMAIN,
+    ENERGY_KIND_ELECTRIC,
+    ENERGY_KIND_HEAT,
+    ENERGY_MAX_GAP,
+    ENERGY_MODE_COOLING,
+    ENERGY_MODE_DHW,
+    ENERGY_MODE_HEATING,
+)
+from custom_components.ha_daikin_altherma4_modbus.energy import (
+    ELECTRIC_POWER_KEY,
+    HEAT_POWER_KEY,
+    OPERATION_MODE_COOLING,
+    OPERATION_MODE_KEY,
+    VALVE_DHW,
+    VALVE_KEY,
+    EnergyAccumulator,
+)
+
+
+def _data(heat, electric, valve=0, operation_mode=1):
+    return {
+        HEAT_POWER_KEY: heat,
+        ELECTRIC_POWER_KEY: electric,
+        VALVE_KEY: {"value": valve},
+        OPERATION_MODE_KEY: {"value": operation_mode},
+    }
+
+
+def test_trapezoid_over_one_interval():
+    energy = EnergyAccumulator()
+
+    assert energy.update(0, _data(2000, 500)) == set()
+    changed = energy.update(360, _data(4000, 1500))
+
+    # Mittelwert 3000 W bzw. 1000 W über 0,1 h
+    assert energy.counters[ENERGY_KIND_HEAT, ENERGY_MODE_HEATING] == pytest.approx(0.3)
+    assert energy.counters[ENERGY_KIND_ELECTRIC, ENERGY_MODE_HEATING] == pytest.approx(0.1)
+    assert energy.last_interval == (ENERGY_MODE_HEATING, pytest.approx(0.3), pytest.approx(0.1))
+    assert f"{DOMAIN}_heat_energy" in changed
+    assert f"{DOMAIN}_heat_energy_dhw" not in changed
+
+
+def test_interval_is_booked_on_mode_at_its_start():
+    energy = EnergyAccumulator()
+
+    energy.update(0, _data(3000, 1000, valve=VALVE_DHW))
+    # Ventil schon zurück auf Heizen, das Intervall zählt noch als Warmwasser
+    energy.update(360, _data(3000, 1000))
+    energy.update(720, _data(3000, 1000))
+
+    assert energy.counters[ENERGY_KIND_HEAT, ENERGY_MODE_DHW] == pytest.approx(0.3)
+    assert energy.counters[ENERGY_KIND_HEAT, ENERGY_MODE_HEATING] == pytest.approx(0.3)
+    assert energy.value(f"{DOMAIN}_heat_energy") == pytest.approx(0.6)
+
+
+def test_cooling_counts_heat_removal_only():
+    energy = EnergyAccumulator()
+
+    energy.update(0, _data(-2000, 800, operation_mode=OPERATION_MODE_COOLING))
+    energy.update(360, _data(1000, 800, operation_mode=OPERATION_MODE_COOLING))
+
+    # Positive Wärmeleistung (z.B. Abtauen) zählt beim Kühlen als 0
+    assert energy.counters[ENERGY_KIND_HEAT, ENERGY_MODE_COOLING] == pytest.approx(0.1)
+    assert energy.counters[ENERGY_KIND_HEAT, ENERGY_MODE_HEATING] == 0
+
+
+def test_missing_power_or_long_gap_starts_new_segment():
+    energy = EnergyAccumulator()
+
+    energy.update(0, _data(3000, 1000))
+    energy.update(360, {HEAT_POWER_KEY: 3000})
+    energy.update(720, _data(3000, 1000))
+    energy.update(720 + ENERGY_MAX_GAP + 1, _data(3000, 1000))
+
+    assert energy.counters[ENERGY_KIND_HEAT, ENERGY_MODE_HEATING] == 0
+    assert energy.last_interval is None
+
+
+def test_counters_survive_storage_round_trip():
+    energy = EnergyAccumulator()
+    energy.update(0, _data(3000, 1000))
+    energy.update(360, _data(3000, 1000))
+
+    restored = EnergyAccumulator()
+    restored.load({**energy.as_dict(), "unknown": 1, f"{ENERGY_KIND_HEAT}_{ENERGY_MODE_DHW}": "x"})
+
+    assert restored.counters == energy.counters
+
+
+def test_totals_are_computed_once_per_update():
+    energy = EnergyAccumulator()
+    energy.update(0, _data(3000, 1000))
+    energy.update(360, _data(3000, 1000))
+    totals = energy.totals
+
+    # Lesen der Sensorwerte rechnet nicht neu
+    assert energy.value(f"{DOMAIN}_heat_energy") == pytest.approx(0.3)
+    assert energy.totals is totals
+    energy.update(720, _data(3000, 1000))
+    assert energy.totals is not totals
+    assert energy.value(f"{DOMAIN}_heat_energy") == pytest.approx(0.6)
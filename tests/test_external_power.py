@@ -0,0 +1,78 @@
+"""Tests for following the external power sensor."""
+import asyncio
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.ha_daikin_altherma4_modbus.const import DOMAIN, EXTERNAL_ELECTRIC_POWER_KEY
+from custom_components.ha_daikin_altherma4_modbus.coordinator import DaikinAlthermaCoordinator
+
+POWER_SENSOR = "sensor.heat_pump_power"
+
+
+class _Response:
+    def __init__(self, block):
+        self.registers = [0] * block.count
+        self.bits = [False] * block.count
+
+    def isError(self):
+        return False
+
+
+class _Connection:
+    connected = True
+
+    async def async_get_client(self):
+        return None
+
+    def record_success(self):
+        pass
+
+
+def _coordinator(hass):
+    coordinator = DaikinAlthermaCoordinator(hass, "127.0.0.1", 502, 10, False, electric_power_sensor=POWER_SENSOR)
+    coordinator.connection = _Connection()
+    coordinator.async_start_external_power()
+    return coordinator
+
+
+def test_poll_uses_power_from_before_a_slow_read(tmp_path):
+    async def run():
+        hass = HomeAssistant(str(tmp_path))
+        hass.states.async_set(POWER_SENSOR, "500")
+        coordinator = _coordinator(hass)
+
+        async def slow_read(blocks):
+            # Der Zähler meldet, während der Adapter noch antwortet
+            await asyncio.sleep(0.01)
+            hass.states.async_set(POWER_SENSOR, "2000")
+            await hass.async_block_till_done()
+            return [_Response(block) for block in blocks]
+
+        coordinator._read_blocks = slow_read
+        data = await coordinator._async_update_data()
+        result = data[EXTERNAL_ELECTRIC_POWER_KEY], coordinator.external_power.value
+        coordinator.external_power.async_stop()
+        await hass.async_stop(force=True)
+        return result
+
+    polled, latest = asyncio.run(run())
+    assert polled == 500
+    assert latest == 2000
+
+
+def test_repeated_value_is_not_recomputed(tmp_path):
+    async def run():
+        hass = HomeAssistant(str(tmp_path))
+        hass.states.async_set(POWER_SENSOR, "500")
+        coordinator = _coordinator(hass)
+        reports = []
+        coordinator.external_power._on_report = reports.append
+
+        hass.states.async_set(POWER_SENSOR, "500", {"friendly_name": "Wärmepumpe"})
+        hass.states.async_set(POWER_SENSOR, "700", {"friendly_name": "Wärmepumpe"})
+        await hass.async_block_till_done()
+        coordinator.external_power.async_stop()
+        await hass.async_stop(force=True)
+        return reports
+
+    assert asyncio.run(run()) == [700.0]
@@ -0,0 +1,24 @@
+"""Tests for the change detection of the link sensors."""
+from types import SimpleNamespace
+
+from custom_components.ha_daikin_altherma4_modbus.const import DOMAIN, LINK_SENSORS
+from custom_components.ha_daikin_altherma4_modbus.link_metrics import LinkMetrics
+
+BLOCK = SimpleNamespace(function="input", start=20, count=63)
+OK = SimpleNamespace(isError=lambda: False)
+
+
+def test_first_call_reports_all_link_sensors():
+    assert LinkMetrics().changed_keys() == {link["unique_id"] for link in LINK_SENSORS}
+
+
+def test_only_changed_link_sensors_are_reported():
+    metrics = LinkMetrics()
+    metrics.record_response(BLOCK, 0.010, OK)
+    metrics.changed_keys()
+    # Gleiche Latenz: nur der Anfragezähler ändert sich
+    metrics.record_response(BLOCK, 0.010, OK)
+    assert metrics.changed_keys() == {f"{DOMAIN}_link_requests"}
+    metrics.record_response(BLOCK, 0.030, OK)
+    assert metrics.changed_keys() == {f"{DOMAIN}_link_requests", f"{DOMAIN}_link_input_latency"}
+    assert metrics.changed_keys() == set()
@@ -0,0 +1,59 @@
+"""Tests for the pipelined read helpers."""
+import asyncio
+import logging
+from types import SimpleNamespace
+
+from pymodbus.client.mixin import ModbusClientMixin
+
+from custom_components.ha_daikin_altherma4_modbus import pipeline
+from custom_components.ha_daikin_altherma4_modbus.pipeline import (
+    _RequestFactory,
+    async_read_pipelined,
+    request_timeout,
+    supports_pipelining,
+)
+
+
+def test_request_factory_accepts_both_execute_signatures():
+    request = _RequestFactory().read_input_registers(address=10, count=4)
+    assert (request.function_code, request.address, request.count) == (4, 10, 4)
+    # Aufruf wie in pymodbus >= 3.7
+    assert _RequestFactory().execute(False, request) is request
+
+
+def test_request_timeout_prefers_request_timeout():
+    assert request_timeout(SimpleNamespace(comm_params=SimpleNamespace(timeout_connect=3))) == 3
+    client = SimpleNamespace(comm_params=SimpleNamespace(timeout_connect=10, timeout_request=2))
+    assert request_timeout(client) == 2
+
+
+class _SequentialClient(ModbusClientMixin):
+    """Client without transaction internals, e.g. a newer pymodbus."""
+
+    def __init__(self):
+        super().__init__()
+        self.transaction = SimpleNamespace()
+        self.framer = SimpleNamespace()
+        self.comm_params = SimpleNamespace(timeout_connect=3)
+        self.calls = []
+
+    def build_response(self, tid):
+        raise AssertionError("not pipelined")
+
+    def send(self, packet):
+        raise AssertionError("not pipelined")
+
+    async def read_holding_registers(self, address, count):
+        self.calls.append((address, count))
+        return "response"
+
+
+def test_falls_back_to_sequential_reads_with_one_warning(caplog, monkeypatch):
+    monkeypatch.setattr(pipeline, "_warned_fallback", False)
+    client = _SequentialClient()
+    assert not supports_pipelining(client)
+    with caplog.at_level(logging.WARNING):
+        for _ in range(2):
+            assert asyncio.run(async_read_pipelined(client, "read_holding_registers", 5, 3)) == "response"
+    assert client.calls == [(5, 3), (5, 3)]
+    assert len([record for record in caplog.records if record.levelno == logging.WARNING]) == 1
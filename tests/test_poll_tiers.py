@@ -0,0 +1,39 @@
+"""Tests for the poll tier intervals and the adaptive tick."""
+import asyncio
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.ha_daikin_altherma4_modbus.const import POLL_TIER_FAST, POLL_TIER_NORMAL, POLL_TIER_SLOW
+from custom_components.ha_daikin_altherma4_modbus.coordinator import DaikinAlthermaCoordinator
+
+
+def _run(config_dir, test):
+    async def run():
+        hass = HomeAssistant(str(config_dir))
+        coordinator = DaikinAlthermaCoordinator(hass, "127.0.0.1", 502, 10, False, idle_scan_interval=60)
+        try:
+            return test(coordinator)
+        finally:
+            await hass.async_stop(force=True)
+
+    return asyncio.run(run())
+
+
+def test_default_tick_is_the_scan_interval(tmp_path):
+    assert _run(tmp_path, lambda coordinator: coordinator.update_interval.total_seconds()) == 10
+
+
+def test_adaptive_tick_keeps_configured_intervals(tmp_path):
+    def test(coordinator):
+        configured = dict(coordinator.tier_intervals)
+        coordinator._apply_scan_interval(40)
+        stretched = {tier: coordinator.tier_interval(tier) for tier in configured}
+        unchanged = coordinator.tier_intervals == configured
+        coordinator._apply_scan_interval(10)
+        restored = {tier: coordinator.tier_interval(tier) for tier in configured}
+        return configured, stretched, unchanged, restored
+
+    configured, stretched, unchanged, restored = _run(tmp_path, test)
+    assert unchanged
+    assert stretched == {POLL_TIER_FAST: 40, POLL_TIER_NORMAL: 40, POLL_TIER_SLOW: configured[POLL_TIER_SLOW]}
+    assert restored == configured
@@ -0,0 +1,62 @@
+"""Tests for coalescing register spans into read blocks."""
+import pytest
+
+from custom_components.ha_daikin_altherma4_modbus.read_plan import (
+    FUNCTION_COIL,
+    FUNCTION_DISCRETE_INPUT,
+    FUNCTION_INPUT,
+    MODBUS_MAX_READ_BITS,
+    MODBUS_MAX_READ_REGISTERS,
+    READ_PLAN,
+    coalesce_blocks,
+    plan_blocks,
+)
+
+
+def test_plan_blocks_merges_within_gap():
+    assert plan_blocks([(0, 1), (2, 2), (10, 1)], max_gap=1, max_count=125) == [(0, 4), (10, 1)]
+
+
+def test_plan_blocks_keeps_gap_larger_than_limit():
+    assert plan_blocks([(0, 1), (3, 1)], max_gap=1, max_count=125) == [(0, 1), (3, 1)]
+
+
+def test_plan_blocks_merges_overlapping_and_unsorted_spans():
+    assert plan_blocks([(5, 2), (0, 4), (3, 3)], max_gap=0, max_count=125) == [(0, 7)]
+
+
+def test_plan_blocks_splits_at_pdu_limit():
+    spans = [(address, 1) for address in range(130)]
+    assert plan_blocks(spans, max_gap=0, max_count=125) == [(0, 125), (125, 5)]
+
+
+def test_plan_blocks_rejects_span_above_pdu_limit():
+    with pytest.raises(ValueError):
+        plan_blocks([(0, 126)], max_gap=0, max_count=125)
+
+
+def test_read_plan_respects_pdu_limit():
+    for block in READ_PLAN.blocks:
+        is_bit = block.function in (FUNCTION_DISCRETE_INPUT, FUNCTION_COIL)
+        assert block.count <= (MODBUS_MAX_READ_BITS if is_bit else MODBUS_MAX_READ_REGISTERS)
+        for slot in block.slots:
+            assert 0 <= slot.offset and slot.stop <= block.count
+
+
+def test_coalesce_blocks_reads_overlapping_retries_once():
+    blocks = READ_PLAN.input_blocks
+    first = blocks[0]
+    # Ein fehlgeschlagener Teilblock, der innerhalb des ersten Plan-Blocks liegt
+    retry = type(first)(
+        function=first.function,
+        start=first.start,
+        count=first.slots[0].stop,
+        is_bit=first.is_bit,
+        slots=first.slots[:1],
+    )
+
+    coalesced = coalesce_blocks(blocks + (retry,))
+
+    assert [block for block in coalesced if block.function == FUNCTION_INPUT] == list(blocks)
+    unique_ids = [slot.unique_id for block in coalesced for slot in block.slots]
+    assert len(unique_ids) == len(set(unique_ids))
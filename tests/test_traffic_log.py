@@ -0,0 +1,44 @@
+"""Tests for the traffic recorder on pymodbus versions without the replay classes."""
+import asyncio
+import importlib
+import sys
+
+import pytest
+
+PACKAGE = "custom_components.ha_daikin_altherma4_modbus"
+# Module, die es ab pymodbus 3.7 nicht mehr gibt
+LEGACY_MODULES = ("pymodbus.bit_read_message", "pymodbus.factory", "pymodbus.register_read_message")
+
+
+@pytest.fixture
+def without_legacy_pymodbus(monkeypatch):
+    """Import the integration afresh as if the pymodbus 3.6 modules were missing."""
+    for name in LEGACY_MODULES:
+        # None in sys.modules lässt den Import mit ImportError scheitern
+        monkeypatch.setitem(sys.modules, name, None)
+    before = {name for name in sys.modules if name.startswith(PACKAGE)}
+    for name in before:
+        monkeypatch.delitem(sys.modules, name)
+    yield
+    for name in [name for name in sys.modules if name.startswith(PACKAGE) and name not in before]:
+        del sys.modules[name]
+
+
+def test_coordinator_imports_without_legacy_pymodbus(without_legacy_pymodbus, tmp_path):
+    from homeassistant.core import HomeAssistant
+
+    coordinator_module = importlib.import_module(f"{PACKAGE}.coordinator")
+    traffic_log = importlib.import_module(f"{PACKAGE}.traffic_log")
+    assert not traffic_log.REPLAY_SUPPORTED
+    # Der Mitschnitt selbst braucht die alten Klassen nicht
+    assert traffic_log.request_pdu("read_input_registers", address=1, count=2) == bytes((4, 0, 1, 0, 2))
+
+    async def create():
+        hass = HomeAssistant(str(tmp_path))
+        return coordinator_module.DaikinAlthermaCoordinator(hass, "127.0.0.1", 5020, 10, False)
+
+    coordinator = asyncio.run(create())
+    assert coordinator.recorder is None
+
+    with pytest.raises(RuntimeError):
+        traffic_log.ReplayClient([])
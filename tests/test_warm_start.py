@@ -0,0 +1,84 @@
+"""Tests for the warm start from the persisted snapshot."""
+import asyncio
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.ha_daikin_altherma4_modbus.const import DOMAIN
+from custom_components.ha_daikin_altherma4_modbus.coordinator import DaikinAlthermaCoordinator
+from custom_components.ha_daikin_altherma4_modbus.snapshot import RegisterSnapshot
+
+KEY = f"{DOMAIN}_input_40"
+# Kein Adapter unter dieser Adresse
+UNREACHABLE_PORT = 9
+
+
+def test_snapshot_round_trip(tmp_path):
+    async def run():
+        hass = HomeAssistant(str(tmp_path))
+        saved = DaikinAlthermaCoordinator(hass, "127.0.0.1", UNREACHABLE_PORT, 10, False, storage_key=f"{DOMAIN}.test")
+        saved.data = RegisterSnapshot()
+        saved.data.load_raw_values({KEY: 3500})
+        triggered_at = dt_util.utcnow().replace(microsecond=0)
+        saved.last_triggered[12] = triggered_at
+        await saved._store.async_save(saved._snapshot_to_store())
+
+        loaded = DaikinAlthermaCoordinator(hass, "127.0.0.1", UNREACHABLE_PORT, 10, False, storage_key=f"{DOMAIN}.test")
+        result = await loaded.async_load_snapshot(), loaded.data.get(KEY), loaded.last_triggered, loaded.cached_at
+        for coordinator in (saved, loaded):
+            await coordinator.async_shutdown()
+        await hass.async_stop(force=True)
+        return result, triggered_at
+
+    (loaded, entry, last_triggered, cached_at), triggered_at = asyncio.run(run())
+    assert loaded
+    assert entry["value"] == 3500
+    assert last_triggered == {12: triggered_at}
+    assert cached_at is not None
+
+
+def test_no_snapshot_without_storage_key(tmp_path):
+    async def run():
+        hass = HomeAssistant(str(tmp_path))
+        coordinator = DaikinAlthermaCoordinator(hass, "127.0.0.1", UNREACHABLE_PORT, 10, False)
+        result = await coordinator.async_load_snapshot(), coordinator.cached_at
+        await coordinator.async_shutdown()
+        await hass.async_stop(force=True)
+        return result
+
+    assert asyncio.run(run()) == (False, None)
+
+
+def _warm_start(config_dir, saved_ago):
+    """Load a snapshot saved ``saved_ago`` seconds ago, then poll an unreachable adapter."""
+
+    async def run():
+        hass = HomeAssistant(str(config_dir))
+        coordinator = DaikinAlthermaCoordinator(
+            hass, "127.0.0.1", UNREACHABLE_PORT, 10, False, storage_key=f"{DOMAIN}.test", max_value_age=300
+        )
+        saved_at = dt_util.utcnow() - timedelta(seconds=saved_ago)
+        await coordinator._store.async_save(
+            {"saved_at": saved_at.isoformat(), "registers": {KEY: 3500}, "last_triggered": {}}
+        )
+        assert await coordinator.async_load_snapshot()
+        await coordinator.async_refresh()
+        result = coordinator.last_update_success, coordinator.data.get(KEY), coordinator.cached_at
+        await coordinator.async_shutdown()
+        await hass.async_stop(force=True)
+        return result
+
+    return asyncio.run(run())
+
+
+def test_cached_values_survive_unreachable_adapter(tmp_path):
+    success, entry, cached_at = _warm_start(tmp_path, saved_ago=60)
+    assert success
+    assert entry["value"] == 3500
+    assert cached_at is not None
+
+
+def test_cached_values_expire_after_max_value_age(tmp_path):
+    success, _, _ = _warm_start(tmp_path, saved_ago=600)
+    assert not success
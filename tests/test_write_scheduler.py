@@ -0,0 +1,144 @@
+"""Tests for debouncing, batching and ordering of register writes."""
+import asyncio
+
+from custom_components.ha_daikin_altherma4_modbus.read_plan import FUNCTION_HOLDING
+from custom_components.ha_daikin_altherma4_modbus.write_scheduler import (
+    SkippedWrite,
+    WriteScheduler,
+    group_adjacent,
+)
+
+MAX_CACHE_AGE = 5
+
+
+class _Response:
+    def isError(self):
+        return False
+
+
+class _Client:
+    """Records the writes; the first one takes longer than the others."""
+
+    def __init__(self, device):
+        self.device = device
+        self.writes = []
+
+    async def write_register(self, address, value):
+        await asyncio.sleep(0.05 if not self.writes else 0.001)
+        self.writes.append((address, value))
+        self.device[address] = value
+        return _Response()
+
+    async def write_registers(self, address, values):
+        await asyncio.sleep(0.001)
+        self.writes.append((address, tuple(values)))
+        self.device.update(zip(range(address, address + len(values)), values))
+        return _Response()
+
+
+class _Connection:
+    def __init__(self, client):
+        self.client = client
+
+    async def async_get_client(self):
+        return self.client
+
+
+class _Hass:
+    def async_create_task(self, coro):
+        return asyncio.get_running_loop().create_task(coro)
+
+
+class _Coordinator:
+    """Coordinator stand-in whose snapshot follows the applied writes."""
+
+    def __init__(self, cached=None, age=0.0):
+        self.hass = _Hass()
+        self.cached = dict(cached or {})
+        self.age = age
+        self.client = _Client({})
+        self.connection = _Connection(self.client)
+        self.recorder = None
+
+    def cached_value(self, function, address, max_age=None):
+        if max_age is not None and self.age > max_age:
+            return None
+        return self.cached.get(address)
+
+    def apply_writes(self, function, writes):
+        self.cached.update(writes)
+
+
+def test_group_adjacent_splits_gaps_and_limit():
+    assert group_adjacent([5, 1, 2, 3, 7, 8], 2) == [[1, 2], [3], [5], [7, 8]]
+    assert group_adjacent([], 4) == []
+
+
+def test_debounce_restarts_with_every_write():
+    async def run():
+        coordinator = _Coordinator()
+        scheduler = WriteScheduler(coordinator, 0.05, MAX_CACHE_AGE)
+        writes = []
+        # Abstand kleiner als die Ruhezeit, insgesamt länger als ein festes Fenster
+        for value in range(20, 26):
+            writes.append(asyncio.ensure_future(scheduler.async_write(FUNCTION_HOLDING, 10, value)))
+            await asyncio.sleep(0.02)
+        await asyncio.gather(*writes)
+        return coordinator.client.writes
+
+    assert asyncio.run(run()) == [(10, 25)]
+
+
+def test_adjacent_registers_in_one_request():
+    async def run():
+        coordinator = _Coordinator()
+        scheduler = WriteScheduler(coordinator, 0.01, MAX_CACHE_AGE)
+        await asyncio.gather(
+            scheduler.async_write(FUNCTION_HOLDING, 11, 2),
+            scheduler.async_write(FUNCTION_HOLDING, 10, 1),
+        )
+        return coordinator.client.writes
+
+    assert asyncio.run(run()) == [(10, (1, 2))]
+
+
+def test_same_address_keeps_order_across_flushes():
+    async def run():
+        coordinator = _Coordinator(cached={10: 20})
+        scheduler = WriteScheduler(coordinator, 0.01, MAX_CACHE_AGE)
+        first = asyncio.ensure_future(scheduler.async_write(FUNCTION_HOLDING, 10, 21))
+        # Erster Batch ist unterwegs (langsame Antwort), dann zurück auf den alten Wert
+        await asyncio.sleep(0.02)
+        second = asyncio.ensure_future(scheduler.async_write(FUNCTION_HOLDING, 10, 20))
+        await asyncio.sleep(0)
+        await scheduler.async_flush()
+        results = await asyncio.gather(first, second)
+        return coordinator.client.writes, coordinator.client.device, results
+
+    writes, device, results = asyncio.run(run())
+    assert writes == [(10, 21), (10, 20)]
+    assert device == {10: 20}
+    assert not any(isinstance(result, SkippedWrite) for result in results)
+
+
+def test_recent_value_is_skipped():
+    async def run():
+        coordinator = _Coordinator(cached={10: 20}, age=1.0)
+        scheduler = WriteScheduler(coordinator, 0.01, MAX_CACHE_AGE)
+        result = await scheduler.async_write(FUNCTION_HOLDING, 10, 20)
+        return coordinator.client.writes, result
+
+    writes, result = asyncio.run(run())
+    assert writes == []
+    assert isinstance(result, SkippedWrite)
+
+
+def test_stale_value_is_written():
+    async def run():
+        # Letzter Lesewert aus der langsamen Stufe, am Bedienteil inzwischen geändert
+        coordinator = _Coordinator(cached={10: 20}, age=600.0)
+        scheduler = WriteScheduler(coordinator, 0.01, MAX_CACHE_AGE)
+        await scheduler.async_write(FUNCTION_HOLDING, 10, 20)
+        return coordinator.client.writes
+
+    assert asyncio.run(run()) == [(10, 20)]